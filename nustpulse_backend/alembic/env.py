@@ -12,7 +12,7 @@ load_dotenv()
 from app.database.database import Base
 
 # CRITICAL: Import ALL your models so they're registered with Base.metadata
-from app.models import User, Deadline
+from app.models import User, Deadline, SyncRun, Course, DeadlineTombstone, CourseDayLoad
 
 
 target_metadata = Base.metadata
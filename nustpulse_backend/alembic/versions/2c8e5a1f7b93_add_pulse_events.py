@@ -0,0 +1,59 @@
+"""Add pulse_events for pulse search
+
+Revision ID: 2c8e5a1f7b93
+Revises: a6d2f9c4e871
+Create Date: 2026-10-20 14:26:51.084317
+
+One row per Moodle event, so pulse search no longer scans and deduplicates
+every student's copy of each deadline. Syncs keep it current from then on;
+the upgrade backfills it from the deadlines still inside the default 24h
+pulse retention window, taking each event's oldest copy as search did.
+search_vector is generated like the deadlines one and kept off the model.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8e5a1f7b93'
+down_revision: Union[str, Sequence[str], None] = 'a6d2f9c4e871'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pulse_events',
+    sa.Column('lms_event_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('due_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('search_vector', postgresql.TSVECTOR(),
+              sa.Computed("to_tsvector('english', coalesce(title, ''))", persisted=True), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
+    sa.PrimaryKeyConstraint('lms_event_id')
+    )
+    op.create_index(op.f('ix_pulse_events_due_date'), 'pulse_events', ['due_date'], unique=False)
+    op.create_index('ix_pulse_events_search_vector', 'pulse_events', ['search_vector'], unique=False,
+                    postgresql_using='gin')
+    op.create_index('ix_pulse_events_title_trgm', 'pulse_events', ['title'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.execute("""
+        INSERT INTO pulse_events (lms_event_id, title, due_date, course_id, updated_at)
+        SELECT DISTINCT ON (lms_event_id) lms_event_id, title, due_date, course_id, now()
+        FROM deadlines
+        WHERE lms_event_id IS NOT NULL AND due_date >= now() - interval '24 hours'
+        ORDER BY lms_event_id, id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_pulse_events_title_trgm', table_name='pulse_events')
+    op.drop_index('ix_pulse_events_search_vector', table_name='pulse_events')
+    op.drop_index(op.f('ix_pulse_events_due_date'), table_name='pulse_events')
+    op.drop_table('pulse_events')
@@ -0,0 +1,40 @@
+"""Add adaptive sync schedule
+
+Revision ID: 3f9a1c7e2b40
+Revises: da1efa9d107e
+Create Date: 2026-10-19 10:12:04.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7e2b40'
+down_revision: Union[str, Sequence[str], None] = 'da1efa9d107e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('users', sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('users', sa.Column('last_changed_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('users', sa.Column('next_sync_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_users_next_sync_at'), 'users', ['next_sync_at'], unique=False)
+
+    # Spread existing users over the old 4 hour window so the first ticks
+    # after deploy don't recreate the thundering herd.
+    op.execute("UPDATE users SET next_sync_at = now() + random() * interval '4 hours'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_users_next_sync_at'), table_name='users')
+    op.drop_column('users', 'next_sync_at')
+    op.drop_column('users', 'last_changed_at')
+    op.drop_column('users', 'last_synced_at')
+    op.drop_column('users', 'last_login_at')
@@ -0,0 +1,50 @@
+"""Add deadline change versions and tombstones
+
+Revision ID: 5a9c2e8f1d63
+Revises: e7b3d91c5a24
+Create Date: 2026-10-19 19:12:04.518230
+
+Existing rows start at version 0, so a client's first change-feed request
+(since=0) gets a full snapshot.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9c2e8f1d63'
+down_revision: Union[str, Sequence[str], None] = 'e7b3d91c5a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('deadlines_version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('tombstones_purged_version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('deadlines', sa.Column('change_version', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_deadlines_user_id_change_version', 'deadlines', ['user_id', 'change_version'], unique=False)
+    op.create_table('deadline_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('deadline_id', sa.Integer(), nullable=False),
+    sa.Column('change_version', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_deadline_tombstones_deleted_at'), 'deadline_tombstones', ['deleted_at'], unique=False)
+    op.create_index('ix_deadline_tombstones_user_id_change_version', 'deadline_tombstones', ['user_id', 'change_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_deadline_tombstones_user_id_change_version', table_name='deadline_tombstones')
+    op.drop_index(op.f('ix_deadline_tombstones_deleted_at'), table_name='deadline_tombstones')
+    op.drop_table('deadline_tombstones')
+    op.drop_index('ix_deadlines_user_id_change_version', table_name='deadlines')
+    op.drop_column('deadlines', 'change_version')
+    op.drop_column('users', 'tombstones_purged_version')
+    op.drop_column('users', 'deadlines_version')
@@ -0,0 +1,55 @@
+"""Add sync_runs ledger
+
+Revision ID: 8d2e4b6a1f37
+Revises: 3f9a1c7e2b40
+Create Date: 2026-10-19 13:40:52.603114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b6a1f37'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c7e2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sync_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('trigger', sa.String(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('duration_ms', sa.Integer(), nullable=False),
+    sa.Column('success', sa.Boolean(), nullable=False),
+    sa.Column('failure_reason', sa.String(), nullable=True),
+    sa.Column('login_ms', sa.Integer(), nullable=True),
+    sa.Column('sesskey_ms', sa.Integer(), nullable=True),
+    sa.Column('calendar_fetch_ms', sa.Integer(), nullable=True),
+    sa.Column('db_upsert_ms', sa.Integer(), nullable=True),
+    sa.Column('http_requests', sa.Integer(), nullable=False),
+    sa.Column('bytes_received', sa.Integer(), nullable=False),
+    sa.Column('events_fetched', sa.Integer(), nullable=False),
+    sa.Column('rows_inserted', sa.Integer(), nullable=False),
+    sa.Column('rows_updated', sa.Integer(), nullable=False),
+    sa.Column('rows_pruned', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_runs_id'), 'sync_runs', ['id'], unique=False)
+    op.create_index(op.f('ix_sync_runs_started_at'), 'sync_runs', ['started_at'], unique=False)
+    op.create_index('ix_sync_runs_user_id_started_at', 'sync_runs', ['user_id', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sync_runs_user_id_started_at', table_name='sync_runs')
+    op.drop_index(op.f('ix_sync_runs_started_at'), table_name='sync_runs')
+    op.drop_index(op.f('ix_sync_runs_id'), table_name='sync_runs')
+    op.drop_table('sync_runs')
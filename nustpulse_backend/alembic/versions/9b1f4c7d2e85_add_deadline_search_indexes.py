@@ -0,0 +1,57 @@
+"""Add full-text and trigram search indexes
+
+Revision ID: 9b1f4c7d2e85
+Revises: 5a9c2e8f1d63
+Create Date: 2026-10-19 21:04:37.602118
+
+search_vector is a stored generated column, so Postgres keeps it current on
+every insert and update and existing rows are filled in by the upgrade
+itself (which rewrites both tables). The columns are not on the models; see
+app.services.search_service.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1f4c7d2e85'
+down_revision: Union[str, Sequence[str], None] = '5a9c2e8f1d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('deadlines', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', coalesce(title, '') || ' ' || coalesce(course_name, ''))", persisted=True),
+        nullable=True,
+    ))
+    op.add_column('courses', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', coalesce(fullname, '') || ' ' || coalesce(shortname, ''))", persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_deadlines_search_vector', 'deadlines', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_deadlines_title_trgm', 'deadlines', ['title'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_courses_search_vector', 'courses', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_courses_fullname_trgm', 'courses', ['fullname'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'fullname': 'gin_trgm_ops'})
+    op.create_index('ix_courses_shortname_trgm', 'courses', ['shortname'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'shortname': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_courses_shortname_trgm', table_name='courses')
+    op.drop_index('ix_courses_fullname_trgm', table_name='courses')
+    op.drop_index('ix_courses_search_vector', table_name='courses')
+    op.drop_index('ix_deadlines_title_trgm', table_name='deadlines')
+    op.drop_index('ix_deadlines_search_vector', table_name='deadlines')
+    op.drop_column('courses', 'search_vector')
+    op.drop_column('deadlines', 'search_vector')
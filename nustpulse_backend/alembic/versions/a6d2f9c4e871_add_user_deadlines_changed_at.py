@@ -0,0 +1,32 @@
+"""Add users.deadlines_changed_at
+
+Revision ID: a6d2f9c4e871
+Revises: f1c8d2a5b937
+Create Date: 2026-10-20 11:02:37.519846
+
+Set alongside every deadlines_version bump and served as the calendar
+feed's Last-Modified. Existing users who have had changes start from the
+deploy time, which can only make clients refetch once.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d2f9c4e871'
+down_revision: Union[str, Sequence[str], None] = 'f1c8d2a5b937'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('deadlines_changed_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE users SET deadlines_changed_at = now() WHERE deadlines_version > 0")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'deadlines_changed_at')
@@ -0,0 +1,50 @@
+"""Add course_day_loads workload counters
+
+Revision ID: c2a7e5f09d14
+Revises: 9b1f4c7d2e85
+Create Date: 2026-10-19 22:16:51.340927
+
+The counters are filled once here from the existing synced deadlines;
+from then on every write keeps them current (see CourseLoadService).
+Days are PKT calendar days.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a7e5f09d14'
+down_revision: Union[str, Sequence[str], None] = '9b1f4c7d2e85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('course_day_loads',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('deadline_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('pinned_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'day')
+    )
+    op.create_index(op.f('ix_course_day_loads_day'), 'course_day_loads', ['day'], unique=False)
+    op.execute("""
+        INSERT INTO course_day_loads (course_id, day, deadline_count, pinned_count)
+        SELECT course_id,
+               (due_date AT TIME ZONE 'Asia/Karachi')::date,
+               count(*),
+               count(*) FILTER (WHERE is_pinned)
+        FROM deadlines
+        WHERE course_id IS NOT NULL
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_course_day_loads_day'), table_name='course_day_loads')
+    op.drop_table('course_day_loads')
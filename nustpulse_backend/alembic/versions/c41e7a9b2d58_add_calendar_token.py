@@ -0,0 +1,30 @@
+"""Add calendar feed token to users
+
+Revision ID: c41e7a9b2d58
+Revises: 8d2e4b6a1f37
+Create Date: 2026-10-19 17:20:11.408512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7a9b2d58'
+down_revision: Union[str, Sequence[str], None] = '8d2e4b6a1f37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('calendar_token', sa.String(), nullable=True))
+    op.create_index(op.f('ix_users_calendar_token'), 'users', ['calendar_token'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_users_calendar_token'), table_name='users')
+    op.drop_column('users', 'calendar_token')
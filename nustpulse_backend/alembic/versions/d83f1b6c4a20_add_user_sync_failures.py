@@ -0,0 +1,32 @@
+"""Add per-user sync failure count and reason
+
+Revision ID: d83f1b6c4a20
+Revises: c2a7e5f09d14
+Create Date: 2026-10-19 23:02:18.774501
+
+Everyone starts with a clean record; accounts whose password already
+stopped working are parked after their next few scheduled attempts.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83f1b6c4a20'
+down_revision: Union[str, Sequence[str], None] = 'c2a7e5f09d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('sync_failure_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('sync_failure_reason', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'sync_failure_reason')
+    op.drop_column('users', 'sync_failure_count')
@@ -0,0 +1,43 @@
+"""Add deadlines.next_reminder_at
+
+Revision ID: e4b9a3d7c612
+Revises: d83f1b6c4a20
+Create Date: 2026-10-19 23:48:09.215530
+
+Pinned deadlines still ahead are scheduled here with the default
+REMINDER_OFFSETS_HOURS (72, 24 and 3 hours before due), so nothing is sent
+at deploy time for reminder slots that have already passed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9a3d7c612'
+down_revision: Union[str, Sequence[str], None] = 'd83f1b6c4a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('deadlines', sa.Column('next_reminder_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_deadlines_next_reminder_at', 'deadlines', ['next_reminder_at'], unique=False,
+                    postgresql_where=sa.text('next_reminder_at IS NOT NULL'))
+    op.execute("""
+        UPDATE deadlines
+        SET next_reminder_at = (
+            SELECT min(due_date - make_interval(hours => offsets.hours))
+            FROM unnest(ARRAY[72, 24, 3]) AS offsets(hours)
+            WHERE due_date - make_interval(hours => offsets.hours) > now()
+        )
+        WHERE is_pinned AND due_date > now()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_deadlines_next_reminder_at', table_name='deadlines')
+    op.drop_column('deadlines', 'next_reminder_at')
@@ -0,0 +1,44 @@
+"""Add courses table and deadlines.course_id
+
+Revision ID: e7b3d91c5a24
+Revises: c41e7a9b2d58
+Create Date: 2026-10-19 17:58:36.112094
+
+Existing rows cannot be backfilled here: deadlines only stored the course
+name, never the Moodle course id. Each LMS deadline gets its course_id (and
+its course_name cleared) the next time its owner syncs; manual deadlines
+keep their free-text course_name.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3d91c5a24'
+down_revision: Union[str, Sequence[str], None] = 'c41e7a9b2d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('courses',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('fullname', sa.String(), nullable=False),
+    sa.Column('shortname', sa.String(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.add_column('deadlines', sa.Column('course_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_deadlines_course_id'), 'deadlines', ['course_id'], unique=False)
+    op.create_foreign_key('deadlines_course_id_fkey', 'deadlines', 'courses', ['course_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('deadlines_course_id_fkey', 'deadlines', type_='foreignkey')
+    op.drop_index(op.f('ix_deadlines_course_id'), table_name='deadlines')
+    op.drop_column('deadlines', 'course_id')
+    op.drop_table('courses')
@@ -0,0 +1,31 @@
+"""Add deadlines.notify_claimed_at
+
+Revision ID: f1c8d2a5b937
+Revises: e4b9a3d7c612
+Create Date: 2026-10-20 10:14:52.408163
+
+New-deadline alerts are now leased when a worker takes them and flagged
+notified only after the email goes out, so an alert lost to a worker
+crash is retried by the safety net instead of being dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c8d2a5b937'
+down_revision: Union[str, Sequence[str], None] = 'e4b9a3d7c612'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('deadlines', sa.Column('notify_claimed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('deadlines', 'notify_claimed_at')
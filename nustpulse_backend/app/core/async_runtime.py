@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRuntime:
+    """
+    One long-lived event loop on a background thread, for sync code (Celery
+    tasks) that needs to run coroutines.
+
+    Tasks hand coroutines over with `run()` and block until they finish. The
+    loop outlives individual tasks, so pooled clients bound to it (the LMS
+    HTTP transport, the async Redis client) are reused instead of rebuilt per
+    task. Shutdown callbacks registered with `on_shutdown` run on the loop
+    before it stops.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_forever():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=run_forever, name="async-runtime", daemon=True)
+            self._thread.start()
+            ready.wait()
+            logger.info("Async runtime started")
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Runs a coroutine on the runtime loop and returns its result. Starts the runtime if needed."""
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return future.result(timeout)
+
+    def on_shutdown(self, hook: Callable[[], Awaitable[None]]):
+        """Registers an async callback run on the loop just before it stops."""
+        self._shutdown_hooks.append(hook)
+
+    def stop(self, timeout: float = 10.0):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                return
+            loop, thread = self._loop, self._thread
+
+            async def shutdown():
+                for hook in self._shutdown_hooks:
+                    try:
+                        await hook()
+                    except Exception as e:
+                        logger.warning(f"Async runtime shutdown hook failed: {e}")
+
+            try:
+                asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Async runtime shutdown did not finish cleanly: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            loop.close()
+            self._loop, self._thread = None, None
+            logger.info("Async runtime stopped")
+
+
+runtime = AsyncRuntime()
+
+
+def setup_celery_runtime():
+    """
+    Starts the runtime in each worker process and stops it on shutdown.
+    Prefork children are started after the fork (a thread started in the
+    parent would not survive it); solo and thread pools start it lazily.
+    """
+    from celery import signals
+
+    @signals.worker_process_init.connect(weak=False)
+    def _start_runtime(**kwargs):
+        runtime.start()
+
+    @signals.worker_process_shutdown.connect(weak=False)
+    def _stop_runtime_in_child(**kwargs):
+        runtime.stop()
+
+    @signals.worker_shutdown.connect(weak=False)
+    def _stop_runtime(**kwargs):
+        runtime.stop()
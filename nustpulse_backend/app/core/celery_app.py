@@ -1,4 +1,7 @@
 from app.core.config import settings
+from app.core.metrics import setup_celery_metrics
+from app.core.async_runtime import setup_celery_runtime
+from app.core.profiling import setup_celery_profiling
 from celery.schedules import crontab
 from celery import Celery
 
@@ -8,8 +11,18 @@ celery_app = Celery(
     backend=f"{settings.REDIS_URL}"
 )
 
+# Two lanes, each consumed by its own workers (see docker-compose.yml), so a
+# login or a click never queues behind the background sweep
+INTERACTIVE_QUEUE = "interactive"
+BULK_QUEUE = "bulk"
+
+celery_app.conf.task_default_queue = BULK_QUEUE
 celery_app.conf.task_routes = {
-    "app.tasks.*": "main-queue",
+    "sync_user_now": {"queue": INTERACTIVE_QUEUE},
+    "notify_new_deadlines": {"queue": INTERACTIVE_QUEUE},
+    # Claim-only and time-sensitive; the emails it queues (send_due_reminders)
+    # go to the bulk lane so a burst of reminders never holds up a sync
+    "dispatch_due_reminders": {"queue": INTERACTIVE_QUEUE},
 }
 
 celery_app.conf.update(
@@ -18,18 +31,52 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="Asia/Karachi",
     enable_utc=True,
+    # Nothing reads task results; don't write them to Redis
+    task_ignore_result=True,
+    # Sync tasks are idempotent, so ack after they finish and requeue if a
+    # worker dies mid-task. Email tasks opt out (acks_late=False) so a crash
+    # never re-sends alerts.
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # Tasks are long and uneven; don't let one process hoard a backlog
+    worker_prefetch_multiplier=1,
 )
 
+setup_celery_metrics(settings.WORKER_METRICS_PORT)
+setup_celery_runtime()
+setup_celery_profiling()
+
 # Optional: Automatic discovery of tasks
 celery_app.autodiscover_tasks(["app"])
 
 celery_app.conf.beat_schedule = {
-    "sync-every-4-hours": {
-        "task": "sync_all_users",
-        "schedule": crontab(minute=0, hour="*/4"),
+    # Frequent tick; each user's own next_sync_at decides who actually syncs
+    "sync-due-users": {
+        "task": "sync_due_users",
+        "schedule": settings.SYNC_TICK_SECONDS,
+    },
+    # New-deadline alerts are queued by each sync; this only catches strays
+    "notify-pending-deadlines": {
+        "task": "notify_pending_deadlines",
+        "schedule": settings.NOTIFY_SAFETY_NET_MINUTES * 60,
+    },
+    "prune-pulse-feed": {
+        "task": "prune_pulse_feed",
+        "schedule": settings.PULSE_PRUNE_MINUTES * 60,
+    },
+    "compact-deadline-tombstones": {
+        "task": "compact_deadline_tombstones",
+        "schedule": crontab(minute=30, hour=3),
+    },
+    "prune-sync-runs": {
+        "task": "prune_sync_runs",
+        "schedule": crontab(minute=45, hour=3),
     },
-    "daily-reminders-at-11am": {
-        "task": "daily_reminder_check",
-        "schedule": crontab(minute=0, hour=11),
+    # Reminders go out when each one is due (see ReminderService)
+    "dispatch-due-reminders": {
+        "task": "dispatch_due_reminders",
+        "schedule": settings.REMINDER_TICK_SECONDS,
+        # A tick still queued when the next one is due is dropped, not run late
+        "options": {"expires": settings.REMINDER_TICK_SECONDS},
     },
 }
@@ -0,0 +1,94 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI gzip/brotli negotiation for buffered responses.
+
+    Only single-message bodies above `minimum_size` are compressed. Streamed
+    responses (server-sent events) and bodies that already carry a
+    Content-Encoding pass through untouched, so a stream is never held back
+    waiting for a buffer to fill.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose_encoding(self, scope) -> str:
+        accepted = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accepted = value.decode("latin-1").lower()
+                break
+        offered = {token.split(";")[0].strip() for token in accepted.split(",")}
+        if brotli is not None and "br" in offered:
+            return "br"
+        if "gzip" in offered:
+            return "gzip"
+        return ""
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose_encoding(scope)
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # Held back until we know whether the body comes in one piece
+                start_message = message
+                return
+
+            body = message.get("body", b"")
+            headers = dict(start_message["headers"])
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or b"content-encoding" in headers
+                or headers.get(b"content-type", b"").startswith(b"text/event-stream")
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = self._compress(encoding, body)
+            raw_headers = [
+                (name, value) for name, value in start_message["headers"]
+                if name not in (b"content-length", b"vary")
+            ]
+            vary = headers.get(b"vary")
+            raw_headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"),
+            ]
+            await send({**start_message, "headers": raw_headers})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
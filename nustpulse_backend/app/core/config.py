@@ -8,16 +8,30 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: Optional[str] = None  # Streaming replica for read-only GET routes
+    READ_YOUR_WRITES_SECONDS: int = 10  # Reads stay on the primary this long after a user's own write
     REDIS_URL: str
     
     # Auth
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7 # 7 days
+    ADMIN_USERNAMES: list[str] = []  # LMS usernames allowed on /admin endpoints
+    FERNET_KEY: str     # Encrypts stored LMS passwords
 
     # Gmail API (Used to bypass Railway SMTP block)
     GMAIL_REFRESH_TOKEN: str
     MAIL_FROM: str      # The sender address (e.g. nustpulse@gmail.com)
+    MAIL_TRANSPORT: str = "gmail"
+    MAIL_MAX_RETRIES: int = 3
+    MAIL_RETRY_BASE_SECONDS: float = 1.0
+    MAIL_RETRY_MAX_SECONDS: float = 30.0
+    NOTIFY_SAFETY_NET_MINUTES: int = 60  # Sweep for new-deadline alerts that missed their event
+    NOTIFY_CLAIM_LEASE_MINUTES: int = 15  # A claimed alert still unsent after this is the safety net's again
+    REMINDER_OFFSETS_HOURS: list[int] = [72, 24, 3]  # Pinned deadlines are emailed this long before they're due
+    REMINDER_TICK_SECONDS: int = 60
+    REMINDER_BATCH_SIZE: int = 200
+    REMINDER_LOCK_SECONDS: int = 300  # Longest a dispatch tick may hold its lock if the worker dies mid-claim
 
     # Google OAuth
     GOOGLE_CLIENT_ID: str
@@ -25,6 +39,68 @@ class Settings(BaseSettings):
     GOOGLE_REDIRECT_URI: str
     # AI
     GROQ_KEY: str
+
+    # Adaptive sync scheduling (intervals in minutes)
+    SYNC_TICK_SECONDS: int = 300
+    SYNC_BATCH_SIZE: int = 100
+    SYNC_CLAIM_LEASE_MINUTES: int = 30
+    SYNC_MIN_INTERVAL_MINUTES: int = 60
+    SYNC_DEFAULT_INTERVAL_MINUTES: int = 240
+    SYNC_MAX_INTERVAL_MINUTES: int = 24 * 60
+    SYNC_JITTER_FRACTION: float = 0.15
+    SYNC_USER_COOLDOWN_SECONDS: int = 60  # Minimum gap between one user's manual syncs
+    SYNC_CREDENTIAL_FAILURES_BEFORE_PARK: int = 5  # Stop scheduling until the user logs in again
+    SYNC_RUN_RETENTION_DAYS: int = 90  # sync_runs ledger; covers the cost report's longest window
+    SYNC_RUN_PRUNE_BATCH: int = 5000
+
+    # Universal Pulse feed
+    PULSE_FEED_ENABLED: bool = True
+    PULSE_RETENTION_HOURS: int = 24
+    PULSE_CACHE_SECONDS: int = 5
+    PULSE_PRUNE_MINUTES: int = 10  # Drops courses whose assignments all left the retention window
+    PULSE_SEARCH_CANDIDATES: int = 1000  # Matches ranked per pulse search; past this the soonest due win
+
+    # Live per-user events (SSE)
+    EVENTS_ENABLED: bool = True
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+    EVENTS_TOKEN_SECONDS: int = 60  # Lifetime of the single-purpose token /events/stream takes in its URL
+
+    # iCalendar subscription feed
+    CALENDAR_CACHE_SECONDS: int = 24 * 3600
+    CALENDAR_CLIENT_MAX_AGE_SECONDS: int = 300
+
+    # Deadline change feed
+    DEADLINE_TOMBSTONE_RETENTION_DAYS: int = 30  # Older cursors get a full reset
+
+    # Outbound LMS protection, shared by the API and workers through Redis
+    LMS_GUARD_ENABLED: bool = True
+    LMS_RATE_PER_SECOND: float = 5.0
+    LMS_RATE_BURST: int = 10
+    LMS_RATE_MAX_WAIT_SECONDS: float = 10.0
+    LMS_BULK_RESERVE_TOKENS: int = 3  # Bucket tokens background syncs leave for interactive ones
+    LMS_BREAKER_THRESHOLD: int = 8
+    LMS_BREAKER_WINDOW_SECONDS: int = 60
+    LMS_BREAKER_COOLDOWN_SECONDS: int = 60
+    LMS_TIMEOUT_MIN_SECONDS: float = 5.0
+    LMS_TIMEOUT_MAX_SECONDS: float = 30.0
+    LMS_TIMEOUT_P95_MULTIPLIER: float = 3.0
+    LMS_POOL_MAX_CONNECTIONS: int = 20
+    LMS_POOL_MAX_KEEPALIVE: int = 10
+
+    # Metrics
+    WORKER_METRICS_PORT: int = 9100
+    SLOW_QUERY_MS: int = 200
+    SERVER_TIMING_ENABLED: bool = True  # db / lms / total timings on every API response
+
+    # Opt-in profiling (see app.core.profiling); nothing is hooked in unless enabled
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0  # Share of requests/tasks/syncs profiled; admins can also send X-Profile: 1
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_SECONDS: float = 30.0  # Sampling stops after this, however long the request or task runs
+    PROFILING_SKIP_PATHS: list[str] = ["/events/stream"]  # Long-lived responses are never profiled
+    PROFILING_DIR: str = "/tmp/nustpulse-profiles"
+    PROFILING_TRACEMALLOC: bool = False
+    PROFILING_TRACEMALLOC_FRAMES: int = 10
     
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
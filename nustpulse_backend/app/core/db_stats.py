@@ -0,0 +1,133 @@
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """DB and LMS work done on behalf of one request or task."""
+    queries: int = 0
+    db_seconds: float = 0.0
+    lms_requests: int = 0
+    lms_seconds: float = 0.0
+    # Only collected under assert_max_queries, to keep the hot path cheap
+    statements: Optional[List[str]] = None
+    # Enclosing tracker (e.g. assert_max_queries around a request), which sees the same work
+    parent: Optional["QueryStats"] = field(default=None, repr=False)
+
+
+# The stats object is shared, not copied: FastAPI's threadpool and the async
+# runtime copy the context, so work they do still lands on the same counters
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track(stats: Optional[QueryStats] = None) -> Iterator[QueryStats]:
+    """Counts every statement and LMS request in this context (and its copies) into `stats`."""
+    stats = stats or QueryStats()
+    stats.parent = _current.get()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def start(stats: Optional[QueryStats] = None):
+    """track() for callers that begin and end in separate callbacks (Celery signals). Returns (stats, token)."""
+    stats = stats or QueryStats()
+    stats.parent = _current.get()
+    return stats, _current.set(stats)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def record_lms_request(elapsed: float):
+    stats = _current.get()
+    while stats is not None:
+        stats.lms_requests += 1
+        stats.lms_seconds += elapsed
+        stats = stats.parent
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """
+    Fails with the offending statements if the block runs more than `limit`
+    queries. Used by benchmarks/query_budget.py to catch N+1 regressions.
+    """
+    with track(QueryStats(statements=[])) as stats:
+        yield stats
+    if stats.queries > limit:
+        listing = "\n".join(f"  {n}. {sql}" for n, sql in enumerate(stats.statements, 1))
+        raise AssertionError(f"Expected at most {limit} queries, ran {stats.queries}:\n{listing}")
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _compact(statement: str, limit: int = 1000) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def _shape(value) -> str:
+    """Bound parameters as types only, so the slow log never carries user data."""
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], (dict, list, tuple)):
+            return f"{len(value)} x {_shape(value[0])}"
+        return "(" + ", ".join(type(v).__name__ for v in value) + ")"
+    return type(value).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+
+    stats = _current.get()
+    while stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        if stats.statements is not None:
+            stats.statements.append(_compact(statement, 300))
+        stats = stats.parent
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.0f} ms): {_compact(statement)} params={_shape(parameters)}"
+        )
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute never fires for a failed statement; drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def install(engine: Engine):
+    """Hooks an engine's statement execution into the per-context stats and the slow-query log."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,239 @@
+import os
+import time
+import logging
+from prometheus_client import (
+    REGISTRY,
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from starlette.responses import Response
+
+from app.core import db_stats
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# ── API ──────────────────────────────────────────────────────────────────────
+HTTP_REQUEST_DURATION = Histogram(
+    "nustpulse_http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+)
+DB_READ_ROUTES = Counter(
+    "nustpulse_db_read_routes_total",
+    "Read-only requests by the database they were served from",
+    ["target"],
+)
+
+# ── Database ─────────────────────────────────────────────────────────────────
+DB_QUERIES = Histogram(
+    "nustpulse_db_queries",
+    "SQL statements per API request or Celery task",
+    ["kind", "name"],
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250),
+)
+DB_TIME = Histogram(
+    "nustpulse_db_time_seconds",
+    "Total time in SQL statements per API request or Celery task",
+    ["kind", "name"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+
+# ── Sync ─────────────────────────────────────────────────────────────────────
+LMS_PHASE_DURATION = Histogram(
+    "nustpulse_lms_phase_duration_seconds",
+    "Time spent in each LMS sync phase",
+    ["phase"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60),
+)
+SYNC_RUNS = Counter(
+    "nustpulse_sync_runs_total",
+    "Completed sync runs by outcome",
+    ["result"],
+)
+SYNC_ROWS = Counter(
+    "nustpulse_sync_rows_total",
+    "Deadline rows written by SyncService",
+    ["action"],
+)
+
+# ── Email ────────────────────────────────────────────────────────────────────
+MAIL_SEND_DURATION = Histogram(
+    "nustpulse_mail_send_duration_seconds",
+    "Latency of outbound email sends",
+)
+MAIL_SEND_ERRORS = Counter(
+    "nustpulse_mail_send_errors_total",
+    "Failed outbound email sends",
+)
+MAIL_SEND_RETRIES = Counter(
+    "nustpulse_mail_send_retries_total",
+    "Email sends retried after the provider rate-limited us",
+)
+
+# ── Celery ───────────────────────────────────────────────────────────────────
+TASK_DURATION = Histogram(
+    "nustpulse_celery_task_duration_seconds",
+    "Celery task run time",
+    ["task", "state"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600),
+)
+TASK_QUEUE_LAG = Histogram(
+    "nustpulse_celery_task_queue_lag_seconds",
+    "Time between a task being published and a worker starting it",
+    ["task", "queue"],
+    buckets=(0.01, 0.1, 0.5, 1, 5, 15, 30, 60, 300, 900),
+)
+
+
+def _registry():
+    """
+    With PROMETHEUS_MULTIPROC_DIR set (uvicorn/celery prefork), each process
+    writes its samples to that directory and we aggregate at scrape time.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware) so streaming responses pass
+    through untouched and the per-request cost is a perf_counter pair and one
+    histogram observation. Routes are labelled by their template, never by
+    the raw path, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code,
+            ).observe(time.perf_counter() - started)
+
+
+class ServerTimingMiddleware:
+    """
+    Counts the SQL statements and LMS requests each request makes and
+    reports them, with the total, as a Server-Timing header so browser dev
+    tools show where a slow response spent its time. Pure ASGI like
+    MetricsMiddleware; the header reflects work done before the response
+    started, which for streaming responses is only the setup.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        with db_stats.track() as stats:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start" and settings.SERVER_TIMING_ENABLED:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    timing = (
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                        f'lms;dur={stats.lms_seconds * 1000:.1f};desc="{stats.lms_requests} requests", '
+                        f"total;dur={total_ms:.1f}"
+                    )
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timing.encode("latin-1")))
+                    headers.append((b"timing-allow-origin", b"*"))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", "unmatched")
+                DB_QUERIES.labels("http", route).observe(stats.queries)
+                DB_TIME.labels("http", route).observe(stats.db_seconds)
+
+
+# ── Celery wiring ────────────────────────────────────────────────────────────
+_task_started_at = {}
+_task_stats = {}
+
+
+def setup_celery_metrics(port: int):
+    """Connects Celery signals to the task metrics and starts the worker exporter."""
+    from celery import signals
+
+    @signals.before_task_publish.connect(weak=False)
+    def _stamp_publish_time(headers=None, **kwargs):
+        if headers is not None:
+            headers["published_at"] = time.time()
+
+    @signals.task_prerun.connect(weak=False)
+    def _task_prerun(task_id=None, task=None, **kwargs):
+        _task_started_at[task_id] = time.perf_counter()
+        _task_stats[task_id] = db_stats.start()
+        published_at = getattr(task.request, "published_at", None)
+        if published_at:
+            queue = (task.request.delivery_info or {}).get("routing_key") or "unknown"
+            TASK_QUEUE_LAG.labels(task.name, queue).observe(max(0.0, time.time() - published_at))
+
+    @signals.task_postrun.connect(weak=False)
+    def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+        started = _task_started_at.pop(task_id, None)
+        if started is not None:
+            TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+        tracked = _task_stats.pop(task_id, None)
+        if tracked is not None:
+            stats, token = tracked
+            db_stats.stop(token)
+            DB_QUERIES.labels("task", task.name).observe(stats.queries)
+            DB_TIME.labels("task", task.name).observe(stats.db_seconds)
+            logger.info(
+                f"{task.name}: {stats.queries} queries ({stats.db_seconds * 1000:.0f} ms), "
+                f"{stats.lms_requests} LMS requests ({stats.lms_seconds * 1000:.0f} ms)"
+            )
+
+    @signals.worker_init.connect(weak=False)
+    def _start_exporter(**kwargs):
+        try:
+            start_http_server(port, registry=_registry())
+            logger.info(f"Worker metrics exporter listening on :{port}")
+        except OSError as e:
+            logger.warning(f"Could not start worker metrics exporter: {e}")
+
+    @signals.worker_process_shutdown.connect(weak=False)
+    def _mark_process_dead(pid=None, **kwargs):
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            multiprocess.mark_process_dead(pid or os.getpid())
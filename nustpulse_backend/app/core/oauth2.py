@@ -1,14 +1,20 @@
 from fastapi.security import OAuth2PasswordBearer
 from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
-from app.database.database import get_db
+from app.database.database import get_db, SessionLocal, ReadSessionLocal
 from app.models.user import User
-from app.core.security import verify_token
+from app.core.security import verify_token, verify_stream_token
+from app.core.config import settings
+from app.core.metrics import DB_READ_ROUTES
+from app.services.consistency_service import ConsistencyService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
 def get_current_user(
+    request: Request,
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Session = Depends(get_db)
 ):
@@ -23,5 +29,73 @@ def get_current_user(
     user = db.query(User).filter(User.lms_username == username).first()
     if user is None:
         raise credentials_exception
+
+    # Anything but a read may write, so the user's next reads skip the replica
+    if request.method not in SAFE_METHODS:
+        ConsistencyService.mark_write(username)
     
     return user
+
+def get_current_admin(current_user: User = Depends(get_current_user)):
+    if current_user.lms_username not in settings.ADMIN_USERNAMES:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+
+def get_token_subject(token: Annotated[str, Depends(oauth2_scheme)]) -> str:
+    """
+    Validates the JWT without touching the database. For endpoints that serve
+    the same data to every signed-in user and only need to know the caller is
+    authenticated.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    return verify_token(token, credentials_exception)
+
+
+def get_read_db(subject: str = Depends(get_token_subject)):
+    """
+    Session for read-only routes: the replica, unless the caller wrote
+    something in the last few seconds (see ConsistencyService).
+    """
+    if ConsistencyService.reads_from_primary(subject):
+        DB_READ_ROUTES.labels("primary").inc()
+        db = SessionLocal()
+    else:
+        DB_READ_ROUTES.labels("replica").inc()
+        db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_current_reader(
+    subject: str = Depends(get_token_subject),
+    db: Session = Depends(get_read_db),
+):
+    """get_current_user for GET routes; the user is loaded through the same read session."""
+    user = db.query(User).filter(User.lms_username == subject).first()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+def get_stream_user_id(token: str = Query(...)) -> int:
+    """
+    Authenticates long-lived streams. EventSource cannot send headers, so the
+    query string carries a stream token from POST /events/token, never the
+    access token; it names the user, so no DB session is opened at all.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+    )
+    return verify_stream_token(token, credentials_exception)
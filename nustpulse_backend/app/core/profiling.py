@@ -0,0 +1,224 @@
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+# Leaf frames of threads that are parked, not working. Samples ending in
+# one of these are dropped so idle pool threads don't drown the profile.
+IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("connection.py", "_read_from_socket"),
+}
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+# One profile at a time: the sampler sees every thread, so overlapping
+# windows would only record the same samples twice
+_busy = threading.Lock()
+
+
+class _Sampler(threading.Thread):
+    """
+    Samples the Python stack of every other thread at a fixed interval and
+    counts them as collapsed stacks (root;...;leaf), rooted at the thread
+    name so the request thread, the event loop and the async runtime can be
+    told apart in the flame graph.
+    """
+
+    def __init__(self, interval: float, max_seconds: float):
+        super().__init__(name="profiler", daemon=True)
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.truncated = False
+        self._done = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        deadline = time.monotonic() + self.max_seconds
+        while not self._done.wait(self.interval):
+            if time.monotonic() >= deadline:
+                self.truncated = True
+                break
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+# Longest first, so site-packages wins over the stdlib directory above it
+_ROOTS = sorted({os.path.join(os.path.abspath(p), "") for p in sys.path if p}, key=len, reverse=True)
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to its sys.path entry: app/services/sync_service.py, httpx/_client.py."""
+    for root in _ROOTS:
+        if filename.startswith(root):
+            return filename[len(root):]
+    return os.path.basename(filename)
+
+
+def _output_path(kind: str, name: str, suffix: str) -> str:
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    return os.path.join(settings.PROFILING_DIR, f"{stamp}-{kind}-{_UNSAFE.sub('_', name)[:80]}-{os.getpid()}{suffix}")
+
+
+@contextmanager
+def profile(kind: str, name: str):
+    """
+    Samples CPU stacks (and, with PROFILING_TRACEMALLOC, allocations) while
+    the block runs, then writes:
+
+      <stamp>-<kind>-<name>-<pid>.folded       collapsed stacks, for
+                                               flamegraph.pl, speedscope or inferno
+      <stamp>-<kind>-<name>-<pid>.tracemalloc  top allocation sites by line
+
+    The sampler sees every thread, so concurrent work in the same process
+    shows up too, and stops after PROFILING_MAX_SECONDS. Skipped (without
+    waiting) if another profile is running.
+    """
+    if not _busy.acquire(blocking=False):
+        yield None
+        return
+
+    started_tracing = False
+    try:
+        if settings.PROFILING_TRACEMALLOC and not tracemalloc.is_tracing():
+            tracemalloc.start(settings.PROFILING_TRACEMALLOC_FRAMES)
+            started_tracing = True
+        sampler = _Sampler(settings.PROFILING_INTERVAL_MS / 1000, settings.PROFILING_MAX_SECONDS)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            yield sampler
+        finally:
+            sampler.stop()
+            elapsed = time.perf_counter() - started
+            snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+            _write(kind, name, sampler, elapsed, snapshot)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _busy.release()
+
+
+def _write(kind: str, name: str, sampler: _Sampler, elapsed: float, snapshot: Optional[tracemalloc.Snapshot]):
+    try:
+        path = _output_path(kind, name, ".folded")
+        with open(path, "w") as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        if snapshot is not None:
+            with open(_output_path(kind, name, ".tracemalloc"), "w") as f:
+                for stat in snapshot.statistics("lineno")[:100]:
+                    f.write(f"{stat}\n")
+        truncated = f" (sampled the first {sampler.max_seconds:g} s only)" if sampler.truncated else ""
+        logger.info(f"Profiled {kind} {name}: {elapsed * 1000:.0f} ms, {sampler.samples} samples{truncated} -> {path}")
+    except OSError as e:
+        logger.warning(f"Could not write profile for {kind} {name}: {e}")
+
+
+def sampled() -> bool:
+    return random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+def maybe_profile(kind: str, name: str):
+    """profile() for a sampled share of calls; a no-op unless PROFILING_ENABLED."""
+    if not settings.PROFILING_ENABLED or not sampled():
+        return nullcontext()
+    return profile(kind, name)
+
+
+def _is_admin_request(scope) -> bool:
+    from app.core.security import verify_token
+
+    headers = dict(scope["headers"])
+    if headers.get(PROFILE_HEADER) != b"1":
+        return False
+    scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        return verify_token(token, PermissionError()) in settings.ADMIN_USERNAMES
+    except PermissionError:
+        return False
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a sampled share of requests, plus any request an admin sends
+    with `X-Profile: 1`. Only installed when PROFILING_ENABLED is set, so
+    normal deployments pay nothing. Streams (PROFILING_SKIP_PATHS) are left
+    alone: they stay open for hours and would hold the one profile slot
+    for as long.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(tuple(settings.PROFILING_SKIP_PATHS))
+            or not (sampled() or _is_admin_request(scope))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        with profile("http", f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
+
+
+def setup_celery_profiling():
+    """Profiles a sampled share of Celery tasks. Connects nothing unless PROFILING_ENABLED."""
+    if not settings.PROFILING_ENABLED:
+        return
+    from celery import signals
+
+    active = {}
+
+    @signals.task_prerun.connect(weak=False)
+    def _start_profile(task_id=None, task=None, **kwargs):
+        if sampled():
+            context = profile("task", task.name)
+            context.__enter__()
+            active[task_id] = context
+
+    @signals.task_postrun.connect(weak=False)
+    def _stop_profile(task_id=None, **kwargs):
+        context = active.pop(task_id, None)
+        if context is not None:
+            context.__exit__(None, None, None)
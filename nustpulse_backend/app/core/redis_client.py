@@ -0,0 +1,44 @@
+import asyncio
+import weakref
+from functools import lru_cache
+import redis
+import redis.asyncio as aioredis
+from app.core.config import settings
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = weakref.WeakKeyDictionary()
+
+
+@lru_cache
+def get_redis() -> redis.Redis:
+    """Process-wide Redis client (the connection pool is shared)."""
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        socket_timeout=2,
+        socket_connect_timeout=2,
+    )
+
+
+def get_async_redis() -> aioredis.Redis:
+    """
+    Async Redis client for the running event loop. redis.asyncio pools are
+    bound to the loop they were created on, so each loop gets its own.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=2,
+            socket_connect_timeout=2,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_redis():
+    """Closes the running loop's async client (worker shutdown)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,15 @@
+from typing import Any
+import orjson
+from fastapi.responses import Response
+
+
+class ORJSONResponse(Response):
+    """
+    JSON response rendered by orjson. Datetimes keep the same shape Pydantic
+    produces (UTC as `Z`), so clients can't tell which path served them.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
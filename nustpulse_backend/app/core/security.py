@@ -9,12 +9,36 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# Scope of the tokens create_stream_token issues; access tokens have none
+STREAM_SCOPE = "events:stream"
+
+def create_stream_token(user_id: int) -> str:
+    """
+    A short-lived token that only opens the event stream. EventSource can't
+    send headers, so it ends up in a URL (and in access logs); it must not
+    be worth anything anywhere else, or for long.
+    """
+    expire = datetime.now(timezone.utc) + timedelta(seconds=settings.EVENTS_TOKEN_SECONDS)
+    to_encode = {"sub": str(user_id), "scope": STREAM_SCOPE, "exp": expire}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
 def verify_token(token: str, credentials_exception):
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        # Scoped tokens are good for their one purpose only
+        if username is None or payload.get("scope") is not None:
             raise credentials_exception
         return username
     except JWTError:
         raise credentials_exception
+
+def verify_stream_token(token: str, credentials_exception) -> int:
+    """The user id of a token from create_stream_token; anything else is rejected."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if payload.get("scope") != STREAM_SCOPE:
+            raise credentials_exception
+        return int(payload["sub"])
+    except (JWTError, KeyError, ValueError):
+        raise credentials_exception
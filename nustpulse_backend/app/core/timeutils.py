@@ -0,0 +1,21 @@
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+# Students' local time; used wherever a timestamp becomes a calendar day
+PKT = ZoneInfo("Asia/Karachi")
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value: datetime) -> datetime:
+    """SQLite hands back naive datetimes; treat them as UTC so comparisons work."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def local_date(value: datetime) -> date:
+    """The PKT calendar day of a timestamp."""
+    return as_utc(value).astimezone(PKT).date()
@@ -1,18 +1,59 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.core.config import settings
+from app.core import db_stats
 
-DATABASE_URL = settings.DATABASE_URL
+def _normalize_url(url: str) -> str:
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
 
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+def _connect_args(url: str) -> dict:
+    # SQLite (local runs, benchmarks) must allow the session to be used from the
+    # worker's async runtime thread as well as the task thread
+    return {"check_same_thread": False} if url.startswith("sqlite") else {}
 
-engine = create_engine(DATABASE_URL)
+DATABASE_URL = _normalize_url(settings.DATABASE_URL)
+
+engine = create_engine(DATABASE_URL, connect_args=_connect_args(DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only GET routes go to the replica when one is configured. Without one,
+# reads share the primary engine and pool.
+if settings.DATABASE_REPLICA_URL:
+    REPLICA_URL = _normalize_url(settings.DATABASE_REPLICA_URL)
+    read_engine = create_engine(REPLICA_URL, connect_args=_connect_args(REPLICA_URL))
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+else:
+    read_engine = engine
+    ReadSessionLocal = SessionLocal
+
+# Query counts, DB time and the slow-query log (see app.core.db_stats)
+db_stats.install(engine)
+if read_engine is not engine:
+    db_stats.install(read_engine)
+
 Base = declarative_base()
 
+class UnsupportedDatabaseError(RuntimeError):
+    """DATABASE_URL points at a database the app has no SQL for."""
+
+def upsert_insert(db: Session, model):
+    """
+    INSERT for `model` in the session's dialect, which adds
+    on_conflict_do_update. PostgreSQL in production, SQLite for local runs
+    and the benchmarks.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise UnsupportedDatabaseError(f"Upserts need PostgreSQL or SQLite, but the database is {dialect}")
+    return insert(model)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -1,6 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import user, authentication, deadline, dashboard, sync, google_auth
+from app.routers import user, authentication, deadline, dashboard, sync, google_auth, pulse, events, calendar, analytics
+from app.core.metrics import MetricsMiddleware, ServerTimingMiddleware, metrics_response
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.profiling import ProfilingMiddleware
 
 app = FastAPI(title="NustPulse API")
 
@@ -11,6 +15,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 
 
 app.include_router(user.router)
@@ -19,7 +28,15 @@ app.include_router(deadline.router)
 app.include_router(dashboard.router)
 app.include_router(sync.router)
 app.include_router(google_auth.router)
+app.include_router(pulse.router)
+app.include_router(events.router)
+app.include_router(calendar.router)
+app.include_router(analytics.router)
 
 @app.get("/")
 def root():
-    return {"message": "Welcome to NustPulse API"}
\ No newline at end of file
+    return {"message": "Welcome to NustPulse API"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
\ No newline at end of file
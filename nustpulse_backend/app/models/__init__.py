@@ -1,2 +1,7 @@
 from app.models.user import User
 from app.models.deadline import Deadline
+from app.models.sync_run import SyncRun
+from app.models.course import Course
+from app.models.deadline_tombstone import DeadlineTombstone
+from app.models.course_day_load import CourseDayLoad
+from app.models.pulse_event import PulseEvent
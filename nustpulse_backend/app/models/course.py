@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.database.database import Base
+
+class Course(Base):
+    """A Moodle course, keyed by its Moodle id. Deadlines reference it instead of repeating the name."""
+    __tablename__ = "courses"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    fullname = Column(String, nullable=False)
+    shortname = Column(String, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from app.database.database import Base
+
+class CourseDayLoad(Base):
+    """
+    Synced deadlines per course per local (PKT) due day, across every student.
+    Kept current by deltas from each write (see CourseLoadService), never by
+    scanning `deadlines`.
+    """
+    __tablename__ = "course_day_loads"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    # Student deadlines due that day: one per student per assignment
+    deadline_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # ... of which students pinned to their dashboard
+    pinned_count = Column(Integer, nullable=False, default=0, server_default="0")
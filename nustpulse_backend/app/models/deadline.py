@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.database.database import Base
 
@@ -8,14 +8,39 @@ class Deadline(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     due_date = Column(DateTime(timezone=True), nullable=False)
+    # LMS rows point at `courses`; course_name is only kept for manual rows
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=True, index=True)
     course_name = Column(String, nullable=True)
     lms_event_id = Column(Integer, nullable=True)
     is_pinned = Column(Boolean, default=False)
     
     # Notification tracking
     notified_new = Column(Boolean, default=False)
+    # When a worker took this row's new-deadline alert; retried once the lease runs out unsent
+    notify_claimed_at = Column(DateTime(timezone=True), nullable=True)
     last_reminder_sent_at = Column(DateTime(timezone=True), nullable=True)
+    # When the next proximity reminder is due; NULL when none is (see ReminderService)
+    next_reminder_at = Column(DateTime(timezone=True), nullable=True)
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # The owner's deadlines_version when this row last changed (see ChangeFeedService)
+    change_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # On Postgres the table also has a generated `search_vector` column, left
+    # off the model on purpose (see app.services.search_service)
 
     user = relationship("User", back_populates="deadlines")
+    course = relationship("Course", lazy="joined")
+
+    __table_args__ = (
+        Index("ix_deadlines_user_id_change_version", "user_id", "change_version"),
+        # Only pinned rows with a reminder ahead are indexed; the tick reads nothing else
+        Index(
+            "ix_deadlines_next_reminder_at", "next_reminder_at",
+            postgresql_where=next_reminder_at.isnot(None),
+        ),
+    )
+
+    @property
+    def display_course_name(self):
+        """The Moodle course name for synced rows, the free-text name for manual ones."""
+        return self.course.fullname if self.course is not None else self.course_name
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
+from app.database.database import Base
+
+class DeadlineTombstone(Base):
+    """Marks a deleted or pruned deadline so change feeds can report the removal. Compacted after a retention window."""
+    __tablename__ = "deadline_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    deadline_id = Column(Integer, nullable=False)
+    change_version = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_deadline_tombstones_user_id_change_version", "user_id", "change_version"),
+    )
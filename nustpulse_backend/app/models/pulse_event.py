@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from app.database.database import Base
+
+class PulseEvent(Base):
+    """
+    One row per Moodle assignment in the Universal Pulse, however many
+    students have it: the SQL side of the Redis feed, for pulse search.
+    Written by every sync that sees the event, pruned with the feed.
+    """
+    __tablename__ = "pulse_events"
+
+    lms_event_id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    due_date = Column(DateTime(timezone=True), nullable=False, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
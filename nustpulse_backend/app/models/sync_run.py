@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index
+from app.database.database import Base
+
+class SyncRun(Base):
+    """One row per LMS sync attempt, written in a single insert when the run ends."""
+    __tablename__ = "sync_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    trigger = Column(String, nullable=False)  # login / manual / scheduled / sweep
+
+    started_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    finished_at = Column(DateTime(timezone=True), nullable=False)
+    duration_ms = Column(Integer, nullable=False)
+    success = Column(Boolean, nullable=False)
+    failure_reason = Column(String, nullable=True)
+
+    # Phase timings
+    login_ms = Column(Integer, nullable=True)
+    sesskey_ms = Column(Integer, nullable=True)
+    calendar_fetch_ms = Column(Integer, nullable=True)
+    db_upsert_ms = Column(Integer, nullable=True)
+
+    # Cost
+    http_requests = Column(Integer, nullable=False, default=0)
+    bytes_received = Column(Integer, nullable=False, default=0)
+    events_fetched = Column(Integer, nullable=False, default=0)
+    rows_inserted = Column(Integer, nullable=False, default=0)
+    rows_updated = Column(Integer, nullable=False, default=0)
+    rows_pruned = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_sync_runs_user_id_started_at", "user_id", "started_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, DateTime
 from sqlalchemy.orm import relationship
 from app.database.database import Base
 
@@ -14,4 +14,25 @@ class User(Base):
     notification_email = Column(String, nullable=True)
     notifications_enabled = Column(Boolean, default=False)
 
+    # Sync scheduling
+    last_login_at = Column(DateTime(timezone=True), nullable=True)
+    last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    last_changed_at = Column(DateTime(timezone=True), nullable=True)
+    next_sync_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    # Consecutive failed syncs, reset by a successful sync or login. Repeated
+    # credential failures back off and then park the user (next_sync_at NULL)
+    sync_failure_count = Column(Integer, nullable=False, default=0, server_default="0")
+    sync_failure_reason = Column(String, nullable=True)
+
+    # Change feed: bumped once per transaction that changes the user's deadlines;
+    # tombstones at or below tombstones_purged_version have been compacted away
+    deadlines_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # When deadlines_version last moved; the calendar feed's Last-Modified
+    deadlines_changed_at = Column(DateTime(timezone=True), nullable=True)
+    tombstones_purged_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Secret for the iCalendar subscription URL
+    calendar_token = Column(String, nullable=True, unique=True, index=True)
+
     deadlines = relationship("Deadline", back_populates="user", cascade="all, delete")
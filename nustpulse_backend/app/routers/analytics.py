@@ -0,0 +1,28 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.core.oauth2 import get_read_db
+from app.core.responses import ORJSONResponse
+from app.services.course_load_service import CourseLoadService
+from app.schemas.analytics import CourseWeeklyLoad, CrunchDay
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+@router.get("/courses/{course_id}/weeks", response_model=CourseWeeklyLoad)
+def get_course_weeks(
+    course_id: int,
+    weeks: int = Query(8, ge=1, le=26),
+    db: Session = Depends(get_read_db),
+):
+    """Deadlines per week for a course, across every student in it, from this week on."""
+    return ORJSONResponse(CourseLoadService.get_course_weeks(db, course_id, weeks))
+
+@router.get("/crunch-days", response_model=list[CrunchDay])
+def get_crunch_days(
+    days: int = Query(30, ge=1, le=120),
+    limit: int = Query(5, ge=1, le=30),
+    course_id: Optional[List[int]] = Query(None, max_length=50),
+    db: Session = Depends(get_read_db),
+):
+    """The upcoming days with the most deadlines due, optionally limited to some courses."""
+    return ORJSONResponse(CourseLoadService.get_crunch_days(db, days, limit, course_id))
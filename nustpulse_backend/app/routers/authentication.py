@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends, BackgroundTasks, Response, status
 from sqlalchemy.orm import Session
 from app.database.database import get_db
+from app.core.oauth2 import get_token_subject
 from app.services.auth_service import AuthService
 from app.schemas.auth import LoginResponse, LMSLoginRequest
 
@@ -13,3 +14,12 @@ async def login(
     db: Session = Depends(get_db)
 ):
     return await AuthService.login(db, request, background_tasks)
+
+
+@router.get('/auth/check', status_code=status.HTTP_204_NO_CONTENT)
+def check_token(_: str = Depends(get_token_subject)):
+    """
+    204 for a valid token, 401 otherwise. No database access: nginx calls it
+    (auth_request) before answering from its pulse micro-cache.
+    """
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
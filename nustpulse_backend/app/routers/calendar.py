@@ -0,0 +1,61 @@
+from email.utils import parsedate_to_datetime
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.orm import Session
+from app.database.database import get_db
+from app.core.config import settings
+from app.core.oauth2 import get_current_user
+from app.services.calendar_service import CalendarService
+from app.schemas.calendar import CalendarToken
+from app.models.user import User
+
+router = APIRouter(prefix="/calendar", tags=["Calendar"])
+
+def _not_modified(request: Request, etag: str, last_modified: str) -> bool:
+    """If-None-Match wins over If-Modified-Since, as in RFC 9110."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(last_modified)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+@router.post("/token", response_model=CalendarToken)
+def create_calendar_token(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Issues a subscription URL for the user's deadlines. Any previous URL stops working."""
+    token = CalendarService.create_token(db, current_user)
+    return CalendarToken(token=token, path=f"/calendar/{token}.ics")
+
+@router.delete("/token", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_calendar_token(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    CalendarService.revoke_token(db, current_user)
+
+@router.get("/{token}.ics")
+def get_calendar_feed(
+    token: str,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    The iCalendar feed itself. Unauthenticated on purpose: calendar apps
+    can't send bearer tokens, so the unguessable token is the credential.
+    """
+    feed = CalendarService.get_feed(db, token)
+    headers = {
+        "ETag": feed.etag,
+        "Last-Modified": feed.last_modified,
+        "Cache-Control": f"private, max-age={settings.CALENDAR_CLIENT_MAX_AGE_SECONDS}",
+    }
+    if _not_modified(request, feed.etag, feed.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=feed.body, media_type="text/calendar; charset=utf-8", headers=headers)
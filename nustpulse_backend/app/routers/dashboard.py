@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.database.database import get_db
-from app.core.oauth2 import get_current_user
+from app.core.oauth2 import get_current_reader, get_read_db
+from app.core.responses import ORJSONResponse
 from app.services.dashboard_service import DashboardService
 from app.schemas.dashboard import DashboardSummary
 from app.models.user import User
@@ -10,7 +10,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/summary", response_model=DashboardSummary)
 def get_dashboard_summary(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
-    return DashboardService.get_summary(db, current_user)
\ No newline at end of file
+    return ORJSONResponse(DashboardService.get_summary(db, current_user))
\ No newline at end of file
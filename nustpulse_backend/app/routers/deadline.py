@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 from app.database.database import get_db
-from app.core.oauth2 import get_current_user
+from app.core.oauth2 import get_current_user, get_current_reader, get_read_db
+from app.core.responses import ORJSONResponse
 from app.services.deadline_service import DeadlineService
-from app.schemas.deadline import DeadlineCreate, DeadlineResponse, DeadlineUpdate
+from app.services.search_service import SearchService
+from app.schemas.deadline import DeadlineCreate, DeadlineResponse, DeadlineUpdate, DeadlineBatchRequest, DeadlineBatchResult, DeadlineChanges, DeadlineSearchResults
 from app.models.user import User
 
 router = APIRouter(prefix="/deadlines", tags=["Deadlines"])
@@ -18,10 +21,40 @@ def create_deadline(
 
 @router.get("/", response_model=list[DeadlineResponse])
 def get_my_deadlines(
-    db: Session = Depends(get_db), 
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
+):
+    return ORJSONResponse(DeadlineService.get_user_deadlines(db, current_user))
+
+@router.get("/changes", response_model=DeadlineChanges)
+def get_deadline_changes(
+    since: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
+):
+    """Deadlines changed and ids deleted since the cursor from a previous call (0 for everything)."""
+    return ORJSONResponse(DeadlineService.get_changes(db, current_user, since))
+
+@router.get("/search", response_model=DeadlineSearchResults)
+def search_deadlines(
+    q: str = Query(..., min_length=2, max_length=100),
+    course_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
+):
+    """Your deadlines whose title or course matches `q`, best match first."""
+    return ORJSONResponse(SearchService.search_user_deadlines(db, current_user.id, q, course_id, limit, offset))
+
+@router.post("/batch", response_model=DeadlineBatchResult)
+def apply_batch(
+    batch: DeadlineBatchRequest,
+    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return DeadlineService.get_user_deadlines(db, current_user)
+    """Pins, unpins or deletes many deadlines in one request and one transaction."""
+    return ORJSONResponse(DeadlineService.apply_batch(db, current_user, batch.operations))
 
 @router.put("/{deadline_id}", response_model=DeadlineResponse)
 def update_deadline(
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.oauth2 import get_current_reader, get_stream_user_id
+from app.core.security import create_stream_token
+from app.models.user import User
+from app.schemas.events import StreamToken
+from app.services.event_service import EventService
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+@router.post("/token", response_model=StreamToken)
+def create_events_token(current_user: User = Depends(get_current_reader)):
+    """
+    Trades the access token (sent as a header) for a token that can only
+    open /events/stream and expires within a minute. Fetch one right
+    before each (re)connect.
+    """
+    return {"token": create_stream_token(current_user.id), "expires_in": settings.EVENTS_TOKEN_SECONDS}
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    user_id: int = Depends(get_stream_user_id),
+):
+    """
+    Server-sent events for the signed-in user: sync_completed,
+    deadline_changed and pin_changed. Clients refetch when told to
+    instead of polling. `token` comes from POST /events/token.
+    """
+    return StreamingResponse(
+        EventService.stream(user_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -7,6 +7,7 @@ from app.core.config import settings
 from app.core.oauth2 import get_current_user
 from app.models.user import User
 from app.core.security import verify_token
+from app.services.consistency_service import ConsistencyService
 
 router = APIRouter(prefix="/api/auth/google", tags=["Google OAuth"])
 
@@ -92,6 +93,7 @@ async def callback(
     user.notification_email = google_email
     user.notifications_enabled = True
     db.commit()
+    ConsistencyService.mark_write(user.lms_username)
 
     # Redirect back to the frontend profile page
     return RedirectResponse(url="https://nustpulse.com/profile?connected=true")
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query, Response
+from typing import Optional
+from app.core.config import settings
+from sqlalchemy.orm import Session
+from app.core.oauth2 import get_token_subject, get_read_db
+from app.core.responses import ORJSONResponse
+from app.services.pulse_service import PulseService
+from app.services.search_service import SearchService
+from app.schemas.pulse import PulseFeed, PulseCourse, PulseSearchResults
+
+router = APIRouter(prefix="/pulse", tags=["Pulse"])
+
+@router.get("/", response_model=PulseFeed)
+def get_pulse_feed(
+    response: Response,
+    course_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    _: str = Depends(get_token_subject),
+):
+    """Upcoming assignments across every synced course, in due-date order."""
+    response.headers["Cache-Control"] = f"private, max-age={settings.PULSE_CACHE_SECONDS}"
+    return PulseService.get_feed(course_id, cursor, limit)
+
+@router.get("/courses", response_model=list[PulseCourse])
+def get_pulse_courses(
+    response: Response,
+    _: str = Depends(get_token_subject),
+):
+    """Courses that currently have activity in the feed."""
+    response.headers["Cache-Control"] = f"private, max-age={settings.PULSE_CACHE_SECONDS}"
+    return PulseService.get_courses()
+
+@router.get("/search", response_model=PulseSearchResults)
+def search_pulse(
+    q: str = Query(..., min_length=2, max_length=100),
+    course_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    """Assignments in the feed whose title or course matches `q`, best match first."""
+    return ORJSONResponse(SearchService.search_pulse(db, q, course_id, limit, offset))
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.database.database import get_db
-from app.core.oauth2 import get_current_user
+from app.core.oauth2 import get_current_user, get_current_reader, get_current_admin, get_read_db
 from app.models.user import User
 from app.services.sync_service import SyncService
+from app.services.sync_run_service import SyncRunService
+from app.services.sync_queue_service import SyncQueueService, SyncInProgressError
+from app.schemas.sync import SyncRunResponse, SyncCostReport, SyncQueueStats
 
 router = APIRouter(prefix="/sync", tags=["Sync"])
 
@@ -17,11 +20,66 @@ async def trigger_sync(
     """
     Triggers a full LMS sync for the authenticated user using their stored
     (encrypted) credentials.  Called by the frontend 'Sync Portal' button.
+    Runs in the request, so it never waits behind the background sweep;
+    repeated clicks are throttled per user.
     """
-    success = await SyncService.sync_by_stored_credentials(db, current_user)
+    retry_after = SyncQueueService.claim_cooldown(current_user.id)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="You synced a moment ago. Please wait before syncing again.",
+            headers={"Retry-After": str(retry_after)},
+        )
+    try:
+        success = await SyncService.sync_by_stored_credentials(db, current_user)
+    except SyncInProgressError:
+        # Nothing ran, so this click mustn't hold up a retry once the running sync ends
+        SyncQueueService.release_cooldown(current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A sync for your account is already running.",
+        )
     if not success:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Could not sync with LMS. Please check your portal credentials.",
         )
     return {"message": "Sync completed successfully"}
+
+
+@router.get("/last", response_model=SyncRunResponse)
+def get_last_sync(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+):
+    """When the caller last synced, how long it took and what it changed."""
+    return SyncRunService.get_last_run(db, current_user)
+
+
+@router.get("/runs", response_model=list[SyncRunResponse])
+def get_sync_history(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+):
+    """The caller's recent sync runs, newest first."""
+    return SyncRunService.get_runs(db, current_user, limit)
+
+
+@router.get("/admin/cost", response_model=SyncCostReport)
+def get_sync_cost_report(
+    days: int = Query(7, ge=1, le=90),
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_admin),
+):
+    """Slowest users and phases across all syncs in the window (admin only)."""
+    return SyncRunService.get_cost_report(db, days, limit)
+
+
+@router.get("/admin/queues", response_model=list[SyncQueueStats])
+def get_sync_queues(
+    _: User = Depends(get_current_admin),
+):
+    """Backlog and oldest wait on each sync lane (admin only)."""
+    return SyncQueueService.queue_stats()
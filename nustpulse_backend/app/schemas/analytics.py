@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List
+
+class WeekLoad(BaseModel):
+    week_start: date  # Monday, PKT
+    deadlines: int  # Student deadlines due that week, across everyone in the course
+    pinned: int
+
+class CourseWeeklyLoad(BaseModel):
+    course_id: int
+    course_name: str
+    weeks: List[WeekLoad]
+
+class CrunchDay(BaseModel):
+    day: date
+    deadlines: int
+    pinned: int
+    courses: int  # Courses with something due that day
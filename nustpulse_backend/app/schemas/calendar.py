@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+class CalendarToken(BaseModel):
+    token: str
+    path: str  # Relative to the API root, e.g. /calendar/<token>.ics
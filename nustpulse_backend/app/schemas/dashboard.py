@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date
-from typing import List
+from typing import List, Optional
 from app.schemas.deadline import DeadlineResponse
 
 class WeeklyLoadDay(BaseModel):
@@ -10,6 +10,7 @@ class WeeklyLoadDay(BaseModel):
     deadlines_list: List[DeadlineResponse] = []
 
 class CourseSummary(BaseModel):
+    course_id: Optional[int] = None  # None for manual deadlines
     course_name: str
     count: int
 
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 class DeadlineBase(BaseModel):
     title: str
@@ -15,6 +15,9 @@ class DeadlineCreate(DeadlineBase):
 class DeadlineResponse(DeadlineBase):
     id: int
     user_id: int
+    course_id: Optional[int] = None
+    # Read from Deadline.display_course_name, so synced rows show the course's name
+    course_name: Optional[str] = Field(None, validation_alias=AliasChoices("display_course_name", "course_name"))
 
     class Config:
         from_attributes = True
@@ -23,3 +26,25 @@ class DeadlineUpdate(BaseModel):
     title: Optional[str] = None
     due_date: Optional[datetime] = None
     course_name: Optional[str] = None
+
+class DeadlineChanges(BaseModel):
+    cursor: int  # Pass back as `since` on the next request
+    reset: bool  # True: `changed` is the full list and replaces the client's copy
+    changed: List[DeadlineResponse]
+    deleted_ids: List[int]
+
+class DeadlineSearchResults(BaseModel):
+    items: List[DeadlineResponse]  # Best match first
+    next_offset: Optional[int] = None  # Pass back as `offset` for the next page
+
+class DeadlineBatchOperation(BaseModel):
+    id: int
+    action: Literal["pin", "unpin", "delete"]
+
+class DeadlineBatchRequest(BaseModel):
+    operations: List[DeadlineBatchOperation] = Field(..., min_length=1, max_length=200)
+
+class DeadlineBatchResult(BaseModel):
+    updated: List[DeadlineResponse]
+    deleted_ids: List[int]
+    missing_ids: List[int]  # Not found, or not owned by the caller
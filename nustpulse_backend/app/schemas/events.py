@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+class StreamToken(BaseModel):
+    token: str
+    expires_in: int  # Seconds; open /events/stream?token=<token> before then
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class PulseItem(BaseModel):
+    lms_event_id: int
+    title: str
+    due_date: datetime
+    event_type: Optional[str] = None
+    course_id: Optional[int] = None
+    course_name: Optional[str] = None
+    course_shortname: Optional[str] = None
+
+class PulseFeed(BaseModel):
+    items: List[PulseItem]
+    next_cursor: Optional[str] = None
+
+class PulseSearchResults(BaseModel):
+    items: List[PulseItem]  # Best match first
+    next_offset: Optional[int] = None
+
+class PulseCourse(BaseModel):
+    id: int
+    fullname: str
+    shortname: Optional[str] = None
@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class SyncRunResponse(BaseModel):
+    id: int
+    trigger: str
+    started_at: datetime
+    finished_at: datetime
+    duration_ms: int
+    success: bool
+    failure_reason: Optional[str] = None
+    login_ms: Optional[int] = None
+    sesskey_ms: Optional[int] = None
+    calendar_fetch_ms: Optional[int] = None
+    db_upsert_ms: Optional[int] = None
+    http_requests: int
+    bytes_received: int
+    events_fetched: int
+    rows_inserted: int
+    rows_updated: int
+    rows_pruned: int
+
+    class Config:
+        from_attributes = True
+
+class SlowUser(BaseModel):
+    user_id: int
+    lms_username: str
+    runs: int
+    failures: int
+    avg_duration_ms: float
+    max_duration_ms: int
+
+class PhaseCost(BaseModel):
+    phase: str
+    avg_ms: float
+    max_ms: int
+
+class SyncCostReport(BaseModel):
+    since: datetime
+    total_runs: int
+    failed_runs: int
+    slowest_users: List[SlowUser]
+    phases: List[PhaseCost]
+
+class SyncQueueStats(BaseModel):
+    queue: str
+    depth: int
+    oldest_wait_seconds: Optional[float] = None  # Age of the next message a worker will take
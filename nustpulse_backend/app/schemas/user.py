@@ -12,6 +12,8 @@ class UserResponse(UserBase):
     id: int
     notification_email: Optional[str] = None
     notifications_enabled: bool
+    # e.g. "auth_failed": the stored LMS password stopped working; logging in again fixes it
+    sync_failure_reason: Optional[str] = None
 
     class Config:
         from_attributes = True
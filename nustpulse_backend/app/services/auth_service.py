@@ -3,14 +3,21 @@ from fastapi import HTTPException, status
 from app.models.user import User
 from app.core.security import create_access_token
 from app.services.lms_service import LMSSession
+from app.services.lms_guard import LMSUnavailableError
 from app.services.crypto_service import encrypt_password
 from app.services.sync_service import SyncService
+from app.services.schedule_service import ScheduleService
+from app.core.config import settings
+from app.core.timeutils import utcnow
+from datetime import timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 from app.database.database import SessionLocal
+from app.services.consistency_service import ConsistencyService
+from app.services.sync_queue_service import SyncQueueService, SyncInProgressError
 
 class AuthService:
     @staticmethod
@@ -21,7 +28,14 @@ class AuthService:
         # 1. Open a fresh LMS session and authenticate
         lms = LMSSession()
         try:
-            is_valid = await lms.login(request.email, request.password)
+            try:
+                is_valid = await lms.login(request.email, request.password)
+            except LMSUnavailableError as e:
+                logger.warning(f"LMS unavailable during login for {request.email}: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="NUST LMS is not responding right now. Please try again shortly.",
+                )
 
             if not is_valid:
                 raise HTTPException(
@@ -37,10 +51,14 @@ class AuthService:
                 # Fetch their name using the already-authenticated session
                 full_name = await lms.get_user_full_name()
 
+                now = utcnow()
                 user = User(
                     name=full_name,
                     lms_username=request.email,
                     lms_password=encrypt_password(request.password),
+                    last_login_at=now,
+                    # Safety net in case the background sync below never completes
+                    next_sync_at=now + timedelta(minutes=settings.SYNC_CLAIM_LEASE_MINUTES),
                 )
                 db.add(user)
                 db.commit()
@@ -53,12 +71,19 @@ class AuthService:
                     user.name = full_name
                 # Update stored password in case it changed
                 user.lms_password = encrypt_password(request.password)
+                user.last_login_at = utcnow()
+                ScheduleService.clear_failures(user, user.last_login_at)
                 db.commit()
         finally:
             await lms.close()
 
-        # 4. Trigger sync in the background so login is instant
-        background_tasks.add_task(AuthService._background_sync, user.id, request.password)
+        # 4. Trigger sync on the interactive lane so login is instant; falls
+        # back to this process if the broker is down
+        if not SyncQueueService.enqueue_interactive(user.id, "login"):
+            background_tasks.add_task(AuthService._background_sync, user.id, request.password)
+
+        # The client reads its profile and deadlines right after logging in
+        ConsistencyService.mark_write(user.lms_username)
 
         # 5. Generate our App Session Token (JWT)
         access_token = create_access_token(data={"sub": user.lms_username})
@@ -76,6 +101,8 @@ class AuthService:
         try:
             user = db.query(User).filter(User.id == user_id).first()
             if user:
-                await SyncService.sync_user_deadlines(db, user, password)
+                await SyncService.sync_user_deadlines(db, user, password, trigger="login")
+        except SyncInProgressError:
+            logger.info(f"Skipping login sync for user {user_id}: already syncing")
         finally:
             db.close()
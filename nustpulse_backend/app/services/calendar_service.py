@@ -0,0 +1,224 @@
+import hashlib
+import logging
+import secrets
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime
+from typing import Optional
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.core.timeutils import utcnow, as_utc
+from app.models.course import Course
+from app.models.deadline import Deadline
+from app.models.user import User
+from app.services.course_service import COURSE_NAME
+
+logger = logging.getLogger(__name__)
+
+# Redis layout:
+#   calendar:token:<token>      string  user id the token belongs to
+#   calendar:feed:<user_id>     hash    body, etag, last_modified of the rendered feed
+#   calendar:version:<user_id>  string  bumped by every invalidate (missing = 0)
+TOKEN_KEY = "calendar:token:{}"
+FEED_KEY = "calendar:feed:{}"
+VERSION_KEY = "calendar:version:{}"
+
+# Caches a render only if no invalidate ran since the render read the version,
+# so a render of data that has since changed is never stored
+STORE_FEED_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'body', ARGV[2], 'etag', ARGV[3], 'last_modified', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return 1
+"""
+
+
+@dataclass
+class CalendarFeed:
+    body: str
+    etag: str
+    last_modified: str
+
+
+def _escape(text: str) -> str:
+    """RFC 5545 TEXT escaping."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Folds a content line at 75 octets, as calendar clients require."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts, current = [], b""
+    for char in line:
+        piece = char.encode("utf-8")
+        if len(current) + len(piece) > (75 if not parts else 74):
+            parts.append(current.decode("utf-8"))
+            current = b""
+        current += piece
+    parts.append(current.decode("utf-8"))
+    return "\r\n ".join(parts)
+
+
+def _ics_time(value: datetime) -> str:
+    return as_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+class CalendarService:
+    """
+    Per-user iCalendar subscription feed.
+
+    Calendar clients poll the URL every few minutes, so the rendered feed is
+    cached in Redis together with its ETag. A poll with a matching
+    If-None-Match costs two Redis reads and no database query. Any change to
+    the user's deadlines drops the cached copy and bumps the user's feed
+    version (see `invalidate`); a render only goes into the cache if the
+    version hasn't moved since it started.
+    """
+
+    @staticmethod
+    def create_token(db: Session, user: User) -> str:
+        """Issues a new feed token, revoking the previous one."""
+        CalendarService._forget_token(user.calendar_token)
+        user.calendar_token = secrets.token_urlsafe(32)
+        db.commit()
+        return user.calendar_token
+
+    @staticmethod
+    def revoke_token(db: Session, user: User):
+        CalendarService._forget_token(user.calendar_token)
+        user.calendar_token = None
+        db.commit()
+        CalendarService.invalidate(user.id)
+
+    @staticmethod
+    def invalidate(user_id: int):
+        """Drops the cached feed; called whenever the user's deadlines change."""
+        try:
+            pipe = get_redis().pipeline()
+            pipe.incr(VERSION_KEY.format(user_id))
+            # Only has to outlive the renders in flight; a missing version reads as 0
+            pipe.expire(VERSION_KEY.format(user_id), settings.CALENDAR_CACHE_SECONDS)
+            pipe.delete(FEED_KEY.format(user_id))
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Could not invalidate calendar feed for user {user_id}: {e}")
+
+    @staticmethod
+    def get_feed(db: Session, token: str) -> CalendarFeed:
+        user_id = CalendarService._resolve_token(db, token)
+        if user_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar not found")
+
+        version = None
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.hgetall(FEED_KEY.format(user_id))
+            pipe.get(VERSION_KEY.format(user_id))
+            cached, current = pipe.execute()
+            if cached:
+                return CalendarFeed(**cached)
+            version = current or "0"
+        except RedisError as e:
+            logger.warning(f"Could not read cached calendar feed for user {user_id}: {e}")
+
+        # Rendered after reading the version, so a change committed meanwhile
+        # has bumped it by the time we try to store this copy
+        feed = CalendarService._render(db, user_id)
+        if version is not None:
+            try:
+                get_redis().eval(
+                    STORE_FEED_SCRIPT, 2, FEED_KEY.format(user_id), VERSION_KEY.format(user_id),
+                    version, feed.body, feed.etag, feed.last_modified, settings.CALENDAR_CACHE_SECONDS,
+                )
+            except RedisError as e:
+                logger.warning(f"Could not cache calendar feed for user {user_id}: {e}")
+        return feed
+
+    @staticmethod
+    def _resolve_token(db: Session, token: str) -> Optional[int]:
+        try:
+            cached = get_redis().get(TOKEN_KEY.format(token))
+            if cached:
+                return int(cached)
+        except RedisError as e:
+            logger.warning(f"Could not read calendar token cache: {e}")
+
+        user_id = db.query(User.id).filter(User.calendar_token == token).scalar()
+        if user_id is not None:
+            try:
+                get_redis().set(TOKEN_KEY.format(token), user_id, ex=settings.CALENDAR_CACHE_SECONDS)
+            except RedisError as e:
+                logger.warning(f"Could not cache calendar token: {e}")
+        return user_id
+
+    @staticmethod
+    def _forget_token(token: Optional[str]):
+        if not token:
+            return
+        try:
+            get_redis().delete(TOKEN_KEY.format(token))
+        except RedisError as e:
+            logger.warning(f"Could not drop calendar token from cache: {e}")
+
+    @staticmethod
+    def _render(db: Session, user_id: int) -> CalendarFeed:
+        rows = (
+            db.query(Deadline.id, Deadline.title, Deadline.due_date, COURSE_NAME.label("course_name"), Deadline.is_pinned)
+            .outerjoin(Course, Deadline.course_id == Course.id)
+            .filter(Deadline.user_id == user_id)
+            .order_by(Deadline.due_date)
+            .all()
+        )
+        rendered_at = utcnow()
+        stamp = _ics_time(rendered_at)
+        # Last-Modified is when the deadlines last changed, not when we rendered,
+        # so If-Modified-Since keeps matching across re-renders of the same data
+        changed_at = db.query(User.deadlines_changed_at).filter(User.id == user_id).scalar()
+
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//NustPulse//Deadlines//EN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            "X-WR-CALNAME:NustPulse Deadlines",
+            "X-PUBLISHED-TTL:PT1H",
+        ]
+        for row in rows:
+            due = _ics_time(row.due_date)
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:deadline-{row.id}@nustpulse.com",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{due}",
+                f"DTEND:{due}",
+                f"SUMMARY:{_escape(row.title)}",
+                f"DESCRIPTION:{_escape(row.course_name or 'General')}",
+            ]
+            if row.is_pinned:
+                lines.append("CATEGORIES:Pinned")
+            lines.append("END:VEVENT")
+        lines.append("END:VCALENDAR")
+
+        body = "\r\n".join(_fold(line) for line in lines) + "\r\n"
+        # DTSTAMP changes on every render, so hash the content without it
+        digest = hashlib.sha1(body.replace(stamp, "").encode("utf-8")).hexdigest()
+        return CalendarFeed(
+            body=body,
+            etag=f'"{digest}"',
+            last_modified=format_datetime(as_utc(changed_at or rendered_at), usegmt=True),
+        )
@@ -0,0 +1,99 @@
+import logging
+from datetime import datetime
+from typing import Iterable, List
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.timeutils import utcnow
+from app.models.deadline import Deadline
+from app.models.deadline_tombstone import DeadlineTombstone
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeFeedService:
+    """
+    Incremental sync of a user's deadline list.
+
+    Every transaction that changes a user's deadlines takes the next value
+    of `users.deadlines_version` and stamps it on the rows it touches;
+    deletions leave a tombstone with that version instead. A client keeps
+    the last version it saw as its cursor and asks only for what is newer.
+
+    Bumping the counter row-locks the user until commit, so one user's
+    writers are serialised and versions become visible in order: a reader
+    holding cursor N can never later find a row committed with a version
+    at or below N. DeadlineService.get_changes serves the feed.
+    """
+
+    @staticmethod
+    def next_version(db: Session, user_id: int) -> int:
+        return db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(deadlines_version=User.deadlines_version + 1, deadlines_changed_at=utcnow())
+            .returning(User.deadlines_version)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+
+    @staticmethod
+    def touch_courses(db: Session, course_ids: Iterable[int]) -> List[int]:
+        """
+        Marks every deadline in these courses as changed, for when something
+        they show but don't store (the course name) changes: each owner gets
+        one new version, stamped on their deadlines in those courses. Returns
+        the owners' ids. Users are locked in id order first, so two renames
+        sharing students can't deadlock.
+        """
+        course_ids = list(course_ids)
+        user_ids = [
+            user_id for (user_id,) in
+            db.query(Deadline.user_id).filter(Deadline.course_id.in_(course_ids)).distinct()
+        ]
+        if not user_ids:
+            return []
+
+        db.query(User.id).filter(User.id.in_(user_ids)).order_by(User.id).with_for_update().all()
+        db.execute(
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values(deadlines_version=User.deadlines_version + 1, deadlines_changed_at=utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            update(Deadline)
+            .where(Deadline.course_id.in_(course_ids))
+            .values(change_version=select(User.deadlines_version).where(User.id == Deadline.user_id).scalar_subquery())
+            .execution_options(synchronize_session=False)
+        )
+        return user_ids
+
+    @staticmethod
+    def record_deletions(db: Session, user_id: int, deadline_ids: Iterable[int], version: int):
+        now = utcnow()
+        rows = [
+            {"user_id": user_id, "deadline_id": deadline_id, "change_version": version, "deleted_at": now}
+            for deadline_id in deadline_ids
+        ]
+        if rows:
+            db.execute(insert(DeadlineTombstone), rows)
+
+    @staticmethod
+    def compact(db: Session, before: datetime) -> int:
+        """
+        Drops tombstones older than `before`, first recording per user the
+        newest version dropped, below which cursors can no longer be served.
+        """
+        expired = DeadlineTombstone.deleted_at < before
+        purged_version = (
+            select(func.max(DeadlineTombstone.change_version))
+            .where(DeadlineTombstone.user_id == User.id, expired)
+            .scalar_subquery()
+        )
+        db.query(User).filter(
+            User.id.in_(select(DeadlineTombstone.user_id).where(expired))
+        ).update({User.tombstones_purged_version: purged_version}, synchronize_session=False)
+        removed = db.query(DeadlineTombstone).filter(expired).delete(synchronize_session=False)
+        db.commit()
+        return removed
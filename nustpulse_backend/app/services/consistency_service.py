@@ -0,0 +1,42 @@
+import logging
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Redis layout:
+#   db:sticky:<lms_username>    set for READ_YOUR_WRITES_SECONDS after the user's own write
+STICKY_KEY = "db:sticky:{}"
+
+
+class ConsistencyService:
+    """
+    Read-your-writes on top of an asynchronous replica.
+
+    A user's own writes (edits, pins, login, a finished sync) pin their reads
+    to the primary for a short window, longer than normal replica lag, so they
+    never see a page from before the change they just made. Keys are the JWT
+    subject so the check needs no database lookup.
+    """
+
+    @staticmethod
+    def mark_write(subject: str):
+        if not settings.DATABASE_REPLICA_URL:
+            return
+        try:
+            get_redis().set(STICKY_KEY.format(subject), 1, ex=settings.READ_YOUR_WRITES_SECONDS)
+        except RedisError as e:
+            logger.warning(f"Could not mark recent write for {subject}: {e}")
+
+    @staticmethod
+    def reads_from_primary(subject: str) -> bool:
+        """True while the user is inside their stickiness window. Unknown counts as yes."""
+        if not settings.DATABASE_REPLICA_URL:
+            return True
+        try:
+            return bool(get_redis().exists(STICKY_KEY.format(subject)))
+        except RedisError as e:
+            logger.warning(f"Could not check recent writes for {subject}, reading from primary: {e}")
+            return True
@@ -0,0 +1,126 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.timeutils import utcnow, local_date
+from app.database.database import upsert_insert
+from app.models.course import Course
+from app.models.course_day_load import CourseDayLoad
+
+
+class LoadDeltas:
+    """
+    Net change to course_day_loads from one transaction's writes. Callers
+    remove a row's old state and add its new one; only synced rows (with a
+    course id) count, and moves that cancel out are never written.
+    """
+
+    def __init__(self):
+        self._deltas: Dict[Tuple[int, date], List[int]] = defaultdict(lambda: [0, 0])
+
+    def add(self, course_id: Optional[int], due_date: datetime, is_pinned: bool, sign: int = 1):
+        if course_id is None:
+            return
+        delta = self._deltas[(course_id, local_date(due_date))]
+        delta[0] += sign
+        if is_pinned:
+            delta[1] += sign
+
+    def remove(self, course_id: Optional[int], due_date: datetime, is_pinned: bool):
+        self.add(course_id, due_date, is_pinned, sign=-1)
+
+    def rows(self) -> List[dict]:
+        # Key order, so concurrent writers lock counter rows in the same order
+        return [
+            {"course_id": course_id, "day": day, "deadline_count": count, "pinned_count": pinned}
+            for (course_id, day), (count, pinned) in sorted(self._deltas.items())
+            if count or pinned
+        ]
+
+
+class CourseLoadService:
+    """
+    Course workload analytics over all students.
+
+    `course_day_loads` holds one counter row per course per due day. Sync and
+    deadline writes apply their LoadDeltas in the same transaction as the
+    rows they change, so the counters stay exact without ever recomputing
+    from `deadlines`, and reads cost the same however large that table gets.
+    """
+
+    @staticmethod
+    def apply(db: Session, deltas: LoadDeltas):
+        """Adds the deltas to their counters with one upsert, in the caller's transaction."""
+        rows = deltas.rows()
+        if not rows:
+            return
+
+        stmt = upsert_insert(db, CourseDayLoad)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[CourseDayLoad.course_id, CourseDayLoad.day],
+                set_={
+                    "deadline_count": CourseDayLoad.deadline_count + stmt.excluded.deadline_count,
+                    "pinned_count": CourseDayLoad.pinned_count + stmt.excluded.pinned_count,
+                },
+            ),
+            rows,
+        )
+
+    @staticmethod
+    def get_course_weeks(db: Session, course_id: int, weeks: int) -> Dict[str, Any]:
+        """
+        Load per week (Monday to Sunday, PKT) for one course, starting with
+        the current week. Shaped like CourseWeeklyLoad.
+        """
+        course = db.get(Course, course_id)
+        if course is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+
+        today = local_date(utcnow())
+        first_week = today - timedelta(days=today.weekday())
+        buckets = [
+            {"week_start": first_week + timedelta(weeks=n), "deadlines": 0, "pinned": 0}
+            for n in range(weeks)
+        ]
+        rows = db.query(CourseDayLoad.day, CourseDayLoad.deadline_count, CourseDayLoad.pinned_count).filter(
+            CourseDayLoad.course_id == course_id,
+            CourseDayLoad.day >= first_week,
+            CourseDayLoad.day < first_week + timedelta(weeks=weeks),
+        )
+        for day, count, pinned in rows:
+            bucket = buckets[(day - first_week).days // 7]
+            bucket["deadlines"] += count
+            bucket["pinned"] += pinned
+
+        return {"course_id": course.id, "course_name": course.fullname, "weeks": buckets}
+
+    @staticmethod
+    def get_crunch_days(db: Session, days: int, limit: int, course_ids: Optional[List[int]]) -> List[Dict[str, Any]]:
+        """
+        The heaviest upcoming days across all courses (or just `course_ids`),
+        heaviest first. Shaped like CrunchDay.
+        """
+        today = local_date(utcnow())
+        query = db.query(
+            CourseDayLoad.day,
+            func.sum(CourseDayLoad.deadline_count).label("deadlines"),
+            func.sum(CourseDayLoad.pinned_count).label("pinned"),
+            func.count().label("courses"),
+        ).filter(
+            CourseDayLoad.day >= today,
+            CourseDayLoad.day < today + timedelta(days=days),
+            CourseDayLoad.deadline_count > 0,
+        )
+        if course_ids:
+            query = query.filter(CourseDayLoad.course_id.in_(course_ids))
+
+        rows = (
+            query.group_by(CourseDayLoad.day)
+            .order_by(func.sum(CourseDayLoad.deadline_count).desc(), CourseDayLoad.day)
+            .limit(limit)
+        )
+        return [row._asdict() for row in rows]
@@ -0,0 +1,75 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.timeutils import utcnow
+from app.database.database import upsert_insert
+from app.models.course import Course
+from app.models.deadline import Deadline
+from app.services.change_feed_service import ChangeFeedService
+
+logger = logging.getLogger(__name__)
+
+# The course name clients see: the course's for synced rows, the stored text for
+# manual ones. Needs an outer join from deadlines to courses.
+COURSE_NAME = func.coalesce(Course.fullname, Deadline.course_name)
+
+# Moodle course id -> (fullname, shortname) known to be stored, per process
+_known: Dict[int, Tuple[str, Optional[str]]] = {}
+
+
+class CourseService:
+    """
+    Keeps the `courses` table in step with what syncs see.
+
+    Every user in a course reports the same metadata, so after the first
+    sync in a process almost every lookup is a dict hit and no SQL is run.
+    Only new or renamed courses are written, with a single upsert.
+
+    Deadlines show their course's fullname without storing it, so a rename
+    changes every deadline in the course: they go through the change feed
+    like any other edit (see ChangeFeedService.touch_courses).
+    """
+
+    @staticmethod
+    def ensure_courses(
+        db: Session, courses: Dict[int, Tuple[str, Optional[str]]],
+    ) -> Tuple[Dict[int, Tuple[str, Optional[str]]], List[int]]:
+        """
+        Upserts courses the process hasn't seen (or whose names changed) in the
+        caller's transaction. Returns them, so the caller can `remember` them
+        once that transaction commits, and the ids of users whose deadlines
+        a rename changed, whose caches the caller drops after the commit.
+        """
+        pending = {cid: meta for cid, meta in courses.items() if _known.get(cid) != meta}
+        if not pending:
+            return pending, []
+
+        stored = dict(db.query(Course.id, Course.fullname).filter(Course.id.in_(pending)))
+        renamed = [cid for cid, (fullname, _) in pending.items() if cid in stored and stored[cid] != fullname]
+
+        now = utcnow()
+        stmt = upsert_insert(db, Course).values([
+            {"id": cid, "fullname": fullname, "shortname": shortname, "updated_at": now}
+            for cid, (fullname, shortname) in pending.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Course.id],
+            set_={
+                "fullname": stmt.excluded.fullname,
+                "shortname": stmt.excluded.shortname,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.execute(stmt)
+
+        touched = ChangeFeedService.touch_courses(db, renamed) if renamed else []
+        if renamed:
+            logger.info(f"Renamed courses {renamed}; {len(touched)} users' deadlines marked changed")
+        return pending, touched
+
+    @staticmethod
+    def remember(courses: Dict[int, Tuple[str, Optional[str]]]):
+        """Marks courses as stored. Only call after the upsert has committed."""
+        _known.update(courses)
@@ -2,24 +2,30 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import date, timedelta
 from app.models.deadline import Deadline
-from app.schemas.dashboard import DashboardSummary, WeeklyLoadDay, CourseSummary
+from app.services.deadline_service import response_query
 import logging
 
 logger = logging.getLogger(__name__)
 
 class DashboardService:
     @staticmethod
-    def get_summary(db: Session, current_user):
-        
+    def get_summary(db: Session, current_user) -> dict:
+        """
+        Built from plain row dicts and returned as a dict shaped like
+        DashboardSummary; the router serializes it without re-validating.
+        """
         today = date.today()
         # Fetch deadlines for the next 14 days for a better overview
         end_date = today + timedelta(days=13)
 
-        deadlines = db.query(Deadline).filter(
-            Deadline.user_id == current_user.id,
-            func.date(Deadline.due_date) >= today,
-            Deadline.is_pinned == True
-        ).all()
+        deadlines = [
+            row._asdict()
+            for row in response_query(db).filter(
+                Deadline.user_id == current_user.id,
+                func.date(Deadline.due_date) >= today,
+                Deadline.is_pinned == True
+            )
+        ]
 
         # 1. Weekly Load (Next 7 days)
         weekly_map = {}
@@ -33,34 +39,35 @@ class DashboardService:
             }
         
         for deadline in deadlines:
-            deadline_date = deadline.due_date.date()
+            deadline_date = deadline["due_date"].date()
             if today <= deadline_date <= today + timedelta(days=6):
                 bucket = weekly_map.get(deadline_date)
                 if bucket:
                     bucket["deadlines"] += 1
                     bucket["deadlines_list"].append(deadline)
 
-        weekly_load = [
-            WeeklyLoadDay(**day)
-            for day in weekly_map.values()
-        ]
+        weekly_load = list(weekly_map.values())
 
         # 2. Course Summary
+        # Synced rows group on the integer course id; manual rows on their free-text name
         course_counts = {}
         for deadline in deadlines:
-            name = deadline.course_name or "General"
-            course_counts[name] = course_counts.get(name, 0) + 1
-        
-        course_summary = [
-            CourseSummary(course_name=name, count=count)
-            for name, count in sorted(course_counts.items(), key=lambda x: x[1], reverse=True)
-        ]
+            key = deadline["course_id"] or deadline["course_name"]
+            entry = course_counts.get(key)
+            if entry is None:
+                entry = course_counts[key] = {
+                    "course_id": deadline["course_id"],
+                    "course_name": deadline["course_name"] or "General",
+                    "count": 0,
+                }
+            entry["count"] += 1
 
-        result = DashboardSummary(
-            upcoming_deadlines=len(deadlines),
-            weekly_load=weekly_load,
-            course_summary=course_summary
-        )
-        
+        course_summary = sorted(course_counts.values(), key=lambda x: x["count"], reverse=True)
+
+        result = {
+            "upcoming_deadlines": len(deadlines),
+            "weekly_load": weekly_load,
+            "course_summary": course_summary,
+        }
         
         return result
@@ -1,71 +1,253 @@
+from sqlalchemy import case
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.models.course import Course
 from app.models.deadline import Deadline
+from app.models.deadline_tombstone import DeadlineTombstone
+from app.models.user import User
+from app.schemas.deadline import DeadlineResponse
+from app.services.event_service import EventService, DEADLINE_CHANGED, PIN_CHANGED
+from app.services.calendar_service import CalendarService
+from app.services.course_service import COURSE_NAME
+from app.services.change_feed_service import ChangeFeedService
+from app.services.course_load_service import CourseLoadService, LoadDeltas
+from app.services.reminder_service import ReminderService
+
+
+# Columns selected for read-only listings, in DeadlineResponse field order
+RESPONSE_COLUMNS = tuple(
+    COURSE_NAME.label("course_name") if field == "course_name" else getattr(Deadline, field)
+    for field in DeadlineResponse.model_fields
+)
+
+
+def response_query(db: Session):
+    """SELECT of RESPONSE_COLUMNS, joined to courses for the display name."""
+    return db.query(*RESPONSE_COLUMNS).outerjoin(Course, Deadline.course_id == Course.id)
 
 
 class DeadlineService:
     @staticmethod
     def create_deadline(db: Session, current_user, deadline_data):
+        # Read up front: commit expires current_user, and reloading it just for the id
+        # would cost every mutation an extra SELECT
+        user_id = current_user.id
         new_deadline = Deadline(
             **deadline_data.model_dump(), 
-            user_id=current_user.id,
-            notified_new=True # No need to notify for manual creation
+            user_id=user_id,
+            notified_new=True, # No need to notify for manual creation
+            change_version=ChangeFeedService.next_version(db, user_id),
         )
+        ReminderService.schedule(new_deadline)
         db.add(new_deadline)
         db.commit()
         db.refresh(new_deadline)
+        CalendarService.invalidate(user_id)
+        EventService.publish(user_id, DEADLINE_CHANGED, {"id": new_deadline.id, "action": "created"})
 
         return new_deadline
 
     @staticmethod
-    def get_user_deadlines(db: Session, current_user):
-        return db.query(Deadline).filter(Deadline.user_id == current_user.id).all()
+    def get_user_deadlines(db: Session, current_user) -> list[dict]:
+        """
+        Plain dicts shaped like DeadlineResponse. Selecting columns skips ORM
+        identity-map hydration, and the router serializes the dicts directly.
+        """
+        rows = response_query(db).filter(Deadline.user_id == current_user.id).all()
+        return [row._asdict() for row in rows]
+
+    @staticmethod
+    def get_changes(db: Session, current_user, since: int) -> dict:
+        """
+        Rows changed and ids deleted after cursor `since`, shaped like
+        DeadlineChanges. A cursor of 0, one older than the last tombstone
+        compaction, or one this server never issued gets the full list back
+        with `reset` set, and the client replaces what it has.
+        """
+        version, purged = (
+            db.query(User.deadlines_version, User.tombstones_purged_version)
+            .filter(User.id == current_user.id)
+            .one()
+        )
+        reset = since <= 0 or since < purged or since > version
+
+        query = response_query(db).filter(Deadline.user_id == current_user.id)
+        deleted_ids = []
+        if not reset:
+            query = query.filter(Deadline.change_version > since)
+            deleted_ids = [
+                deadline_id for (deadline_id,) in db.query(DeadlineTombstone.deadline_id).filter(
+                    DeadlineTombstone.user_id == current_user.id,
+                    DeadlineTombstone.change_version > since,
+                )
+            ]
+
+        # Rows committed after `version` was read can appear here too; the
+        # client gets them again next time, which is harmless for upserts
+        return {
+            "cursor": version,
+            "reset": reset,
+            "changed": [row._asdict() for row in query.all()],
+            "deleted_ids": deleted_ids,
+        }
 
     @staticmethod
     def update_deadline(db: Session, current_user, deadline_id, deadline_update):
+        user_id = current_user.id
         deadline = db.query(Deadline).filter(
             Deadline.id == deadline_id,
-            Deadline.user_id == current_user.id
+            Deadline.user_id == user_id
         ).first()
 
         if not deadline:
             raise HTTPException(status_code=404, detail="Deadline not found")
 
+        loads = LoadDeltas()
+        loads.remove(deadline.course_id, deadline.due_date, deadline.is_pinned)
         update_data = deadline_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(deadline, key, value)
+        loads.add(deadline.course_id, deadline.due_date, deadline.is_pinned)
+        ReminderService.schedule(deadline)
+        deadline.change_version = ChangeFeedService.next_version(db, user_id)
+        CourseLoadService.apply(db, loads)
 
         db.commit()
         db.refresh(deadline)
+        CalendarService.invalidate(user_id)
+        EventService.publish(user_id, DEADLINE_CHANGED, {"id": deadline.id, "action": "updated"})
 
         return deadline
 
     @staticmethod
     def delete_deadline(db: Session, current_user, deadline_id):
+        user_id = current_user.id
         deadline = db.query(Deadline).filter(
             Deadline.id == deadline_id,
-            Deadline.user_id == current_user.id
+            Deadline.user_id == user_id
         ).first()
 
         if not deadline:
             raise HTTPException(status_code=404, detail="Deadline not found")
 
+        version = ChangeFeedService.next_version(db, user_id)
+        ChangeFeedService.record_deletions(db, user_id, [deadline_id], version)
+        loads = LoadDeltas()
+        loads.remove(deadline.course_id, deadline.due_date, deadline.is_pinned)
+        CourseLoadService.apply(db, loads)
         db.delete(deadline)
         db.commit()
+        CalendarService.invalidate(user_id)
+        EventService.publish(user_id, DEADLINE_CHANGED, {"id": deadline_id, "action": "deleted"})
 
         return None
     @staticmethod
     def toggle_deadline_pin(db: Session, current_user, deadline_id: int, is_pinned: bool):
+        user_id = current_user.id
         deadline = db.query(Deadline).filter(
             Deadline.id == deadline_id,
-            Deadline.user_id == current_user.id
+            Deadline.user_id == user_id
         ).first()
 
         if not deadline:
             raise HTTPException(status_code=404, detail="Deadline not found")
 
+        loads = LoadDeltas()
+        loads.remove(deadline.course_id, deadline.due_date, deadline.is_pinned)
+        loads.add(deadline.course_id, deadline.due_date, is_pinned)
         deadline.is_pinned = is_pinned
+        ReminderService.schedule(deadline)
+        deadline.change_version = ChangeFeedService.next_version(db, user_id)
+        CourseLoadService.apply(db, loads)
         db.commit()
         db.refresh(deadline)
+        CalendarService.invalidate(user_id)
+        EventService.publish(user_id, PIN_CHANGED, {"id": deadline.id, "is_pinned": is_pinned})
 
         return deadline
+
+    @staticmethod
+    def apply_batch(db: Session, current_user, operations) -> dict:
+        """
+        Applies pin/unpin/delete operations as at most three set-based
+        statements in one transaction, all scoped to the caller's rows and
+        stamped with a single change-feed version.
+        Returns a dict shaped like DeadlineBatchResult.
+        """
+        user_id = current_user.id
+        ids_by_action = {"pin": [], "unpin": [], "delete": []}
+        seen = set()
+        for operation in operations:
+            if operation.id in seen:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Deadline {operation.id} appears more than once in the batch",
+                )
+            seen.add(operation.id)
+            ids_by_action[operation.action].append(operation.id)
+
+        # Course, due date and pin state ride along for the course load counters
+        owned = {
+            row.id: row for row in db.query(Deadline.id, Deadline.course_id, Deadline.due_date, Deadline.is_pinned).filter(
+                Deadline.user_id == user_id,
+                Deadline.id.in_(seen),
+            )
+        }
+        for action in ids_by_action:
+            ids_by_action[action] = [i for i in ids_by_action[action] if i in owned]
+
+        loads = LoadDeltas()
+        for action, is_pinned in (("pin", True), ("unpin", False), ("delete", None)):
+            for deadline_id in ids_by_action[action]:
+                row = owned[deadline_id]
+                loads.remove(row.course_id, row.due_date, row.is_pinned)
+                if is_pinned is not None:
+                    loads.add(row.course_id, row.due_date, is_pinned)
+
+        version = ChangeFeedService.next_version(db, user_id) if owned else None
+        CourseLoadService.apply(db, loads)
+        # Reminder times differ per row; they ride along in the same UPDATE as a CASE on id
+        reminders = {
+            deadline_id: ReminderService.next_reminder_at(owned[deadline_id].due_date, True)
+            for deadline_id in ids_by_action["pin"]
+        }
+        for action, is_pinned in (("pin", True), ("unpin", False)):
+            if ids_by_action[action]:
+                next_reminder = case(reminders, value=Deadline.id, else_=None) if is_pinned else None
+                db.query(Deadline).filter(
+                    Deadline.user_id == user_id,
+                    Deadline.id.in_(ids_by_action[action]),
+                ).update({
+                    Deadline.is_pinned: is_pinned,
+                    Deadline.next_reminder_at: next_reminder,
+                    Deadline.change_version: version,
+                }, synchronize_session=False)
+
+        if ids_by_action["delete"]:
+            ChangeFeedService.record_deletions(db, user_id, ids_by_action["delete"], version)
+            db.query(Deadline).filter(
+                Deadline.user_id == user_id,
+                Deadline.id.in_(ids_by_action["delete"]),
+            ).delete(synchronize_session=False)
+
+        updated_ids = ids_by_action["pin"] + ids_by_action["unpin"]
+        updated = []
+        if updated_ids:
+            updated = [
+                row._asdict()
+                for row in response_query(db).filter(Deadline.id.in_(updated_ids)).order_by(Deadline.id)
+            ]
+        db.commit()
+
+        if owned:
+            CalendarService.invalidate(user_id)
+        if updated_ids:
+            EventService.publish(user_id, PIN_CHANGED, {"ids": updated_ids})
+        if ids_by_action["delete"]:
+            EventService.publish(user_id, DEADLINE_CHANGED, {"ids": ids_by_action["delete"], "action": "deleted"})
+
+        return {
+            "updated": updated,
+            "deleted_ids": ids_by_action["delete"],
+            "missing_ids": sorted(seen - owned.keys()),
+        }
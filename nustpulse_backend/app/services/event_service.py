@@ -0,0 +1,125 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Optional, Set
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Redis layout:
+#   events:user:<user_id>    pub/sub channel, one JSON message per event
+CHANNEL = "events:user:{}"
+CHANNEL_PATTERN = "events:user:*"
+
+# Event types pushed to clients
+SYNC_COMPLETED = "sync_completed"
+DEADLINE_CHANGED = "deadline_changed"
+PIN_CHANGED = "pin_changed"
+
+# Events buffered per connection before newer ones are dropped
+QUEUE_SIZE = 100
+
+
+class EventService:
+    """
+    Per-user live events (sync finished, deadline or pin changed).
+
+    Any process (API or worker) publishes to the user's Redis channel; each
+    API process runs one EventBroker that fans messages out to the SSE
+    connections it holds. Events are hints to refetch, not data: a missed
+    event only means the client refreshes a little later.
+    """
+
+    @staticmethod
+    def publish(user_id: int, event_type: str, data: Optional[Dict[str, Any]] = None):
+        """Failures are logged and swallowed; events must never break a write."""
+        if not settings.EVENTS_ENABLED:
+            return
+        message = json.dumps({"type": event_type, "data": data or {}})
+        try:
+            get_redis().publish(CHANNEL.format(user_id), message)
+        except RedisError as e:
+            logger.warning(f"Could not publish {event_type} for user {user_id}: {e}")
+
+    @staticmethod
+    async def stream(user_id: int, is_disconnected: Callable[[], Awaitable[bool]]) -> AsyncIterator[str]:
+        """
+        SSE frames for one connection: a `ready` event, then every event for
+        the user, with a comment line as heartbeat so proxies keep it open.
+        """
+        queue = broker.subscribe(user_id)
+        try:
+            yield "retry: 5000\nevent: ready\ndata: {}\n\n"
+            while not await is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                event = json.loads(message)
+                yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            broker.unsubscribe(user_id, queue)
+
+
+class EventBroker:
+    """
+    One pattern subscription per process, shared by every open stream.
+    Started with the first subscriber and left running afterwards.
+    """
+
+    def __init__(self):
+        self._queues: Dict[int, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._queues.setdefault(user_id, set()).add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        queues = self._queues.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._queues[user_id]
+
+    def _dispatch(self, channel: str, payload: str):
+        user_id = int(channel.rsplit(":", 1)[1])
+        for queue in self._queues.get(user_id, ()):
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping event for user {user_id}: client is not keeping up")
+
+    async def _listen(self):
+        """Reconnects with backoff; the pub/sub socket has no read timeout because it idles."""
+        backoff = 1
+        while True:
+            client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(CHANNEL_PATTERN)
+                backoff = 1
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError) as e:
+                logger.warning(f"Event subscription lost, retrying in {backoff}s: {e}")
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+
+broker = EventBroker()
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_redis, get_async_redis
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY = "lms:bucket"
+BREAKER_OPEN_KEY = "lms:breaker:open"
+BREAKER_FAILURES_KEY = "lms:breaker:failures"
+LATENCY_KEY = "lms:latency"
+
+LATENCY_SAMPLES = 200
+MIN_LATENCY_SAMPLES = 20
+TIMEOUT_REFRESH_SECONDS = 30
+
+# Reserves one token from a global bucket and returns how long the caller
+# must wait before using it. Returns -1 if that wait would exceed the limit
+# and -2 if the circuit is open. Callers passing a floor (ARGV[4]) never
+# take the bucket below it; instead of queueing they get 'retry:<seconds>'
+# and ask again, which keeps the last tokens for callers without a floor.
+# Uses the Redis clock so API and worker hosts agree on refill timing.
+ACQUIRE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return '-2'
+end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local floor = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate) - 1
+if floor > 0 and tokens < floor then
+    return 'retry:' .. tostring((floor - tokens) / rate)
+end
+local wait = 0
+if tokens < 0 then
+    wait = -tokens / rate
+end
+if wait > max_wait then
+    return '-1'
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate + max_wait) + 1)
+return tostring(wait)
+"""
+
+
+class LMSUnavailableError(Exception):
+    """The LMS is unreachable, its circuit is open, or the rate limiter could not grant a slot in time."""
+
+
+class LMSGuard:
+    """
+    Coordinates every outbound LMS request across API and worker processes:
+    a Redis token bucket caps the global request rate, a circuit breaker
+    fails fast while the LMS is unhealthy, and request timeouts follow the
+    observed p95 latency instead of a fixed 30 s.
+
+    Redis problems never block LMS traffic; the guard fails open.
+    """
+
+    _timeout = settings.LMS_TIMEOUT_MAX_SECONDS
+    _timeout_refreshed_at = 0.0
+
+    @staticmethod
+    async def acquire(reserve: int = 0):
+        """
+        Waits for a rate-limit slot. Raises LMSUnavailableError instead of
+        queueing forever. Background syncs pass a `reserve`: they only take
+        a token while more than that many are left, so interactive syncs
+        always find headroom however deep the sweep backlog is.
+        """
+        if not settings.LMS_GUARD_ENABLED:
+            return
+
+        waited = 0.0
+        while True:
+            try:
+                result = await get_async_redis().eval(
+                    ACQUIRE_SCRIPT, 2, BUCKET_KEY, BREAKER_OPEN_KEY,
+                    settings.LMS_RATE_PER_SECOND, settings.LMS_RATE_BURST, settings.LMS_RATE_MAX_WAIT_SECONDS, reserve,
+                )
+            except RedisError as e:
+                logger.warning(f"LMS guard unavailable, allowing request: {e}")
+                return
+            if not result.startswith("retry:"):
+                break
+            retry_in = float(result.split(":", 1)[1])
+            if waited + retry_in > settings.LMS_RATE_MAX_WAIT_SECONDS:
+                raise LMSUnavailableError("LMS rate limit exceeded")
+            await asyncio.sleep(retry_in)
+            waited += retry_in
+
+        wait = float(result)
+
+        if wait == -2:
+            raise LMSUnavailableError("LMS circuit is open")
+        if wait < 0:
+            raise LMSUnavailableError("LMS rate limit exceeded")
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    async def record(elapsed: float, ok: bool):
+        """Feeds one request outcome into the latency window and the breaker."""
+        if not settings.LMS_GUARD_ENABLED:
+            return
+
+        try:
+            r = get_async_redis()
+            pipe = r.pipeline(transaction=False)
+            pipe.lpush(LATENCY_KEY, round(elapsed, 3))
+            pipe.ltrim(LATENCY_KEY, 0, LATENCY_SAMPLES - 1)
+            if ok:
+                pipe.delete(BREAKER_FAILURES_KEY)
+                await pipe.execute()
+                return
+
+            pipe.incr(BREAKER_FAILURES_KEY)
+            failures = (await pipe.execute())[-1]
+            if failures == 1:
+                await r.expire(BREAKER_FAILURES_KEY, settings.LMS_BREAKER_WINDOW_SECONDS)
+            if failures >= settings.LMS_BREAKER_THRESHOLD:
+                await r.set(BREAKER_OPEN_KEY, 1, ex=settings.LMS_BREAKER_COOLDOWN_SECONDS)
+                await r.delete(BREAKER_FAILURES_KEY)
+                logger.warning(
+                    f"LMS circuit opened after {failures} failures; "
+                    f"pausing LMS traffic for {settings.LMS_BREAKER_COOLDOWN_SECONDS}s"
+                )
+        except RedisError as e:
+            logger.warning(f"Could not record LMS request outcome: {e}")
+
+    @staticmethod
+    async def timeout() -> float:
+        """
+        p95 of recent LMS latencies times a safety multiplier, clamped to the
+        configured bounds. Recomputed at most every 30 s per process.
+        """
+        if not settings.LMS_GUARD_ENABLED:
+            return settings.LMS_TIMEOUT_MAX_SECONDS
+
+        now = time.monotonic()
+        if now - LMSGuard._timeout_refreshed_at < TIMEOUT_REFRESH_SECONDS:
+            return LMSGuard._timeout
+        LMSGuard._timeout_refreshed_at = now
+
+        try:
+            samples = sorted(float(s) for s in await get_async_redis().lrange(LATENCY_KEY, 0, -1))
+        except RedisError as e:
+            logger.warning(f"Could not read LMS latency window: {e}")
+            return LMSGuard._timeout
+
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            LMSGuard._timeout = settings.LMS_TIMEOUT_MAX_SECONDS
+        else:
+            p95 = samples[int(len(samples) * 0.95) - 1]
+            LMSGuard._timeout = min(
+                settings.LMS_TIMEOUT_MAX_SECONDS,
+                max(settings.LMS_TIMEOUT_MIN_SECONDS, p95 * settings.LMS_TIMEOUT_P95_MULTIPLIER),
+            )
+        return LMSGuard._timeout
+
+    @staticmethod
+    def is_open() -> bool:
+        """Synchronous breaker check for Celery sweeps deciding whether to start or continue."""
+        if not settings.LMS_GUARD_ENABLED:
+            return False
+        try:
+            return bool(get_redis().exists(BREAKER_OPEN_KEY))
+        except RedisError as e:
+            logger.warning(f"Could not read LMS circuit state: {e}")
+            return False
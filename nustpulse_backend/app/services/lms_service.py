@@ -1,26 +1,89 @@
+import asyncio
+import weakref
 import httpx
 from bs4 import BeautifulSoup
 import logging
 import time
 from typing import List, Dict, Any, Optional
+from app.core.config import settings
+from app.core import db_stats
+from app.services.lms_guard import LMSGuard, LMSUnavailableError
 
 logger = logging.getLogger(__name__)
 
 
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """
+    Connection pool shared by every LMSSession on one event loop. Sessions
+    keep their own cookies (one AsyncClient each) but reuse TCP/TLS
+    connections; closing a session's client must not close the pool.
+    """
+
+    def __init__(self):
+        self._transport = httpx.AsyncHTTPTransport(
+            verify=False,
+            limits=httpx.Limits(
+                max_connections=settings.LMS_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LMS_POOL_MAX_KEEPALIVE,
+            ),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+    async def close_pool(self):
+        await self._transport.aclose()
+
+
+# httpx pools are bound to the loop they were created on, so one per loop
+_shared_transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _SharedTransport]" = weakref.WeakKeyDictionary()
+
+
+def _shared_transport() -> Optional[_SharedTransport]:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    transport = _shared_transports.get(loop)
+    if transport is None:
+        transport = _SharedTransport()
+        _shared_transports[loop] = transport
+    return transport
+
+
+async def close_shared_transport():
+    """Closes the running loop's LMS connection pool (worker shutdown)."""
+    transport = _shared_transports.pop(asyncio.get_running_loop(), None)
+    if transport is not None:
+        await transport.close_pool()
+
+
 class LMSSession:
     """
     A per-request LMS session that creates a fresh httpx client.
     This avoids the stale-cookie problem caused by the singleton pattern,
     where the shared client is already 'logged in' and /login/index.php
     no longer returns a logintoken form field.
+
+    All traffic goes through `_request`, which applies the shared LMSGuard
+    (global rate limit, circuit breaker and adaptive timeout).
     """
 
     BASE_URL = "https://lms.nust.edu.pk/portal"
     LOGIN_URL = f"{BASE_URL}/login/index.php"
     AJAX_URL  = f"{BASE_URL}/lib/ajax/service.php"
 
-    def __init__(self):
+    # Overridable transport; benchmarks plug in a local Moodle stand-in here
+    transport: Optional[httpx.AsyncBaseTransport] = None
+
+    def __init__(self, background: bool = False):
+        # Background (sweep) sessions leave part of the LMS rate budget to interactive ones
+        self.rate_reserve = settings.LMS_BULK_RESERVE_TOKENS if background else 0
         self.client = httpx.AsyncClient(
+            transport=self.transport or _shared_transport(),
             follow_redirects=True,
             verify=False,
             timeout=30.0,
@@ -32,12 +95,33 @@ class LMSSession:
                 )
             },
         )
+        # Per-session cost, reported on the sync run ledger
+        self.request_count = 0
+        self.bytes_received = 0
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        await LMSGuard.acquire(self.rate_reserve)
+        timeout = await LMSGuard.timeout()
+
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, timeout=timeout, **kwargs)
+        except httpx.TransportError as e:
+            await LMSGuard.record(time.perf_counter() - started, ok=False)
+            raise LMSUnavailableError(f"LMS request failed: {e!r}") from e
+
+        elapsed = time.perf_counter() - started
+        await LMSGuard.record(elapsed, ok=response.status_code < 500)
+        db_stats.record_lms_request(elapsed)
+        self.request_count += 1
+        self.bytes_received += len(response.content)
+        return response
 
     async def login(self, username: str, password: str) -> bool:
         """Logs into NUST LMS and returns True if successful."""
         try:
             # 1. Fetch fresh login page to obtain the CSRF logintoken
-            response = await self.client.get(self.LOGIN_URL)
+            response = await self._request("GET", self.LOGIN_URL)
             logger.info(f"Initial LMS GET Status: {response.status_code}")
 
             soup = BeautifulSoup(response.text, "html.parser")
@@ -58,7 +142,7 @@ class LMSSession:
                 "password": password,
                 "logintoken": login_token,
             }
-            login_response = await self.client.post(self.LOGIN_URL, data=payload)
+            login_response = await self._request("POST", self.LOGIN_URL, data=payload)
 
             # Detect explicit rejection
             final_url = str(login_response.url)
@@ -83,6 +167,8 @@ class LMSSession:
             )
             return False
 
+        except LMSUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Critical error during LMS login: {str(e)}")
             return False
@@ -90,10 +176,12 @@ class LMSSession:
     async def get_sesskey(self) -> Optional[str]:
         """Extracts the sesskey needed for AJAX calls from the dashboard."""
         try:
-            response = await self.client.get(f"{self.BASE_URL}/my/")
+            response = await self._request("GET", f"{self.BASE_URL}/my/")
             if '"sesskey":"' in response.text:
                 return response.text.split('"sesskey":"')[1].split('"')[0]
             return None
+        except LMSUnavailableError:
+            raise
         except Exception:
             return None
 
@@ -113,7 +201,7 @@ class LMSSession:
             if sesskey:
                 params  = {"sesskey": sesskey, "info": "core_webservice_get_site_info"}
                 payload = [{"index": 0, "methodname": "core_webservice_get_site_info", "args": {}}]
-                resp = await self.client.post(self.AJAX_URL, params=params, json=payload)
+                resp = await self._request("POST", self.AJAX_URL, params=params, json=payload)
                 data = resp.json()
                 fullname = data[0].get("data", {}).get("fullname", "")
                 if fullname:
@@ -124,7 +212,7 @@ class LMSSession:
 
         # ── Strategy 2: HTML scraping ─────────────────────────────────────────
         try:
-            response = await self.client.get(f"{self.BASE_URL}/my/")
+            response = await self._request("GET", f"{self.BASE_URL}/my/")
             soup = BeautifulSoup(response.text, "html.parser")
 
             # Try selectors in order of likelihood for NUST / generic Moodle themes
@@ -168,13 +256,15 @@ class LMSSession:
         ]
 
         try:
-            response = await self.client.post(
-                self.AJAX_URL, params=params, json=payload
+            response = await self._request(
+                "POST", self.AJAX_URL, params=params, json=payload
             )
             data = response.json()
             events = data[0]["data"]["events"]
             logger.info(f"Fetched {len(events)} raw events from LMS calendar")
             return events
+        except LMSUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching calendar events: {str(e)}")
             return []
@@ -0,0 +1,156 @@
+import asyncio
+import base64
+import logging
+import time
+from abc import ABC, abstractmethod
+from email.mime.text import MIMEText
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import MAIL_SEND_DURATION, MAIL_SEND_ERRORS, MAIL_SEND_RETRIES
+
+logger = logging.getLogger(__name__)
+
+
+class MailError(Exception):
+    """A send failed and should not be retried."""
+
+
+class MailQuotaError(MailError):
+    """The sending quota is exhausted; retrying before it resets is pointless."""
+
+
+class MailRateLimitError(MailError):
+    """The provider asked us to slow down (HTTP 429 or a per-user rate limit)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class MailTransport(ABC):
+    """Sends one HTML email. Implementations raise MailError subclasses on failure."""
+
+    @abstractmethod
+    async def send(self, to: str, subject: str, html_body: str):
+        ...
+
+
+class GmailTransport(MailTransport):
+    """
+    Sends via the Gmail API (Port 443).
+    This is much more reliable than SMTP on cloud providers like Railway.
+    The API client is built once and reused; credentials refresh when expired.
+    The Google client libraries are heavy, so they are imported on first send
+    rather than by every process that imports this module.
+    """
+
+    def __init__(self):
+        self._creds = None
+        self._service = None
+
+    def _get_service(self):
+        """Authenticates with the refresh token and returns a Gmail API service instance."""
+        from google.auth.transport.requests import Request
+
+        if self._service is None:
+            from google.oauth2.credentials import Credentials
+            from googleapiclient.discovery import build
+
+            self._creds = Credentials(
+                None,
+                refresh_token=settings.GMAIL_REFRESH_TOKEN,
+                token_uri="https://oauth2.googleapis.com/token",
+                client_id=settings.GOOGLE_CLIENT_ID,
+                client_secret=settings.GOOGLE_CLIENT_SECRET,
+            )
+            self._service = build('gmail', 'v1', credentials=self._creds, cache_discovery=False)
+
+        # Refresh the access token if it's expired
+        if not self._creds.valid:
+            self._creds.refresh(Request())
+
+        return self._service
+
+    async def send(self, to: str, subject: str, html_body: str):
+        from googleapiclient.errors import HttpError
+
+        message = MIMEText(html_body, 'html')
+        message['to'] = to
+        message['from'] = settings.MAIL_FROM
+        message['subject'] = subject
+
+        # Encode the message for the Gmail API
+        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+
+        try:
+            self._get_service().users().messages().send(
+                userId='me',
+                body={'raw': raw_message}
+            ).execute()
+        except HttpError as e:
+            raise GmailTransport._translate(e) from e
+
+    @staticmethod
+    def _translate(error) -> MailError:
+        """Maps a googleapiclient HttpError onto our error types."""
+        status = error.resp.status
+        reason = ""
+        try:
+            reason = error.error_details[0].get("reason", "")
+        except (IndexError, AttributeError, TypeError):
+            pass
+
+        if status == 429 or reason in ("rateLimitExceeded", "userRateLimitExceeded"):
+            retry_after = error.resp.get("retry-after")
+            return MailRateLimitError(str(error), float(retry_after) if retry_after else None)
+        if reason in ("dailyLimitExceeded", "quotaExceeded"):
+            return MailQuotaError(str(error))
+        return MailError(str(error))
+
+
+_transport: Optional[MailTransport] = None
+
+TRANSPORTS = {
+    "gmail": GmailTransport,
+}
+
+
+def get_mail_transport() -> MailTransport:
+    global _transport
+    if _transport is None:
+        _transport = TRANSPORTS[settings.MAIL_TRANSPORT]()
+    return _transport
+
+
+def set_mail_transport(transport: Optional[MailTransport]):
+    """Swaps the process-wide transport (benchmarks install a local stand-in)."""
+    global _transport
+    _transport = transport
+
+
+async def send_mail(to: str, subject: str, html_body: str):
+    """
+    Sends through the configured transport, backing off and retrying when
+    the provider rate-limits us. Quota and other errors are raised at once.
+    """
+    transport = get_mail_transport()
+    for attempt in range(settings.MAIL_MAX_RETRIES + 1):
+        started = time.perf_counter()
+        try:
+            await transport.send(to, subject, html_body)
+            MAIL_SEND_DURATION.observe(time.perf_counter() - started)
+            logger.info(f"Email successfully sent to {to}")
+            return
+        except MailRateLimitError as e:
+            if attempt == settings.MAIL_MAX_RETRIES:
+                MAIL_SEND_ERRORS.inc()
+                logger.error(f"Giving up on email to {to} after {attempt + 1} rate-limited attempts")
+                raise
+            delay = e.retry_after or settings.MAIL_RETRY_BASE_SECONDS * 2 ** attempt
+            MAIL_SEND_RETRIES.inc()
+            logger.warning(f"Rate limited sending to {to}; retrying in {delay:.2f}s")
+            await asyncio.sleep(min(delay, settings.MAIL_RETRY_MAX_SECONDS))
+        except Exception as e:
+            MAIL_SEND_ERRORS.inc()
+            logger.error(f"Mail error sending to {to}: {e}")
+            raise
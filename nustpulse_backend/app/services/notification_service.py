@@ -1,68 +1,17 @@
 import logging
-import base64
-import pytz
-from email.mime.text import MIMEText
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
-from app.core.config import settings
+from app.services.mail_transport import send_mail
 from app.models.deadline import Deadline
 from app.models.user import User
+from app.core.timeutils import PKT
 
 logger = logging.getLogger(__name__)
-PKT = pytz.timezone("Asia/Karachi")
-
-def _get_gmail_service():
-    """
-    Authenticates and returns a Gmail API service instance using the Refresh Token.
-    """
-    creds = Credentials(
-        None,
-        refresh_token=settings.GMAIL_REFRESH_TOKEN,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=settings.GOOGLE_CLIENT_ID,
-        client_secret=settings.GOOGLE_CLIENT_SECRET,
-    )
-    
-    # Refresh the access token if it's expired
-    if not creds.valid:
-        creds.refresh(Request())
-        
-    return build('gmail', 'v1', credentials=creds)
-
-async def _send_gmail_api(to: str, subject: str, html_body: str):
-    """
-    Sends an email via the Gmail API (Port 443).
-    This is much more reliable than SMTP on cloud providers like Railway.
-    """
-    try:
-        service = _get_gmail_service()
-        
-        # Create the email message
-        message = MIMEText(html_body, 'html')
-        message['to'] = to
-        message['from'] = settings.MAIL_FROM
-        message['subject'] = subject
-        
-        # Encode the message for the Gmail API
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        
-        # Send the message
-        service.users().messages().send(
-            userId='me',
-            body={'raw': raw_message}
-        ).execute()
-        
-        logger.info(f"Gmail API: Email successfully sent to {to}")
-    except Exception as e:
-        logger.error(f"Gmail API error sending to {to}: {e}")
-        raise e
 
 class NotificationService:
     @staticmethod
-    async def send_new_deadline_notification(user: User, deadline: Deadline):
+    async def send_new_deadline_notification(user: User, deadline: Deadline) -> bool:
+        """Returns whether the alert went out; a user who turned alerts off counts as done."""
         if not user.notification_email or not user.notifications_enabled:
-            return
+            return True
 
         local_due_date = deadline.due_date.astimezone(PKT)
         html = f"""
@@ -72,7 +21,7 @@ class NotificationService:
             <p>A new deadline has been synced for your account:</p>
             <div style="background: #f9f9f9; padding: 15px; border-radius: 5px; border-left: 4px solid #8B0000;">
                 <h3 style="margin-top: 0;">{deadline.title}</h3>
-                <p style="margin: 5px 0; color: #666;">Course: {deadline.course_name or "General"}</p>
+                <p style="margin: 5px 0; color: #666;">Course: {deadline.display_course_name or "General"}</p>
                 <p style="margin: 5px 0; font-weight: bold;">Due Date: {local_due_date.strftime("%B %d, %Y at %I:%M %p")}</p>
             </div>
             <p>Head over to <a href="https://nustpulse.com/universal-pulse" style="color: #8B0000; text-decoration: none; font-weight: bold;">Universal Pulse</a> to pin this to your list.</p>
@@ -82,13 +31,15 @@ class NotificationService:
         """
 
         try:
-            await _send_gmail_api(
+            await send_mail(
                 user.notification_email,
                 f"Pulse Alert: {deadline.title}",
                 html
             )
+            return True
         except Exception as e:
             logger.error(f"Failed to send new deadline notification to {user.notification_email}: {e}")
+            return False
 
     @staticmethod
     async def send_proximity_reminder(user: User, deadline: Deadline, days_left: int):
@@ -106,7 +57,7 @@ class NotificationService:
             <p>This is a reminder for your upcoming deadline:</p>
             <div style="background: #f9f9f9; padding: 15px; border-radius: 5px; border-left: 4px solid #8B0000;">
                 <h3 style="margin-top: 0;">{deadline.title}</h3>
-                <p style="margin: 5px 0; color: #666;">Course: {deadline.course_name or "General"}</p>
+                <p style="margin: 5px 0; color: #666;">Course: {deadline.display_course_name or "General"}</p>
                 <p style="margin: 5px 0; font-weight: bold; color: #8B0000;">DUE: {local_due_date.strftime("%B %d, %Y at %I:%M %p")}</p>
             </div>
             <p>Stay ahead of the curve.</p>
@@ -116,7 +67,7 @@ class NotificationService:
         """
 
         try:
-            await _send_gmail_api(
+            await send_mail(
                 user.notification_email,
                 f"{subject_text} for {deadline.title}",
                 html
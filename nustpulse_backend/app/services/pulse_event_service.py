@@ -0,0 +1,71 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timeutils import utcnow
+from app.database.database import upsert_insert
+from app.models.pulse_event import PulseEvent
+
+logger = logging.getLogger(__name__)
+
+
+class PulseEventService:
+    """
+    Keeps `pulse_events` in step with the Redis pulse feed: one row per
+    Moodle event, so pulse search scans assignments rather than every
+    student's copy of them (see SearchService.search_pulse).
+    """
+
+    @staticmethod
+    def record(db: Session, events: List[Dict[str, Any]]):
+        """
+        Upserts the synced assignments still inside the retention window, in
+        the caller's transaction. `events` are shaped like PulseService.publish
+        takes them. Rows whose title, due date and course already match are
+        left alone, so a sync that saw nothing new rewrites nothing.
+        """
+        cutoff = utcnow() - timedelta(hours=settings.PULSE_RETENTION_HOURS)
+        now = utcnow()
+        rows = {}
+        for event in events:
+            due_date = datetime.fromtimestamp(event["due_ts"], tz=timezone.utc)
+            if due_date < cutoff:
+                continue
+            rows[event["lms_event_id"]] = {
+                "lms_event_id": event["lms_event_id"],
+                "title": event["title"],
+                "due_date": due_date,
+                "course_id": (event.get("course") or {}).get("id"),
+                "updated_at": now,
+            }
+        if not rows:
+            return
+
+        # Concurrent syncs of one course share most rows; lock them in one order
+        stmt = upsert_insert(db, PulseEvent).values([rows[key] for key in sorted(rows)])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PulseEvent.lms_event_id],
+            set_={
+                "title": stmt.excluded.title,
+                "due_date": stmt.excluded.due_date,
+                "course_id": stmt.excluded.course_id,
+                "updated_at": stmt.excluded.updated_at,
+            },
+            where=or_(
+                PulseEvent.title != stmt.excluded.title,
+                PulseEvent.due_date != stmt.excluded.due_date,
+                PulseEvent.course_id.is_distinct_from(stmt.excluded.course_id),
+            ),
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def prune(db: Session) -> int:
+        """Deletes assignments that fell out of the retention window. Returns how many."""
+        cutoff = utcnow() - timedelta(hours=settings.PULSE_RETENTION_HOURS)
+        removed = db.query(PulseEvent).filter(PulseEvent.due_date < cutoff).delete(synchronize_session=False)
+        db.commit()
+        return removed
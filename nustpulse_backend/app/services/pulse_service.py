@@ -0,0 +1,197 @@
+import json
+import logging
+import time
+from typing import List, Dict, Any, Optional
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Redis layout:
+#   pulse:items              hash  lms_event_id -> item JSON
+#   pulse:feed               zset  lms_event_id scored by due timestamp
+#   pulse:course:<course_id> zset  same, per course
+#   pulse:courses            hash  course_id -> course JSON
+ITEMS_KEY = "pulse:items"
+FEED_KEY = "pulse:feed"
+COURSES_KEY = "pulse:courses"
+COURSE_KEY = "pulse:course:{}"
+
+# Extra members fetched per round trip so ties on the cursor's timestamp can be skipped
+TIE_WINDOW = 50
+
+# Trims one course's zset to the retention window and, if nothing is left,
+# drops the course from pulse:courses in the same step, so a publish can't
+# land between the check and the delete
+PRUNE_COURSE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[1]) == 0 then
+    return redis.call('HDEL', KEYS[2], ARGV[2])
+end
+return 0
+"""
+
+
+class PulseService:
+    """
+    Precomputed Universal Pulse feed.
+
+    Every sync pushes the assignments it saw into Redis sorted sets keyed by
+    due date, deduplicated by Moodle event id, so reading a page costs the
+    same no matter how many students are browsing or syncing.
+    """
+
+    @staticmethod
+    def publish(events: List[Dict[str, Any]]):
+        """
+        Adds synced assignments to the feed. `events` are dicts with
+        lms_event_id, title, due_ts, event_type and an optional course dict.
+        Failures are logged and swallowed; the feed must never break a sync.
+        """
+        if not settings.PULSE_FEED_ENABLED or not events:
+            return
+
+        cutoff = time.time() - settings.PULSE_RETENTION_HOURS * 3600
+        try:
+            r = get_redis()
+            pipe = r.pipeline(transaction=False)
+            course_keys = set()
+
+            for event in events:
+                if event["due_ts"] < cutoff:
+                    continue
+
+                course = event.get("course") or {}
+                course_id = course.get("id")
+                item = {
+                    "lms_event_id": event["lms_event_id"],
+                    "title": event["title"],
+                    "due_date": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(event["due_ts"])),
+                    "event_type": event.get("event_type"),
+                    "course_id": course_id,
+                    "course_name": course.get("fullname"),
+                    "course_shortname": course.get("shortname"),
+                }
+                member = str(event["lms_event_id"])
+
+                pipe.hset(ITEMS_KEY, member, json.dumps(item))
+                pipe.zadd(FEED_KEY, {member: event["due_ts"]})
+                if course_id:
+                    course_key = COURSE_KEY.format(course_id)
+                    course_keys.add(course_key)
+                    pipe.zadd(course_key, {member: event["due_ts"]})
+                    pipe.hset(COURSES_KEY, str(course_id), json.dumps({
+                        "id": course_id,
+                        "fullname": course.get("fullname") or "Unknown Course",
+                        "shortname": course.get("shortname"),
+                    }))
+
+            for course_key in course_keys:
+                pipe.zremrangebyscore(course_key, "-inf", cutoff)
+            pipe.execute()
+
+            PulseService._expire(r, cutoff)
+        except RedisError as e:
+            logger.warning(f"Could not publish to pulse feed: {e}")
+
+    @staticmethod
+    def _expire(r, cutoff: float):
+        """Drops assignments that fell out of the retention window."""
+        stale = r.zrangebyscore(FEED_KEY, "-inf", cutoff)
+        if stale:
+            pipe = r.pipeline(transaction=False)
+            pipe.hdel(ITEMS_KEY, *stale)
+            pipe.zrem(FEED_KEY, *stale)
+            pipe.execute()
+
+    @staticmethod
+    def prune() -> int:
+        """
+        Trims every course to the retention window and forgets courses with
+        nothing left, so /pulse/courses only lists active ones. Publishing
+        only trims the courses a sync touched. Returns how many courses were
+        dropped.
+        """
+        cutoff = time.time() - settings.PULSE_RETENTION_HOURS * 3600
+        try:
+            r = get_redis()
+            PulseService._expire(r, cutoff)
+            course_ids = r.hkeys(COURSES_KEY)
+            if not course_ids:
+                return 0
+            pipe = r.pipeline(transaction=False)
+            for course_id in course_ids:
+                pipe.eval(PRUNE_COURSE_SCRIPT, 2, COURSE_KEY.format(course_id), COURSES_KEY, cutoff, course_id)
+            return sum(pipe.execute())
+        except RedisError as e:
+            logger.warning(f"Could not prune pulse feed: {e}")
+            return 0
+
+    @staticmethod
+    def get_feed(course_id: Optional[int], cursor: Optional[str], limit: int) -> Dict[str, Any]:
+        """
+        Returns one page of the feed in due-date order. The cursor is
+        "<due_ts>:<lms_event_id>" of the last item on the previous page.
+        """
+        key = COURSE_KEY.format(course_id) if course_id else FEED_KEY
+
+        after_score, after_member = None, None
+        if cursor:
+            try:
+                score, member = cursor.split(":", 1)
+                after_score, after_member = float(score), member
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+        min_score = after_score if after_score is not None else time.time() - settings.PULSE_RETENTION_HOURS * 3600
+
+        try:
+            r = get_redis()
+            # Redis orders equal scores by member, so skip up to and including the
+            # cursor. A whole course can share one due time, so keep reading past
+            # the tie group until the page is full or the feed runs out.
+            entries, offset, batch_size = [], 0, limit + 1 + TIE_WINDOW
+            while len(entries) <= limit:
+                batch = r.zrangebyscore(key, min_score, "+inf", start=offset, num=batch_size, withscores=True)
+                entries += [
+                    (member, score) for member, score in batch
+                    if after_member is None or score > after_score or member > after_member
+                ]
+                if len(batch) < batch_size:
+                    break
+                offset += len(batch)
+            entries = entries[:limit + 1]
+
+            page = entries[:limit]
+            raw_items = r.hmget(ITEMS_KEY, [member for member, _ in page]) if page else []
+        except RedisError as e:
+            logger.error(f"Could not read pulse feed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Pulse feed is temporarily unavailable",
+            )
+
+        next_cursor = None
+        if len(entries) > limit:
+            member, score = page[-1]
+            next_cursor = f"{int(score)}:{member}"
+
+        return {
+            "items": [json.loads(raw) for raw in raw_items if raw],
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def get_courses() -> List[Dict[str, Any]]:
+        try:
+            courses = get_redis().hgetall(COURSES_KEY)
+        except RedisError as e:
+            logger.error(f"Could not read pulse courses: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Pulse feed is temporarily unavailable",
+            )
+        return sorted((json.loads(raw) for raw in courses.values()), key=lambda c: c["fullname"])
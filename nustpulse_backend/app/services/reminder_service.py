@@ -0,0 +1,147 @@
+import logging
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from redis.exceptions import RedisError
+from sqlalchemy import case
+from sqlalchemy.orm import Session, contains_eager
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.core.timeutils import utcnow, as_utc, local_date
+from app.models.deadline import Deadline
+from app.services.sync_queue_service import RELEASE_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+# Held by the dispatch tick while it claims, so ticks never overlap
+DISPATCH_LOCK_KEY = "reminders:dispatch:lock"
+
+
+class ReminderService:
+    """
+    Proximity reminders for pinned deadlines.
+
+    Each pinned deadline carries `next_reminder_at`, the next of its
+    REMINDER_OFFSETS_HOURS before the due time that is still ahead. Writes
+    that pin, unpin or move a deadline recompute it, and a frequent tick
+    claims whatever has come due, so reminders go out at their own time
+    instead of in one daily burst.
+    """
+
+    @staticmethod
+    def next_reminder_at(due_date: datetime, is_pinned: bool, after: Optional[datetime] = None) -> Optional[datetime]:
+        """The first reminder time later than `after` (default: now), or None if there is none."""
+        if not is_pinned:
+            return None
+        after = after or utcnow()
+        due_date = as_utc(due_date)
+        upcoming = [
+            due_date - timedelta(hours=hours)
+            for hours in settings.REMINDER_OFFSETS_HOURS
+            if due_date - timedelta(hours=hours) > after
+        ]
+        return min(upcoming, default=None)
+
+    @staticmethod
+    def schedule(deadline: Deadline, now: Optional[datetime] = None):
+        """Recomputes a deadline's next reminder from its due date and pin. Caller commits."""
+        deadline.next_reminder_at = ReminderService.next_reminder_at(deadline.due_date, deadline.is_pinned, now)
+
+    @staticmethod
+    def days_left(due_date: datetime, now: datetime) -> int:
+        """Calendar days until the due date, counted in PKT."""
+        return (local_date(due_date) - local_date(now)).days
+
+    @staticmethod
+    @contextmanager
+    def dispatch_lock():
+        """
+        Yields whether this tick may run: False while another tick holds the
+        lock. Fails open if Redis is unreachable; claim_due's row locks still
+        keep overlapping ticks from claiming the same reminder.
+        """
+        token = uuid.uuid4().hex
+        try:
+            acquired = get_redis().set(DISPATCH_LOCK_KEY, token, nx=True, ex=settings.REMINDER_LOCK_SECONDS)
+        except RedisError as e:
+            logger.warning(f"Could not take the reminder dispatch lock, running anyway: {e}")
+            yield True
+            return
+
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                try:
+                    get_redis().eval(RELEASE_SCRIPT, 1, DISPATCH_LOCK_KEY, token)
+                except RedisError as e:
+                    logger.warning(f"Could not release the reminder dispatch lock: {e}")
+
+    @staticmethod
+    def reminder_payload(deadlines: List[Deadline], now: datetime) -> List[dict]:
+        """
+        JSON-safe reminders for claimed deadlines, with everything the email
+        needs, so the sending task never reads the database.
+        """
+        return [
+            {
+                "name": deadline.user.name,
+                "email": deadline.user.notification_email,
+                "title": deadline.title,
+                "course_name": deadline.display_course_name,
+                "due_date": as_utc(deadline.due_date).isoformat(),
+                "days_left": ReminderService.days_left(deadline.due_date, now),
+            }
+            for deadline in deadlines
+        ]
+
+    @staticmethod
+    def claim_due(db: Session, now: Optional[datetime] = None, limit: Optional[int] = None) -> Tuple[int, List[Deadline]]:
+        """
+        Locks up to `limit` deadlines whose reminder is due and moves each to
+        its next reminder before anything is sent, so overlapping ticks never
+        send the same reminder twice. A reminder missed while workers were
+        down goes out once, late, rather than once per missed slot.
+
+        Returns how many rows were claimed, and those of them (with their
+        users) that should be emailed, detached so they stay readable after
+        the commit.
+        """
+        now = now or utcnow()
+        limit = limit or settings.REMINDER_BATCH_SIZE
+
+        rows = (
+            db.query(Deadline)
+            .join(Deadline.user)
+            .options(contains_eager(Deadline.user))
+            .filter(Deadline.next_reminder_at.isnot(None), Deadline.next_reminder_at <= now)
+            .order_by(Deadline.next_reminder_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=Deadline)
+            .all()
+        )
+
+        if not rows:
+            db.commit()
+            return 0, []
+
+        next_reminders = {}
+        due = []
+        for deadline in rows:
+            next_reminders[deadline.id] = ReminderService.next_reminder_at(deadline.due_date, deadline.is_pinned, now)
+            if as_utc(deadline.due_date) > now and deadline.user.notification_email and deadline.user.notifications_enabled:
+                due.append(deadline)
+
+        # One UPDATE for the whole batch, new times picked per row by a CASE on id
+        db.expunge_all()
+        db.query(Deadline).filter(Deadline.id.in_(next_reminders)).update({
+            Deadline.next_reminder_at: case(next_reminders, value=Deadline.id, else_=None),
+            Deadline.last_reminder_sent_at: case(
+                {deadline.id: now for deadline in due}, value=Deadline.id, else_=Deadline.last_reminder_sent_at,
+            ) if due else Deadline.last_reminder_sent_at,
+        }, synchronize_session=False)
+        db.commit()
+
+        return len(rows), due
@@ -0,0 +1,160 @@
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timeutils import utcnow, as_utc
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleService:
+    """
+    Decides when each user should next be synced.
+
+    Instead of sweeping everyone on a fixed crontab, every user carries a
+    `next_sync_at`.  A frequent beat tick claims whoever is due, and each sync
+    pushes that user's next run out by an interval derived from how active
+    they are and how close their next deadline is.
+    """
+
+    @staticmethod
+    def next_sync_interval(user: User, nearest_due: Optional[datetime], now: datetime) -> timedelta:
+        minutes = float(settings.SYNC_DEFAULT_INTERVAL_MINUTES)
+
+        # Recent logins mean someone is actually looking at the dashboard
+        last_login = as_utc(user.last_login_at) if user.last_login_at else None
+        if last_login and now - last_login <= timedelta(days=2):
+            minutes *= 0.5
+        elif not last_login or now - last_login >= timedelta(days=14):
+            minutes *= 3
+
+        # Accounts whose LMS data keeps changing get refreshed sooner
+        last_changed = as_utc(user.last_changed_at) if user.last_changed_at else None
+        if last_changed and now - last_changed <= timedelta(days=1):
+            minutes *= 0.75
+        elif not last_changed or now - last_changed >= timedelta(days=7):
+            minutes *= 1.5
+
+        # An imminent deadline caps the interval regardless of the above
+        if nearest_due is None:
+            minutes *= 2
+        else:
+            until_due = nearest_due - now
+            if until_due <= timedelta(days=1):
+                minutes = min(minutes, settings.SYNC_MIN_INTERVAL_MINUTES)
+            elif until_due <= timedelta(days=3):
+                minutes = min(minutes, settings.SYNC_MIN_INTERVAL_MINUTES * 2)
+
+        minutes = max(settings.SYNC_MIN_INTERVAL_MINUTES, min(settings.SYNC_MAX_INTERVAL_MINUTES, minutes))
+
+        # Jitter spreads users out so they never line up on the same tick again
+        jitter = minutes * settings.SYNC_JITTER_FRACTION
+        minutes += random.uniform(-jitter, jitter)
+
+        return timedelta(minutes=minutes)
+
+    @staticmethod
+    def reschedule(user: User, nearest_due: Optional[datetime], changed: bool, now: Optional[datetime] = None):
+        """Records a successful sync and schedules the next one. Caller commits."""
+        now = now or utcnow()
+        user.last_synced_at = now
+        if changed:
+            user.last_changed_at = now
+        user.sync_failure_count = 0
+        user.sync_failure_reason = None
+        user.next_sync_at = now + ScheduleService.next_sync_interval(user, nearest_due, now)
+
+    @staticmethod
+    def defer(
+        user: User, reason: str, backoff: bool = False, keep_record: bool = False, now: Optional[datetime] = None,
+    ):
+        """
+        Records a failed sync and schedules the retry. Caller commits.
+
+        `sync_failure_count` counts consecutive failures with the same reason.
+        Most failures retry after the default interval. Failures that retrying
+        cannot fix (`backoff`: the LMS rejects the stored password) double the
+        wait each time, and after SYNC_CREDENTIAL_FAILURES_BEFORE_PARK in a
+        row the user is parked: next_sync_at is cleared, so neither the
+        scheduler nor the sweep tries again until the user logs in.
+
+        A parked user stays parked whatever else fails (say a manual sync
+        that hits an LMS outage); only `clear_failures` unparks. With
+        `keep_record` the failure says nothing about the recorded one (an
+        outage while the stored password is known bad), so the reason and
+        count are left as they are and only the retry is scheduled.
+        """
+        now = now or utcnow()
+        if user.next_sync_at is None and user.sync_failure_count:
+            logger.info(f"{user.lms_username} is parked; not rescheduling after {reason}")
+            return
+
+        if not keep_record:
+            if user.sync_failure_reason == reason:
+                user.sync_failure_count = (user.sync_failure_count or 0) + 1
+            else:
+                user.sync_failure_count = 1
+                user.sync_failure_reason = reason
+
+        minutes = settings.SYNC_DEFAULT_INTERVAL_MINUTES
+        if backoff:
+            if user.sync_failure_count >= settings.SYNC_CREDENTIAL_FAILURES_BEFORE_PARK:
+                user.next_sync_at = None
+                logger.info(f"Parked syncs for {user.lms_username} after {user.sync_failure_count} x {reason}")
+                return
+            minutes = min(settings.SYNC_MAX_INTERVAL_MINUTES, minutes * 2 ** (user.sync_failure_count - 1))
+
+        jitter = minutes * settings.SYNC_JITTER_FRACTION
+        user.next_sync_at = now + timedelta(minutes=minutes + random.uniform(-jitter, jitter))
+
+    @staticmethod
+    def clear_failures(user: User, now: Optional[datetime] = None):
+        """A successful login proves the credentials work again: forgets failures and unparks. Caller commits."""
+        user.sync_failure_count = 0
+        user.sync_failure_reason = None
+        if user.next_sync_at is None:
+            # Safety net in case the login sync never completes
+            user.next_sync_at = (now or utcnow()) + timedelta(minutes=settings.SYNC_CLAIM_LEASE_MINUTES)
+
+    @staticmethod
+    def claim_due_users(db: Session, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[int]:
+        """
+        Returns the ids of users whose sync is due and leases them, so an
+        overlapping tick (or a second beat) does not pick the same users up.
+        The lease is overwritten by `reschedule`/`defer` once the sync ends.
+        """
+        now = now or utcnow()
+        limit = limit or settings.SYNC_BATCH_SIZE
+
+        rows = (
+            db.query(User.id)
+            .filter(User.next_sync_at.isnot(None), User.next_sync_at <= now)
+            .order_by(User.next_sync_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        user_ids = [row.id for row in rows]
+
+        if user_ids:
+            lease_until = now + timedelta(minutes=settings.SYNC_CLAIM_LEASE_MINUTES)
+            db.query(User).filter(User.id.in_(user_ids)).update(
+                {User.next_sync_at: lease_until}, synchronize_session=False
+            )
+        db.commit()
+
+        return user_ids
+
+    @staticmethod
+    def release(db: Session, user_ids: List[int], now: Optional[datetime] = None):
+        """Hands claimed-but-unsynced users back to the next tick."""
+        if not user_ids:
+            return
+        db.query(User).filter(User.id.in_(user_ids)).update(
+            {User.next_sync_at: now or utcnow()}, synchronize_session=False
+        )
+        db.commit()
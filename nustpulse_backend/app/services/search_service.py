@@ -0,0 +1,146 @@
+from datetime import timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import and_, func, literal, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timeutils import utcnow
+from app.models.course import Course
+from app.models.deadline import Deadline
+from app.models.pulse_event import PulseEvent
+from app.services.deadline_service import response_query
+
+# Text search configuration of the generated search_vector columns. Queries
+# must use the same one, or stemmed words stop matching.
+SEARCH_CONFIG = "english"
+
+# Generated tsvector columns added by migrations 9b1f4c7d2e85 and
+# 2c8e5a1f7b93. They are kept out of the models so SQLite (local runs,
+# benchmarks) can still create_all.
+DEADLINE_VECTOR = literal_column("deadlines.search_vector")
+PULSE_EVENT_VECTOR = literal_column("pulse_events.search_vector")
+COURSE_VECTOR = literal_column("courses.search_vector")
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _match_and_rank(db: Session, term: str, model=Deadline):
+    """
+    (WHERE clause, rank expression) for a query over `model` (deadlines or
+    pulse_events) outer-joined to courses.
+
+    On Postgres a row matches on words (tsvector GIN indexes, so "assignments"
+    finds "Assignment 3") or on substrings of the title and course names
+    (pg_trgm GIN indexes, so "CS2" and half-typed words work too). Course
+    conditions go through a sub-select on the small courses table, so every
+    branch of the OR on deadlines is an index scan. Elsewhere it falls back
+    to case-insensitive substring matching, ordered by due date only.
+    """
+    pattern = _like_pattern(term)
+
+    if db.get_bind().dialect.name != "postgresql":
+        names = [model.title, Course.fullname, Course.shortname]
+        if model is Deadline:
+            names.append(Deadline.course_name)
+        return or_(*(name.ilike(pattern, escape="\\") for name in names)), literal(0.0)
+
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, term)
+    matching_courses = select(Course.id).where(or_(
+        COURSE_VECTOR.op("@@")(query),
+        Course.fullname.ilike(pattern, escape="\\"),
+        Course.shortname.ilike(pattern, escape="\\"),
+    ))
+    vector = DEADLINE_VECTOR if model is Deadline else PULSE_EVENT_VECTOR
+    match = or_(
+        vector.op("@@")(query),
+        model.title.ilike(pattern, escape="\\"),
+        model.course_id.in_(matching_courses),
+    )
+    rank = (
+        func.ts_rank(vector, query)
+        + func.coalesce(func.ts_rank(COURSE_VECTOR, query), 0)
+        + func.similarity(model.title, term)
+    )
+    return match, rank
+
+
+def _page(rows: list, limit: int, offset: int) -> Dict[str, Any]:
+    return {
+        "items": rows[:limit],
+        "next_offset": offset + limit if len(rows) > limit else None,
+    }
+
+
+class SearchService:
+    """
+    Ranked search over deadline titles and course names, for one user's
+    deadlines or for the Universal Pulse feed. Results are ordered by rank,
+    then due date, and paginated by offset.
+    """
+
+    @staticmethod
+    def search_user_deadlines(
+        db: Session, user_id: int, term: str, course_id: Optional[int], limit: int, offset: int,
+    ) -> Dict[str, Any]:
+        """One page shaped like DeadlineSearchResults."""
+        match, rank = _match_and_rank(db, term)
+        query = response_query(db).filter(Deadline.user_id == user_id, match)
+        if course_id is not None:
+            query = query.filter(Deadline.course_id == course_id)
+
+        rows = (
+            query.order_by(rank.desc(), Deadline.due_date, Deadline.id)
+            .offset(offset)
+            .limit(limit + 1)
+            .all()
+        )
+        return _page([row._asdict() for row in rows], limit, offset)
+
+    @staticmethod
+    def search_pulse(
+        db: Session, term: str, course_id: Optional[int], limit: int, offset: int,
+    ) -> Dict[str, Any]:
+        """
+        One page shaped like PulseSearchResults: synced assignments that are
+        still inside the pulse retention window, one result per Moodle event
+        however many students have it.
+
+        Searches pulse_events, which holds each event once, and ranks only the
+        first PULSE_SEARCH_CANDIDATES matches by due date, so a broad term
+        costs a bounded index scan and sort rather than ranking every match.
+        """
+        match, rank = _match_and_rank(db, term, PulseEvent)
+        cutoff = utcnow() - timedelta(hours=settings.PULSE_RETENTION_HOURS)
+        conditions = [PulseEvent.due_date >= cutoff, match]
+        if course_id is not None:
+            conditions.append(PulseEvent.course_id == course_id)
+
+        candidates = (
+            select(PulseEvent.lms_event_id)
+            .select_from(PulseEvent)
+            .outerjoin(Course, PulseEvent.course_id == Course.id)
+            .where(and_(*conditions))
+            .order_by(PulseEvent.due_date, PulseEvent.lms_event_id)
+            .limit(settings.PULSE_SEARCH_CANDIDATES)
+            .cte("candidates")
+        )
+        rows = db.execute(
+            select(
+                PulseEvent.lms_event_id,
+                PulseEvent.title,
+                PulseEvent.due_date,
+                PulseEvent.course_id,
+                Course.fullname.label("course_name"),
+                Course.shortname.label("course_shortname"),
+            )
+            .select_from(PulseEvent)
+            .join(candidates, candidates.c.lms_event_id == PulseEvent.lms_event_id)
+            .outerjoin(Course, PulseEvent.course_id == Course.id)
+            .order_by(rank.desc(), PulseEvent.due_date, PulseEvent.lms_event_id)
+            .offset(offset)
+            .limit(limit + 1)
+        ).all()
+        return _page([row._asdict() for row in rows], limit, offset)
@@ -0,0 +1,142 @@
+import json
+import logging
+import time
+import uuid
+from typing import List, Optional
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.celery_app import celery_app, INTERACTIVE_QUEUE, BULK_QUEUE
+from app.core.redis_client import get_redis, get_async_redis
+
+logger = logging.getLogger(__name__)
+
+# Redis layout:
+#   sync:lock:<user_id>        token of the sync currently running for the user
+#   sync:cooldown:<user_id>    set when the user starts a manual sync
+#   interactive, bulk          Celery's own lists, one per lane (newest first)
+LOCK_KEY = "sync:lock:{}"
+COOLDOWN_KEY = "sync:cooldown:{}"
+
+# Deletes the lock only if it is still ours, so a sync that outlived its
+# lock never releases the next holder's
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SyncInProgressError(Exception):
+    """Another sync for the same user holds the lock."""
+
+
+class SyncQueueService:
+    """
+    Routes syncs onto the two Celery lanes and keeps them fair.
+
+    Interactive: the first sync after login (and new-deadline emails), on
+    dedicated workers. Bulk: the adaptive sweep, fanned out one task per
+    user. On top of the lanes, one user never has two syncs running at
+    once, manual syncs are rate-limited per user, and sweep traffic leaves
+    part of the LMS rate budget to interactive traffic (see LMSGuard).
+
+    Redis problems never stop a sync; locks and cooldowns fail open.
+    """
+
+    @staticmethod
+    async def acquire_lock(user_id: int) -> Optional[str]:
+        """Returns the lock token, None if Redis is unavailable, or raises SyncInProgressError."""
+        token = uuid.uuid4().hex
+        try:
+            acquired = await get_async_redis().set(
+                LOCK_KEY.format(user_id), token, nx=True, ex=settings.SYNC_CLAIM_LEASE_MINUTES * 60,
+            )
+        except RedisError as e:
+            logger.warning(f"Could not take sync lock for user {user_id}, syncing anyway: {e}")
+            return None
+        if not acquired:
+            raise SyncInProgressError(f"A sync is already running for user {user_id}")
+        return token
+
+    @staticmethod
+    async def release_lock(user_id: int, token: Optional[str]):
+        if token is None:
+            return
+        try:
+            await get_async_redis().eval(RELEASE_SCRIPT, 1, LOCK_KEY.format(user_id), token)
+        except RedisError as e:
+            logger.warning(f"Could not release sync lock for user {user_id}: {e}")
+
+    @staticmethod
+    def claim_cooldown(user_id: int) -> Optional[int]:
+        """Starts the user's manual-sync cooldown. Returns None, or the seconds left if one is running."""
+        key = COOLDOWN_KEY.format(user_id)
+        try:
+            r = get_redis()
+            if r.set(key, 1, nx=True, ex=settings.SYNC_USER_COOLDOWN_SECONDS):
+                return None
+            return max(1, r.ttl(key))
+        except RedisError as e:
+            logger.warning(f"Could not check sync cooldown for user {user_id}: {e}")
+            return None
+
+    @staticmethod
+    def release_cooldown(user_id: int):
+        """Ends a cooldown claimed for a sync that never started, so the user can retry straight away."""
+        try:
+            get_redis().delete(COOLDOWN_KEY.format(user_id))
+        except RedisError as e:
+            logger.warning(f"Could not release sync cooldown for user {user_id}: {e}")
+
+    @staticmethod
+    def enqueue_interactive(user_id: int, trigger: str) -> bool:
+        """Queues a sync on the interactive lane. False if the broker is unreachable."""
+        try:
+            celery_app.send_task("sync_user_now", args=[user_id, trigger], retry=False, ignore_result=True)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not queue interactive sync for user {user_id}: {e}")
+            return False
+
+    @staticmethod
+    def dispatch_bulk(user_ids: List[int]) -> List[int]:
+        """Queues one bulk-lane sync per user. Returns the ids that could not be queued."""
+        for index, user_id in enumerate(user_ids):
+            try:
+                celery_app.send_task("sync_user", args=[user_id], retry=False, ignore_result=True)
+            except Exception as e:
+                logger.warning(f"Could not queue background syncs: {e}")
+                return user_ids[index:]
+        return []
+
+    @staticmethod
+    def queue_stats() -> List[dict]:
+        """
+        Backlog per lane, shaped like SyncQueueStats. Age comes from the
+        publish time the metrics hook stamps on every message.
+        """
+        stats = []
+        r = get_redis()
+        for queue in (INTERACTIVE_QUEUE, BULK_QUEUE):
+            pipe = r.pipeline(transaction=False)
+            pipe.llen(queue)
+            pipe.lindex(queue, -1)
+            try:
+                depth, oldest = pipe.execute()
+            except RedisError as e:
+                logger.warning(f"Could not read the {queue} queue: {e}")
+                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Queue broker unavailable")
+
+            oldest_wait = None
+            if oldest:
+                try:
+                    published_at = json.loads(oldest)["headers"].get("published_at")
+                except (ValueError, KeyError, TypeError):
+                    published_at = None
+                if published_at:
+                    oldest_wait = round(max(0.0, time.time() - published_at), 3)
+            stats.append({"queue": queue, "depth": depth, "oldest_wait_seconds": oldest_wait})
+        return stats
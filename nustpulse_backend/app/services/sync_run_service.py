@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from app.models.sync_run import SyncRun
+from app.models.user import User
+from app.core.timeutils import utcnow
+
+PHASES = ("login", "sesskey", "calendar_fetch", "db_upsert")
+
+
+class SyncRunService:
+    @staticmethod
+    def get_last_run(db: Session, current_user):
+        run = (
+            db.query(SyncRun)
+            .filter(SyncRun.user_id == current_user.id)
+            .order_by(SyncRun.started_at.desc())
+            .first()
+        )
+        if not run:
+            raise HTTPException(status_code=404, detail="No sync has run for this account yet")
+        return run
+
+    @staticmethod
+    def get_runs(db: Session, current_user, limit: int):
+        return (
+            db.query(SyncRun)
+            .filter(SyncRun.user_id == current_user.id)
+            .order_by(SyncRun.started_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def prune(db: Session, before: datetime, batch_size: int) -> int:
+        """
+        Deletes runs that started before `before`, oldest first, committing
+        every `batch_size` rows so a large backlog never holds one long
+        transaction. Returns how many were deleted.
+        """
+        removed = 0
+        while True:
+            batch = [
+                row.id for row in
+                db.query(SyncRun.id).filter(SyncRun.started_at < before)
+                .order_by(SyncRun.started_at).limit(batch_size)
+            ]
+            if not batch:
+                return removed
+            db.query(SyncRun).filter(SyncRun.id.in_(batch)).delete(synchronize_session=False)
+            db.commit()
+            removed += len(batch)
+
+    @staticmethod
+    def get_cost_report(db: Session, days: int, limit: int):
+        """Slowest users and per-phase cost over the recent window."""
+        since = utcnow() - timedelta(days=days)
+        failed = func.sum(case((SyncRun.success == False, 1), else_=0))
+
+        totals = (
+            db.query(func.count(SyncRun.id), failed)
+            .filter(SyncRun.started_at >= since)
+            .one()
+        )
+
+        slowest = (
+            db.query(
+                SyncRun.user_id,
+                User.lms_username,
+                func.count(SyncRun.id).label("runs"),
+                failed.label("failures"),
+                func.avg(SyncRun.duration_ms).label("avg_duration_ms"),
+                func.max(SyncRun.duration_ms).label("max_duration_ms"),
+            )
+            .join(User, User.id == SyncRun.user_id)
+            .filter(SyncRun.started_at >= since)
+            .group_by(SyncRun.user_id, User.lms_username)
+            .order_by(func.avg(SyncRun.duration_ms).desc())
+            .limit(limit)
+            .all()
+        )
+
+        phase_columns = []
+        for phase in PHASES:
+            column = getattr(SyncRun, f"{phase}_ms")
+            phase_columns += [func.avg(column), func.max(column)]
+        phase_row = db.query(*phase_columns).filter(SyncRun.started_at >= since).one()
+
+        return {
+            "since": since,
+            "total_runs": totals[0] or 0,
+            "failed_runs": totals[1] or 0,
+            "slowest_users": [
+                {
+                    "user_id": row.user_id,
+                    "lms_username": row.lms_username,
+                    "runs": row.runs,
+                    "failures": row.failures or 0,
+                    "avg_duration_ms": float(row.avg_duration_ms or 0),
+                    "max_duration_ms": row.max_duration_ms or 0,
+                }
+                for row in slowest
+            ],
+            "phases": sorted(
+                (
+                    {
+                        "phase": phase,
+                        "avg_ms": float(phase_row[i * 2] or 0),
+                        "max_ms": phase_row[i * 2 + 1] or 0,
+                    }
+                    for i, phase in enumerate(PHASES)
+                ),
+                key=lambda p: p["avg_ms"],
+                reverse=True,
+            ),
+        }
@@ -1,115 +1,359 @@
 import logging
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
 from app.services.lms_service import LMSSession
+from app.services.lms_guard import LMSUnavailableError
 from app.models.deadline import Deadline
+from app.models.sync_run import SyncRun
 from app.models.user import User
 from app.services.crypto_service import decrypt_password
+from app.services.schedule_service import ScheduleService
+from app.services.pulse_service import PulseService
+from app.services.pulse_event_service import PulseEventService
+from app.services.event_service import EventService, SYNC_COMPLETED, DEADLINE_CHANGED
+from app.services.calendar_service import CalendarService
+from app.services.course_service import CourseService
+from app.services.change_feed_service import ChangeFeedService
+from app.services.course_load_service import CourseLoadService, LoadDeltas
+from app.services.reminder_service import ReminderService
+from app.services.sync_queue_service import SyncQueueService
+from app.services.consistency_service import ConsistencyService
+from app.core.timeutils import utcnow, as_utc
+from app.core.metrics import LMS_PHASE_DURATION, SYNC_RUNS, SYNC_ROWS
+from app.core.celery_app import celery_app
+from app.core.profiling import maybe_profile
 
 logger = logging.getLogger(__name__)
 
 # Moodle event types that represent student deadlines
 DEADLINE_EVENT_TYPES = {"assign", "assignment", "quiz", "due", "turnitintool"}
 
+# Triggers that run on the bulk lane and yield LMS capacity to the rest
+BACKGROUND_TRIGGERS = {"scheduled", "sweep"}
+
+# Failure reasons recorded on SyncRun
+FAILURE_AUTH = "auth_failed"
+FAILURE_SESSKEY = "sesskey_missing"
+FAILURE_LMS_UNAVAILABLE = "lms_unavailable"
+FAILURE_DECRYPT = "decrypt_failed"
+FAILURE_ERROR = "error"
+
+# Failures caused by the stored credentials, which retrying cannot fix;
+# these back off and eventually park the user (see ScheduleService.defer)
+CREDENTIAL_FAILURES = {FAILURE_AUTH, FAILURE_DECRYPT}
+
+
+@contextmanager
+def _phase(run: SyncRun, name: str):
+    """Times one sync phase into both the Prometheus histogram and the run ledger."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        LMS_PHASE_DURATION.labels(name).observe(elapsed)
+        setattr(run, f"{name}_ms", int(elapsed * 1000))
+
 
 class SyncService:
     @staticmethod
-    async def sync_user_deadlines(db: Session, user: User, password: str) -> bool:
+    async def sync_user_deadlines(db: Session, user: User, password: str, trigger: str = "manual") -> bool:
         """
         Synchronises assignments from NUST LMS for a specific user.
+        Raises SyncInProgressError if the user is already being synced
+        elsewhere (another lane, process or host).
+        """
+        lock = await SyncQueueService.acquire_lock(user.id)
+        try:
+            with maybe_profile("sync", f"user{user.id}-{trigger}"):
+                return await SyncService._sync_locked(db, user, password, trigger)
+        finally:
+            await SyncQueueService.release_lock(user.id, lock)
+
+    @staticmethod
+    async def _sync_locked(db: Session, user: User, password: str, trigger: str) -> bool:
+        """
         Creates a fresh LMSSession per call to avoid stale-cookie failures.
+        Every attempt, successful or not, leaves one row in `sync_runs`.
         """
-        session = LMSSession()
+        run = SyncService._start_run(user, trigger)
+        session = LMSSession(background=trigger in BACKGROUND_TRIGGERS)
         try:
             # 1. Log into LMS with a clean session
-            is_logged_in = await session.login(user.lms_username, password)
+            with _phase(run, "login"):
+                is_logged_in = await session.login(user.lms_username, password)
             if not is_logged_in:
                 logger.error(f"Sync failed: Could not log in for user {user.lms_username}")
+                SyncService._fail(db, user, run, FAILURE_AUTH, session)
                 return False
 
             # 2. Get sesskey
-            sesskey = await session.get_sesskey()
+            with _phase(run, "sesskey"):
+                sesskey = await session.get_sesskey()
             if not sesskey:
                 logger.error(f"Sync failed: Could not retrieve sesskey for {user.lms_username}")
+                SyncService._fail(db, user, run, FAILURE_SESSKEY, session)
                 return False
 
             # 3. Fetch calendar events
-            events = await session.get_calendar_events(sesskey)
+            with _phase(run, "calendar_fetch"):
+                events = await session.get_calendar_events(sesskey)
+            run.events_fetched = len(events)
             logger.info(f"Retrieved {len(events)} events from LMS for {user.lms_username}")
 
             # 4. Process events and upsert into database
-            synced_ids = []
-            for event in events:
-                event_type = (event.get("eventtype") or "").lower()
-                if event_type not in DEADLINE_EVENT_TYPES:
-                    continue
-
-                lms_event_id = event.get("id")
-                title        = event.get("name", "Untitled")
-                timestart    = event.get("timestart")
-                course_name  = event.get("course", {}).get("fullname", "Unknown Course")
-
-                if not lms_event_id or not timestart:
-                    continue
-
-                synced_ids.append(lms_event_id)
-                due_date = datetime.fromtimestamp(timestart, tz=timezone.utc)
-
-                existing = (
-                    db.query(Deadline)
-                    .filter(
-                        Deadline.user_id == user.id,
-                        Deadline.lms_event_id == lms_event_id,
+            with _phase(run, "db_upsert"):
+                now = utcnow()
+                notify = bool(user.notification_email and user.notifications_enabled)
+                new_courses, renamed_for = CourseService.ensure_courses(db, {
+                    event["course"]["id"]: (
+                        event["course"].get("fullname") or "Unknown Course",
+                        event["course"].get("shortname"),
                     )
-                    .first()
-                )
+                    for event in events
+                    if (event.get("course") or {}).get("id")
+                })
+                inserted = []
+                updated = []
+                loads = LoadDeltas()
+                synced_ids = []
+                pulse_events = []
+                nearest_due = None
+                for event in events:
+                    event_type = (event.get("eventtype") or "").lower()
+                    if event_type not in DEADLINE_EVENT_TYPES:
+                        continue
+
+                    lms_event_id = event.get("id")
+                    title        = event.get("name", "Untitled")
+                    timestart    = event.get("timestart")
+                    course       = event.get("course") or {}
+                    course_id    = course.get("id")
+                    # Synced rows reference `courses`; a name is only stored when Moodle gave no id
+                    course_name  = None if course_id else course.get("fullname", "Unknown Course")
+
+                    if not lms_event_id or not timestart:
+                        continue
 
-                if existing:
-                    existing.title       = title
-                    existing.due_date    = due_date
-                    existing.course_name = course_name
-                else:
-                    db.add(
-                        Deadline(
+                    synced_ids.append(lms_event_id)
+                    pulse_events.append({
+                        "lms_event_id": lms_event_id,
+                        "title": title,
+                        "due_ts": timestart,
+                        "event_type": event_type,
+                        "course": event.get("course"),
+                    })
+                    due_date = datetime.fromtimestamp(timestart, tz=timezone.utc)
+                    if due_date >= now and (nearest_due is None or due_date < nearest_due):
+                        nearest_due = due_date
+
+                    existing = (
+                        db.query(Deadline)
+                        .filter(
+                            Deadline.user_id == user.id,
+                            Deadline.lms_event_id == lms_event_id,
+                        )
+                        .first()
+                    )
+
+                    if existing:
+                        if (
+                            existing.title != title
+                            or as_utc(existing.due_date) != due_date
+                            or existing.course_id != course_id
+                            or existing.course_name != course_name
+                        ):
+                            loads.remove(existing.course_id, existing.due_date, existing.is_pinned)
+                            loads.add(course_id, due_date, existing.is_pinned)
+                            existing.title       = title
+                            existing.due_date    = due_date
+                            existing.course_id   = course_id
+                            existing.course_name = course_name
+                            ReminderService.schedule(existing, now)
+                            updated.append(existing)
+                            run.rows_updated += 1
+                    else:
+                        run.rows_inserted += 1
+                        deadline = Deadline(
                             title=title,
                             due_date=due_date,
+                            course_id=course_id,
                             course_name=course_name,
                             lms_event_id=lms_event_id,
                             user_id=user.id,
+                            # Rows nobody will be emailed about never need the safety-net scan
+                            notified_new=not notify,
                         )
-                    )
+                        db.add(deadline)
+                        inserted.append(deadline)
+                        loads.add(course_id, due_date, False)
 
-            # 5. Pruning: Remove deadlines that are no longer in the LMS response
-            # (Only for deadlines that have an lms_event_id, to avoid deleting manual tasks)
-            prune_query = db.query(Deadline).filter(
-                Deadline.user_id == user.id,
-                Deadline.lms_event_id.isnot(None)
-            )
-            
-            if synced_ids:
-                prune_query = prune_query.filter(Deadline.lms_event_id.notin_(synced_ids))
-            
-            deleted_count = prune_query.delete(synchronize_session=False)
-            
-            if deleted_count > 0:
-                logger.info(f"Pruned {deleted_count} stale/submitted deadlines for {user.lms_username}")
+                # 5. Pruning: Remove deadlines that are no longer in the LMS response
+                # (Only for deadlines that have an lms_event_id, to avoid deleting manual tasks)
+                prune_query = db.query(Deadline.id, Deadline.course_id, Deadline.due_date, Deadline.is_pinned).filter(
+                    Deadline.user_id == user.id,
+                    Deadline.lms_event_id.isnot(None)
+                )
+
+                if synced_ids:
+                    prune_query = prune_query.filter(Deadline.lms_event_id.notin_(synced_ids))
+
+                pruned_ids = []
+                for row in prune_query:
+                    pruned_ids.append(row.id)
+                    loads.remove(row.course_id, row.due_date, row.is_pinned)
+                run.rows_pruned = len(pruned_ids)
+                changed = bool(run.rows_inserted or run.rows_updated or run.rows_pruned)
+
+                # One change-feed version covers everything this sync wrote;
+                # pruned rows leave tombstones so clients can drop them
+                if changed:
+                    version = ChangeFeedService.next_version(db, user.id)
+                    for deadline in inserted + updated:
+                        deadline.change_version = version
+                    if pruned_ids:
+                        db.query(Deadline).filter(Deadline.id.in_(pruned_ids)).delete(synchronize_session=False)
+                        ChangeFeedService.record_deletions(db, user.id, pruned_ids, version)
+                    CourseLoadService.apply(db, loads)
+
+                if run.rows_pruned > 0:
+                    logger.info(f"Pruned {run.rows_pruned} stale/submitted deadlines for {user.lms_username}")
+
+                # The deduplicated copy pulse search reads; Redis gets the same events after commit
+                PulseEventService.record(db, pulse_events)
+
+                # 6. Schedule the next sync based on what we just saw
+                ScheduleService.reschedule(user, nearest_due, changed, now)
+                db.flush()
+                new_deadlines = SyncService.new_deadline_payload(user, inserted) if notify and inserted else None
 
+            SyncService._finish_run(db, run, session)
             db.commit()
+            CourseService.remember(new_courses)
+
+            SYNC_RUNS.labels("success").inc()
+            SYNC_ROWS.labels("inserted").inc(run.rows_inserted)
+            SYNC_ROWS.labels("updated").inc(run.rows_updated)
+            SYNC_ROWS.labels("pruned").inc(run.rows_pruned)
             logger.info(
                 f"Successfully synced {len(synced_ids)} deadline(s) for {user.lms_username}"
             )
+
+            # 7. Feed the shared Universal Pulse stream and tell the user's open tabs,
+            # whose refetch must not land on a replica that hasn't caught up yet
+            PulseService.publish(pulse_events)
+            ConsistencyService.mark_write(user.lms_username)
+            if changed or user.id in renamed_for:
+                CalendarService.invalidate(user.id)
+            # A course rename changed other students' deadlines too
+            for other_id in renamed_for:
+                if other_id != user.id:
+                    CalendarService.invalidate(other_id)
+                    EventService.publish(other_id, DEADLINE_CHANGED, {"action": "course_renamed"})
+            EventService.publish(user.id, SYNC_COMPLETED, {
+                "success": True,
+                "inserted": run.rows_inserted,
+                "updated": run.rows_updated,
+                "pruned": run.rows_pruned,
+            })
+
+            # 8. Hand the new rows straight to the notification worker
+            if new_deadlines:
+                SyncService._dispatch_new_deadlines(new_deadlines)
             return True
 
+        except LMSUnavailableError as e:
+            logger.error(f"Sync failed: LMS unavailable for {user.lms_username}: {e}")
+            db.rollback()
+            SyncService._fail(db, user, run, FAILURE_LMS_UNAVAILABLE, session)
+            return False
         except Exception as e:
             logger.error(f"Critical error during sync for {user.lms_username}: {str(e)}")
             db.rollback()
+            SyncService._fail(db, user, run, f"{FAILURE_ERROR}: {e}"[:500], session)
             return False
         finally:
             await session.close()
 
     @staticmethod
-    async def sync_by_stored_credentials(db: Session, user: User) -> bool:
+    def new_deadline_payload(user: User, deadlines: list[Deadline]) -> dict:
+        """
+        JSON-safe event for freshly inserted deadlines, carrying the user's
+        contact details so the notifier never has to look the user up.
+        The deadlines must already be flushed so their ids are known.
+        """
+        return {
+            "user": {
+                "id": user.id,
+                "name": user.name,
+                "email": user.notification_email,
+            },
+            "deadline_ids": [d.id for d in deadlines],
+        }
+
+    @staticmethod
+    def _dispatch_new_deadlines(payload: dict):
+        """
+        Queues the notify_new_deadlines task. If the broker is unreachable the
+        rows keep notified_new=False and the periodic safety net sends them.
+        """
+        try:
+            celery_app.send_task("notify_new_deadlines", args=[payload], retry=False, ignore_result=True)
+        except Exception as e:
+            logger.warning(f"Could not queue new-deadline notifications for user {payload['user']['id']}: {e}")
+
+    @staticmethod
+    def _start_run(user: User, trigger: str) -> SyncRun:
+        return SyncRun(
+            user_id=user.id,
+            trigger=trigger,
+            started_at=utcnow(),
+            http_requests=0,
+            bytes_received=0,
+            events_fetched=0,
+            rows_inserted=0,
+            rows_updated=0,
+            rows_pruned=0,
+        )
+
+    @staticmethod
+    def _finish_run(db: Session, run: SyncRun, session: LMSSession = None):
+        """Stamps the run and stages its single insert. Caller commits."""
+        run.finished_at = utcnow()
+        run.duration_ms = int((run.finished_at - run.started_at).total_seconds() * 1000)
+        run.success = run.failure_reason is None
+        if session is not None:
+            run.http_requests = session.request_count
+            run.bytes_received = session.bytes_received
+        db.add(run)
+
+    @staticmethod
+    def _fail(db: Session, user: User, run: SyncRun, reason: str, session: LMSSession = None):
+        """Records a failed run and schedules a retry without letting either mask the failure."""
+        SYNC_RUNS.labels("failed").inc()
+        user_id = user.id
+        run.failure_reason = reason
+        run.rows_inserted = run.rows_updated = run.rows_pruned = 0
+        category = reason.split(":")[0]
+        credential_failure = category in CREDENTIAL_FAILURES
+        try:
+            # A transient failure must not wipe out a credential failure streak
+            ScheduleService.defer(
+                user, category, backoff=credential_failure,
+                keep_record=not credential_failure and user.sync_failure_reason in CREDENTIAL_FAILURES,
+            )
+            SyncService._finish_run(db, run, session)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Could not record failed sync for {user.lms_username}: {e}")
+            db.rollback()
+        EventService.publish(user_id, SYNC_COMPLETED, {"success": False, "reason": category})
+
+    @staticmethod
+    async def sync_by_stored_credentials(db: Session, user: User, trigger: str = "manual") -> bool:
         """
         Syncs using the password stored in the DB (called from the /sync endpoint).
         """
@@ -117,9 +361,10 @@ class SyncService:
             plain_password = decrypt_password(user.lms_password)
         except Exception as e:
             logger.error(f"Could not decrypt password for {user.lms_username}: {e}")
+            SyncService._fail(db, user, SyncService._start_run(user, trigger), FAILURE_DECRYPT)
             return False
 
-        return await SyncService.sync_user_deadlines(db, user, plain_password)
+        return await SyncService.sync_user_deadlines(db, user, plain_password, trigger)
 
 
 sync_service = SyncService()
@@ -1,16 +1,33 @@
-import asyncio
 import logging
-from datetime import datetime, date, timedelta
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.core.timeutils import utcnow
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, contains_eager
 from app.database.database import SessionLocal
 from app.core.celery_app import celery_app
+from app.core.async_runtime import runtime
+from app.core.redis_client import close_async_redis
 from app.models.user import User
 from app.models.deadline import Deadline
-from app.services.sync_service import SyncService
+from app.services.sync_service import SyncService, CREDENTIAL_FAILURES
 from app.services.notification_service import NotificationService
+from app.services.schedule_service import ScheduleService
+from app.services.reminder_service import ReminderService
+from app.services.pulse_service import PulseService
+from app.services.pulse_event_service import PulseEventService
+from app.services.change_feed_service import ChangeFeedService
+from app.services.sync_run_service import SyncRunService
+from app.services.sync_queue_service import SyncQueueService, SyncInProgressError
+from app.services.lms_guard import LMSGuard
+from app.services.lms_service import close_shared_transport
 
 logger = logging.getLogger(__name__)
 
+# Pools living on the worker's event loop are closed when the worker stops
+runtime.on_shutdown(close_shared_transport)
+runtime.on_shutdown(close_async_redis)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -18,86 +35,288 @@ def get_db():
     finally:
         db.close()
 
+def _claim_unnotified(db: Session, query) -> list:
+    """
+    Leases the matching un-notified rows before any email goes out, so the
+    event-driven task and the safety net never both send the same alert.
+    Rows are only flagged notified once their email has gone out (see
+    _send_new_deadline_alerts); a claim whose worker died or whose send
+    failed runs out after NOTIFY_CLAIM_LEASE_MINUTES and the safety net
+    takes the row again. Delivery is at-least-once: a crash between the
+    send and the flag repeats that alert.
+    """
+    now = utcnow()
+    lease_start = now - timedelta(minutes=settings.NOTIFY_CLAIM_LEASE_MINUTES)
+    rows = (
+        query.filter(
+            Deadline.notified_new == False,
+            or_(Deadline.notify_claimed_at.is_(None), Deadline.notify_claimed_at <= lease_start),
+        )
+        .with_for_update(skip_locked=True, of=Deadline)
+        .all()
+    )
+    if rows:
+        db.query(Deadline).filter(Deadline.id.in_([row.id for row in rows])).update(
+            {Deadline.notify_claimed_at: now}, synchronize_session=False
+        )
+    # Detach so the rows stay readable after the commit without a reload each
+    db.expunge_all()
+    db.commit()
+    return rows
+
+def _send_new_deadline_alerts(db: Session, user: User, deadlines: list) -> int:
+    """Emails each claimed deadline and flags the ones that went out, in one UPDATE."""
+    sent = []
+    try:
+        for deadline in deadlines:
+            if runtime.run(NotificationService.send_new_deadline_notification(user or deadline.user, deadline)):
+                sent.append(deadline.id)
+    finally:
+        if sent:
+            db.query(Deadline).filter(Deadline.id.in_(sent)).update(
+                {Deadline.notified_new: True}, synchronize_session=False
+            )
+            db.commit()
+    return len(sent)
+
+def _notify_new_deadlines(db: Session):
+    """
+    Safety net: alerts for any deadline still un-notified and unclaimed,
+    whatever the cause. Deadlines already past are left alone, so an alert
+    that keeps failing stops being retried once it no longer matters.
+    """
+    pending = _claim_unnotified(
+        db,
+        db.query(Deadline)
+        .join(Deadline.user)
+        .options(contains_eager(Deadline.user))
+        .filter(
+            User.notification_email.isnot(None),
+            User.notifications_enabled == True,
+            Deadline.due_date > utcnow(),
+        ),
+    )
+    return _send_new_deadline_alerts(db, None, pending)
+
+@celery_app.task(name="notify_new_deadlines", acks_late=False)
+def notify_new_deadlines(payload: dict):
+    """
+    Emails a user about the deadlines one sync just inserted.
+    Queued by SyncService with the user's contact details attached (see
+    SyncService.new_deadline_payload), so only the claimed rows are read.
+    """
+    db = SessionLocal()
+    try:
+        claimed = _claim_unnotified(db, db.query(Deadline).filter(Deadline.id.in_(payload["deadline_ids"])))
+        if not claimed:
+            return
+
+        contact = payload["user"]
+        user = User(id=contact["id"], name=contact["name"], notification_email=contact["email"], notifications_enabled=True)
+        _send_new_deadline_alerts(db, user, claimed)
+    except Exception as e:
+        logger.error(f"Error in notify_new_deadlines task: {e}")
+    finally:
+        db.close()
+
+@celery_app.task(name="notify_pending_deadlines", acks_late=False)
+def notify_pending_deadlines():
+    """
+    Rare safety net for new-deadline alerts whose event never arrived
+    (broker outage, worker crash). Normal alerts come from notify_new_deadlines.
+    """
+    db = SessionLocal()
+    try:
+        sent = _notify_new_deadlines(db)
+        if sent:
+            logger.warning(f"Safety net sent {sent} new-deadline alerts that missed the event path.")
+    except Exception as e:
+        logger.error(f"Error in notify_pending_deadlines task: {e}")
+    finally:
+        db.close()
+
+@celery_app.task(name="sync_due_users")
+def sync_due_users():
+    """
+    Claims the users whose adaptive schedule says they are due and queues
+    one bulk-lane sync_user task each. Runs every few minutes via Celery
+    Beat; see ScheduleService.
+    """
+    if LMSGuard.is_open():
+        logger.warning("LMS circuit is open; skipping this sync tick.")
+        return
+
+    db = SessionLocal()
+    try:
+        user_ids = ScheduleService.claim_due_users(db)
+        if not user_ids:
+            return
+
+        unqueued = SyncQueueService.dispatch_bulk(user_ids)
+        if unqueued:
+            ScheduleService.release(db, unqueued)
+        logger.info(f"Queued scheduled syncs for {len(user_ids) - len(unqueued)} due users.")
+    except Exception as e:
+        logger.error(f"Error in sync_due_users task: {e}")
+    finally:
+        db.close()
+
+def _sync_one(user_id: int, trigger: str):
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return
+        runtime.run(SyncService.sync_by_stored_credentials(db, user, trigger=trigger))
+    except SyncInProgressError:
+        logger.info(f"User {user_id} is already syncing; skipping this {trigger} sync.")
+    except Exception as e:
+        logger.error(f"Error syncing user {user_id} ({trigger}): {e}")
+    finally:
+        db.close()
+
+@celery_app.task(name="sync_user")
+def sync_user(user_id: int):
+    """One scheduled sync on the bulk lane, queued by sync_due_users."""
+    if LMSGuard.is_open():
+        # Hand the user back instead of hammering an unhealthy LMS
+        db = SessionLocal()
+        try:
+            ScheduleService.release(db, [user_id])
+        finally:
+            db.close()
+        return
+    _sync_one(user_id, "scheduled")
+
+@celery_app.task(name="sync_user_now")
+def sync_user_now(user_id: int, trigger: str = "login"):
+    """A sync someone is waiting for, on the interactive lane (e.g. right after login)."""
+    _sync_one(user_id, trigger)
+
 @celery_app.task(name="sync_all_users")
 def sync_all_users():
     """
     Background task to sync LMS deadlines for all users with stored credentials.
-    Runs every 4 hours via Celery Beat.
+    No longer on the beat schedule (see sync_due_users); kept for manual full sweeps.
+    Users whose stored password last failed are left to their backoff schedule,
+    so stale accounts cost the sweep nothing.
     """
     db = SessionLocal()
     try:
-        users = db.query(User).all()
+        users = db.query(User).filter(or_(
+            User.sync_failure_reason.is_(None),
+            User.sync_failure_reason.notin_(CREDENTIAL_FAILURES),
+        )).all()
         logger.info(f"Starting background sync for {len(users)} users.")
         
         for user in users:
-            # We run the sync in an event loop because SyncService is async
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # This should not happen in a typical celery worker
-                # but we handle it just in case
-                asyncio.ensure_future(SyncService.sync_by_stored_credentials(db, user))
-            else:
-                loop.run_until_complete(SyncService.sync_by_stored_credentials(db, user))
-                
-        # After sync, we check for new deadlines that haven't been notified
-        new_deadlines = db.query(Deadline).filter(Deadline.notified_new == False).all()
-        for deadline in new_deadlines:
-            user = deadline.user
-            if user.notification_email and user.notifications_enabled:
-                loop.run_until_complete(NotificationService.send_new_deadline_notification(user, deadline))
-                deadline.notified_new = True
-        
-        db.commit()
-        logger.info("Background sync and notification pass completed.")
+            if LMSGuard.is_open():
+                logger.warning("LMS circuit is open; stopping the full sweep early.")
+                break
+            # SyncService is async; the worker's runtime loop runs it
+            try:
+                runtime.run(SyncService.sync_by_stored_credentials(db, user, trigger="sweep"))
+            except SyncInProgressError:
+                logger.info(f"User {user.id} is already syncing; skipping.")
+
+        logger.info("Background sync completed.")
     except Exception as e:
         logger.error(f"Error in sync_all_users task: {e}")
     finally:
         db.close()
 
-@celery_app.task(name="daily_reminder_check")
-def daily_reminder_check():
+@celery_app.task(name="prune_pulse_feed")
+def prune_pulse_feed():
     """
-    Checks for pinned deadlines due in less than 3 days.
-    Runs once a day via Celery Beat.
+    Trims the Universal Pulse feed to its retention window, including idle
+    courses, and the pulse_events rows search reads.
     """
+    dropped = PulseService.prune()
+    if dropped:
+        logger.info(f"Dropped {dropped} inactive courses from the pulse feed.")
+
     db = SessionLocal()
     try:
-        today = date.today()
-        three_days_from_now = today + timedelta(days=3)
-        
-        # Fetch pinned deadlines due soon
-        upcoming = db.query(Deadline).filter(
-            Deadline.is_pinned == True,
-            Deadline.due_date >= today,
-            Deadline.due_date <= three_days_from_now
-        ).all()
-        
-        logger.info(f"Checking reminders for {len(upcoming)} upcoming deadlines.")
-        
-        loop = asyncio.get_event_loop()
-        
-        for deadline in upcoming:
-            user = deadline.user
-            logger.info(f"Processing reminder for {user.notification_email} - {deadline.title}")
-
-            # Check if we already sent a reminder today
-            if deadline.last_reminder_sent_at and deadline.last_reminder_sent_at.date() == today:
-                logger.info(f"Skipping {deadline.title}: Already sent today.")
-                continue
-                
-            days_left = (deadline.due_date.date() - today).days
-            logger.info(f"Days left for {deadline.title}: {days_left}")
-            
-            if user.notification_email and user.notifications_enabled:
-                logger.info(f"TRIGGERING EMAIL to {user.notification_email} for {deadline.title}")
-                loop.run_until_complete(NotificationService.send_proximity_reminder(user, deadline, days_left))
-                deadline.last_reminder_sent_at = datetime.now()
-            else:
-                logger.info(f"Skipping {deadline.title}: User notifications disabled or email missing.")
-        
-        db.commit()
-        logger.info("Daily reminder check completed.")
+        removed = PulseEventService.prune(db)
+        logger.info(f"Pruned {removed} expired pulse events.")
+    except Exception as e:
+        logger.error(f"Error pruning pulse events: {e}")
+    finally:
+        db.close()
+
+@celery_app.task(name="compact_deadline_tombstones")
+def compact_deadline_tombstones():
+    """
+    Drops deadline tombstones past the retention window. Clients whose
+    cursor predates them get a full list on their next change-feed call.
+    """
+    db = SessionLocal()
+    try:
+        cutoff = utcnow() - timedelta(days=settings.DEADLINE_TOMBSTONE_RETENTION_DAYS)
+        removed = ChangeFeedService.compact(db, cutoff)
+        logger.info(f"Compacted {removed} deadline tombstones.")
+    except Exception as e:
+        logger.error(f"Error in compact_deadline_tombstones task: {e}")
+    finally:
+        db.close()
+
+@celery_app.task(name="prune_sync_runs")
+def prune_sync_runs():
+    """Drops sync_runs rows past the retention window, in batches, on the bulk lane."""
+    db = SessionLocal()
+    try:
+        cutoff = utcnow() - timedelta(days=settings.SYNC_RUN_RETENTION_DAYS)
+        removed = SyncRunService.prune(db, cutoff, settings.SYNC_RUN_PRUNE_BATCH)
+        logger.info(f"Pruned {removed} sync runs.")
     except Exception as e:
-        logger.error(f"Error in daily_reminder_check task: {e}")
+        logger.error(f"Error in prune_sync_runs task: {e}")
     finally:
         db.close()
+
+@celery_app.task(name="dispatch_due_reminders", acks_late=False)
+def dispatch_due_reminders():
+    """
+    Claims the proximity reminders that have come due, in batches, and
+    queues one send_due_reminders task per batch on the bulk lane. Runs
+    every minute via Celery Beat; see ReminderService. Only claims, so it
+    holds an interactive worker for a few queries, never for the emails.
+    """
+    with ReminderService.dispatch_lock() as acquired:
+        if not acquired:
+            logger.info("Another reminder dispatch is running; skipping this tick.")
+            return
+
+        db = SessionLocal()
+        try:
+            queued = 0
+            while True:
+                now = utcnow()
+                claimed, due = ReminderService.claim_due(db, now)
+                if due:
+                    payload = ReminderService.reminder_payload(due, now)
+                    try:
+                        send_due_reminders.apply_async(args=[payload], retry=False)
+                        queued += len(due)
+                    except Exception as e:
+                        # Already claimed, so these are skipped, not retried (at most once)
+                        logger.error(f"Could not queue {len(due)} deadline reminders: {e}")
+                if claimed < settings.REMINDER_BATCH_SIZE:
+                    break
+            if queued:
+                logger.info(f"Queued {queued} deadline reminders.")
+        except Exception as e:
+            logger.error(f"Error in dispatch_due_reminders task: {e}")
+        finally:
+            db.close()
+
+@celery_app.task(name="send_due_reminders", acks_late=False)
+def send_due_reminders(reminders: list):
+    """Emails one batch of claimed reminders (see ReminderService.reminder_payload)."""
+    for reminder in reminders:
+        user = User(name=reminder["name"], notification_email=reminder["email"], notifications_enabled=True)
+        deadline = Deadline(
+            title=reminder["title"],
+            course_name=reminder["course_name"],
+            due_date=datetime.fromisoformat(reminder["due_date"]),
+        )
+        runtime.run(NotificationService.send_proximity_reminder(user, deadline, reminder["days_left"]))
@@ -0,0 +1,161 @@
+"""
+API load harness for the hot read endpoints.
+
+Seeds a local database with a realistic spread of users, deadlines and pins,
+mints JWTs with create_access_token, then drives the FastAPI app in-process
+(httpx.ASGITransport) at a fixed concurrency. Reports p50/p95/p99, throughput
+and DB queries per request for each route.
+
+    cd nustpulse_backend
+    python -m benchmarks.api_load --users 500 --requests 2000 --concurrency 32
+    python -m benchmarks.api_load --routes /deadlines/ --json before.json
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import configure_env, reset_schema, QueryCounter, percentiles, write_report
+
+DEFAULT_ROUTES = ("/dashboard/summary", "/deadlines/", "/users/me")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--deadlines-mean", type=float, default=40, help="Mean deadlines per user")
+    parser.add_argument("--pinned-fraction", type=float, default=0.35)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--routes", nargs="+", default=list(DEFAULT_ROUTES))
+    parser.add_argument("--db-url", default="sqlite:///./bench_api.db")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Report path (default: benchmarks/results/api_load.json)")
+    return parser.parse_args()
+
+
+def seed(db, args):
+    """Users with a skewed deadline count (a few heavy users), mixed LMS/manual rows and pins."""
+    from app.models.user import User
+    from app.models.deadline import Deadline
+
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+
+    users = [
+        User(
+            name=f"Student {i}",
+            lms_username=f"student{i:05d}@seecs.edu.pk",
+            lms_password="not-used",
+            notification_email=f"student{i:05d}@gmail.com" if rng.random() < 0.4 else None,
+            notifications_enabled=rng.random() < 0.4,
+        )
+        for i in range(args.users)
+    ]
+    db.add_all(users)
+    db.flush()
+
+    rows = []
+    for user in users:
+        count = max(1, int(rng.lognormvariate(0, 0.5) * args.deadlines_mean))
+        for n in range(count):
+            from_lms = rng.random() < 0.85
+            course_id = rng.randint(1, 60)
+            rows.append(Deadline(
+                title=f"Assignment {n + 1}",
+                due_date=now + timedelta(hours=rng.uniform(-7 * 24, 30 * 24)),
+                course_name=f"Course {course_id:03d}",
+                lms_event_id=course_id * 1000 + n if from_lms else None,
+                is_pinned=rng.random() < args.pinned_fraction,
+                notified_new=True,
+                user_id=user.id,
+            ))
+    db.add_all(rows)
+    db.commit()
+    return [user.lms_username for user in users], len(rows)
+
+
+async def drive(client, route, tokens, total, concurrency, rng):
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(rng.choice(tokens))
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                token = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            response = await client.get(route, headers={"Authorization": f"Bearer {token}"})
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run(args, tokens, queries):
+    import httpx
+    from app.main import app
+
+    rng = random.Random(args.seed)
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for route in args.routes:
+            # Warm up connection pools and lazy imports before measuring
+            await drive(client, route, tokens, min(50, args.requests), args.concurrency, rng)
+            queries.take()
+
+            latencies, errors, elapsed = await drive(client, route, tokens, args.requests, args.concurrency, rng)
+            results[route] = {
+                "requests": args.requests,
+                "errors": errors,
+                "seconds": round(elapsed, 3),
+                "throughput_rps": round(args.requests / elapsed, 2),
+                "db_queries_per_request": round(queries.take() / args.requests, 2),
+                **percentiles(latencies),
+            }
+    return results
+
+
+def main():
+    args = parse_args()
+    configure_env(args.db_url)
+
+    from app.core.security import create_access_token
+    from app.database.database import SessionLocal, engine
+
+    reset_schema()
+    db = SessionLocal()
+    usernames, deadline_count = seed(db, args)
+    db.close()
+
+    tokens = [create_access_token(data={"sub": username}) for username in usernames]
+    queries = QueryCounter(engine)
+    routes = asyncio.run(run(args, tokens, queries))
+
+    report = {
+        "config": vars(args),
+        "dataset": {"users": len(usernames), "deadlines": deadline_count},
+        "routes": routes,
+    }
+    path = write_report("api_load", report, args.json)
+
+    for route, result in routes.items():
+        print(
+            f"{route:<20} p50 {result['p50_ms']:>7}ms  p95 {result['p95_ms']:>7}ms  "
+            f"p99 {result['p99_ms']:>7}ms  {result['throughput_rps']:>8} req/s  "
+            f"{result['db_queries_per_request']:>5} queries/req  errors {result['errors']}"
+        )
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
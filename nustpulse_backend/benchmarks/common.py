@@ -0,0 +1,108 @@
+"""
+Shared setup for the offline benchmarks.
+
+`configure_env` must run before anything under `app` is imported: settings,
+the engine and the Fernet cipher are all built at import time.
+"""
+import json
+import os
+import statistics
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def configure_env(database_url: str, **overrides):
+    """Points the app at a local database and switches off external integrations."""
+    from cryptography.fernet import Fernet
+
+    os.environ["DATABASE_URL"] = database_url
+    defaults = {
+        "REDIS_URL": "redis://localhost:6379/15",
+        "SECRET_KEY": "benchmark-secret",
+        "FERNET_KEY": Fernet.generate_key().decode(),
+        "GMAIL_REFRESH_TOKEN": "benchmark",
+        "MAIL_FROM": "bench@nustpulse.local",
+        "GOOGLE_CLIENT_ID": "benchmark",
+        "GOOGLE_CLIENT_SECRET": "benchmark",
+        "GOOGLE_REDIRECT_URI": "http://localhost/callback",
+        "GROQ_KEY": "benchmark",
+        # No Redis needed: the LMS guard, pulse feed and live events are out of scope here
+        "LMS_GUARD_ENABLED": "false",
+        "PULSE_FEED_ENABLED": "false",
+        "EVENTS_ENABLED": "false",
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+    for key, value in overrides.items():
+        os.environ[key] = str(value)
+
+
+def stub_redis():
+    """
+    Replaces the Redis calls the sync and deadline write paths make even with
+    the integrations above off (the per-user sync lock, the reminder
+    dispatch lock and calendar feed invalidation) with no-ops, so runs neither need Redis nor pay a refused
+    connection per call. Import after `configure_env`.
+    """
+    from contextlib import nullcontext
+    from app.services.calendar_service import CalendarService
+    from app.services.reminder_service import ReminderService
+    from app.services.sync_queue_service import SyncQueueService
+
+    async def acquire_lock(user_id):
+        return None
+
+    async def release_lock(user_id, token):
+        return None
+
+    SyncQueueService.acquire_lock = staticmethod(acquire_lock)
+    SyncQueueService.release_lock = staticmethod(release_lock)
+    CalendarService.invalidate = staticmethod(lambda user_id: None)
+    ReminderService.dispatch_lock = staticmethod(lambda: nullcontext(True))
+
+
+def reset_schema():
+    """Drops and recreates every table on the configured engine."""
+    import app.models  # noqa: F401  (registers all models on Base)
+    from app.database.database import Base, engine
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+class QueryCounter:
+    """Counts statements executed on an engine between resets."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def take(self) -> int:
+        count, self.count = self.count, 0
+        return count
+
+
+def percentiles(samples):
+    """p50/p95/p99 in milliseconds for a list of durations in seconds."""
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 2)
+
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "mean_ms": round(statistics.fmean(ordered) * 1000, 2)}
+
+
+def write_report(name: str, report: dict, path: str = None) -> Path:
+    """Writes a JSON report (default: benchmarks/results/<name>.json) and returns its path."""
+    target = Path(path) if path else RESULTS_DIR / f"{name}.json"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(report, indent=2, sort_keys=True, default=str))
+    return target
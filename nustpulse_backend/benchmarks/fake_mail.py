@@ -0,0 +1,49 @@
+"""
+A local stand-in for the Gmail API behind the `MailTransport` interface.
+
+Simulates send latency, 429 rate limiting and exhausted daily quotas, and
+keeps every message it "delivers" so a benchmark can inspect them. Install
+it with `set_mail_transport(FakeMailTransport(...))`.
+"""
+import asyncio
+import random
+from collections import Counter
+
+from app.services.mail_transport import MailTransport, MailQuotaError, MailRateLimitError
+
+
+class FakeMailTransport(MailTransport):
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        quota_error_rate: float = 0.0,
+        retry_after: float = None,
+        seed: int = 1,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_rate = rate_limit_rate
+        self.quota_error_rate = quota_error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+        self.outcomes = Counter()  # sent / rate_limited / quota_exceeded
+        self.sent = []             # (to, subject) per delivered message
+
+    async def send(self, to: str, subject: str, html_body: str):
+        if self.latency_ms or self.jitter_ms:
+            delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+            await asyncio.sleep(delay / 1000)
+
+        roll = self.random.random()
+        if roll < self.quota_error_rate:
+            self.outcomes["quota_exceeded"] += 1
+            raise MailQuotaError("Daily sending quota exceeded")
+        if roll < self.quota_error_rate + self.rate_limit_rate:
+            self.outcomes["rate_limited"] += 1
+            raise MailRateLimitError("429 Too Many Requests", self.retry_after)
+
+        self.outcomes["sent"] += 1
+        self.sent.append((to, subject))
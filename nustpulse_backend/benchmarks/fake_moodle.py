@@ -0,0 +1,207 @@
+"""
+A local stand-in for the NUST Moodle portal, covering exactly what
+LMSSession talks to:
+
+    GET  /portal/login/index.php      login form with a logintoken
+    POST /portal/login/index.php      credential check, sets MoodleSession
+    GET  /portal/my/                  dashboard with the sesskey and user name
+    POST /portal/lib/ajax/service.php core_calendar_get_action_events_by_timesort
+                                      core_webservice_get_site_info
+
+Use it in-process either as an `httpx.MockTransport` (`mock_transport()`)
+or as an ASGI app behind `httpx.ASGITransport` (`asgi_transport()`).
+Every user's password is accepted as long as it equals `password_for(user)`.
+"""
+import asyncio
+import json
+import random
+import secrets
+import time
+import zlib
+from collections import Counter
+from urllib.parse import parse_qs
+
+import httpx
+
+PORTAL = "/portal"
+
+
+def password_for(username: str) -> str:
+    return f"pw-{username}"
+
+
+class FakeMoodle:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        events_per_user: int = 15,
+        courses: int = 40,
+        courses_per_user: int = 5,
+        seed: int = 1,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.events_per_user = events_per_user
+        self.courses = courses
+        self.courses_per_user = courses_per_user
+        self.random = random.Random(seed)
+        self.base_time = int(time.time())
+
+        self.sessions = {}       # MoodleSession cookie -> username
+        self.login_tokens = set()
+        self.requests = Counter()
+
+    # ── Transports ───────────────────────────────────────────────────────────
+
+    def mock_transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def asgi_transport(self) -> httpx.ASGITransport:
+        return httpx.ASGITransport(app=self.asgi_app)
+
+    async def asgi_app(self, scope, receive, send):
+        """Minimal ASGI adapter around `handle`."""
+        assert scope["type"] == "http"
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        query = scope.get("query_string", b"").decode()
+        url = f"http://lms.nust.edu.pk{scope['path']}" + (f"?{query}" if query else "")
+        headers = [(k.decode(), v.decode()) for k, v in scope["headers"]]
+        response = await self.handle(httpx.Request(scope["method"], url, headers=headers, content=body))
+
+        await send({
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": [(k.encode(), v.encode()) for k, v in response.headers.multi_items()],
+        })
+        await send({"type": "http.response.body", "body": response.content})
+
+    # ── Request handling ─────────────────────────────────────────────────────
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests[path] += 1
+
+        if self.latency_ms or self.jitter_ms:
+            delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            return httpx.Response(503, text="Service Unavailable")
+
+        if path == f"{PORTAL}/login/index.php":
+            if request.method == "GET":
+                return self._login_form()
+            return self._login_submit(request)
+        if path == f"{PORTAL}/my/":
+            return self._dashboard(request)
+        if path == f"{PORTAL}/lib/ajax/service.php":
+            return self._ajax(request)
+        return httpx.Response(404, text="Not found")
+
+    def _username(self, request: httpx.Request):
+        cookies = request.headers.get("cookie", "")
+        for part in cookies.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "MoodleSession":
+                return self.sessions.get(value)
+        return None
+
+    def _login_form(self) -> httpx.Response:
+        token = secrets.token_hex(16)
+        self.login_tokens.add(token)
+        html = (
+            '<html><body><form action="/portal/login/index.php" method="post">'
+            f'<input type="hidden" name="logintoken" value="{token}">'
+            '<input name="username"><input name="password" type="password">'
+            "</form></body></html>"
+        )
+        return httpx.Response(200, html=html)
+
+    def _login_submit(self, request: httpx.Request) -> httpx.Response:
+        form = {k: v[0] for k, v in parse_qs(request.content.decode()).items()}
+        username = form.get("username", "")
+        token_ok = form.get("logintoken") in self.login_tokens
+        self.login_tokens.discard(form.get("logintoken"))
+
+        if not token_ok or form.get("password") != password_for(username):
+            return httpx.Response(200, html="<html><body>Invalid login, please try again</body></html>")
+
+        session_id = secrets.token_hex(16)
+        self.sessions[session_id] = username
+        return httpx.Response(
+            303,
+            headers={
+                "Location": f"http://lms.nust.edu.pk{PORTAL}/my/",
+                "Set-Cookie": f"MoodleSession={session_id}; Path=/",
+            },
+        )
+
+    def _dashboard(self, request: httpx.Request) -> httpx.Response:
+        username = self._username(request)
+        if not username:
+            return httpx.Response(303, headers={"Location": f"http://lms.nust.edu.pk{PORTAL}/login/index.php"})
+        html = (
+            "<html><head><script>M.cfg = {"
+            f'"wwwroot":"https://lms.nust.edu.pk/portal","sesskey":"sk{zlib.crc32(username.encode())}"'
+            "};</script></head><body>"
+            f'<span class="usertext">{self._full_name(username)}</span>'
+            "</body></html>"
+        )
+        return httpx.Response(200, html=html)
+
+    def _ajax(self, request: httpx.Request) -> httpx.Response:
+        username = self._username(request)
+        if not username:
+            return httpx.Response(200, json=[{"error": True, "exception": {"errorcode": "servicerequireslogin"}}])
+
+        calls = json.loads(request.content or b"[]")
+        results = []
+        for call in calls:
+            method = call.get("methodname")
+            if method == "core_calendar_get_action_events_by_timesort":
+                results.append({"error": False, "data": {"events": self._events(username)}})
+            elif method == "core_webservice_get_site_info":
+                results.append({"error": False, "data": {"fullname": self._full_name(username)}})
+            else:
+                results.append({"error": True, "exception": {"errorcode": "invalidfunction"}})
+        return httpx.Response(200, json=results)
+
+    # ── Fixture data ─────────────────────────────────────────────────────────
+
+    def _full_name(self, username: str) -> str:
+        return f"Student {username.split('@')[0].title()}"
+
+    def _events(self, username: str):
+        """Deterministic per user; users in the same course share Moodle event ids."""
+        rng = random.Random(zlib.crc32(username.encode()))
+        course_ids = rng.sample(range(1, self.courses + 1), min(self.courses_per_user, self.courses))
+
+        events = []
+        for i in range(self.events_per_user):
+            course_id = course_ids[i % len(course_ids)]
+            number = i // len(course_ids) + 1
+            events.append({
+                "id": course_id * 1000 + number,
+                "name": f"Assignment {number}",
+                "eventtype": "due",
+                "timestart": self.base_time + (course_id * 7919 + number * 86400) % (21 * 86400),
+                "course": {
+                    "id": course_id,
+                    "fullname": f"Course {course_id:03d}",
+                    "shortname": f"C{course_id:03d}",
+                },
+            })
+        return events
@@ -0,0 +1,162 @@
+"""
+Notification pipeline benchmark.
+
+Seeds users and deadlines, swaps the Gmail transport for FakeMailTransport,
+then times the event-driven notify_new_deadlines task (one call per user, as
+queued by SyncService), the notify_pending_deadlines safety net over the
+events that were "lost", and dispatch_due_reminders over pinned deadlines
+whose reminder has come due. Reports emails/sec, seconds per pass and how
+many sends were retried or dropped.
+
+    cd nustpulse_backend
+    python -m benchmarks.notify_bench --users 2000 --latency-ms 120
+    python -m benchmarks.notify_bench --rate-limit-rate 0.05 --quota-error-rate 0.01
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import configure_env, reset_schema, stub_redis, QueryCounter, write_report
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--new-per-user", type=int, default=3, help="Un-notified deadlines per user")
+    parser.add_argument("--pinned-per-user", type=int, default=2, help="Pinned deadlines with a reminder due")
+    parser.add_argument("--lost-fraction", type=float, default=0.05, help="Users whose event never arrives")
+    parser.add_argument("--enabled-fraction", type=float, default=0.6, help="Users with email notifications on")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fake Gmail latency per send")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of sends answered with 429")
+    parser.add_argument("--quota-error-rate", type=float, default=0.0, help="Fraction of sends failing on quota")
+    parser.add_argument("--retry-base-ms", type=float, default=5.0, help="Backoff base (production default is 1s)")
+    parser.add_argument("--db-url", default="sqlite:///./bench_notify.db")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--json", help="Report path (default: benchmarks/results/notify_bench.json)")
+    return parser.parse_args()
+
+
+def seed(db, args):
+    from app.models.user import User
+    from app.models.deadline import Deadline
+
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+
+    users = []
+    for i in range(args.users):
+        enabled = rng.random() < args.enabled_fraction
+        users.append(User(
+            name=f"Student {i}",
+            lms_username=f"student{i:05d}@seecs.edu.pk",
+            lms_password="not-used",
+            notification_email=f"student{i:05d}@gmail.com" if enabled else None,
+            notifications_enabled=enabled,
+        ))
+    db.add_all(users)
+    db.flush()
+
+    rows, events = [], []
+    for user in users:
+        fresh = []
+        for n in range(args.new_per_user):
+            fresh.append(Deadline(
+                title=f"New Assignment {n + 1}",
+                due_date=now + timedelta(days=rng.uniform(4, 20)),
+                course_name=f"Course {rng.randint(1, 60):03d}",
+                notified_new=not user.notifications_enabled,
+                user_id=user.id,
+            ))
+        rows.extend(fresh)
+        if user.notifications_enabled and rng.random() >= args.lost_fraction:
+            events.append((user, fresh))
+        for n in range(args.pinned_per_user):
+            rows.append(Deadline(
+                title=f"Pinned Quiz {n + 1}",
+                due_date=now + timedelta(hours=rng.uniform(1, 60)),
+                course_name=f"Course {rng.randint(1, 60):03d}",
+                is_pinned=True,
+                notified_new=True,
+                # Came due within the last tick or so
+                next_reminder_at=now - timedelta(seconds=rng.uniform(0, 60)),
+                user_id=user.id,
+            ))
+    db.add_all(rows)
+    db.flush()
+
+    from app.services.sync_service import SyncService
+    payloads = [SyncService.new_deadline_payload(user, fresh) for user, fresh in events]
+    db.commit()
+    return len(rows), payloads
+
+
+def summarize(transport, before, elapsed, queries):
+    sent = transport.outcomes["sent"] - before["sent"]
+    return {
+        "emails_sent": sent,
+        "seconds": round(elapsed, 3),
+        "emails_per_sec": round(sent / elapsed, 2) if elapsed else 0.0,
+        "rate_limited_attempts": transport.outcomes["rate_limited"] - before["rate_limited"],
+        "quota_failures": transport.outcomes["quota_exceeded"] - before["quota_exceeded"],
+        "db_queries": queries.take(),
+    }
+
+
+def main():
+    args = parse_args()
+    configure_env(args.db_url, MAIL_RETRY_BASE_SECONDS=args.retry_base_ms / 1000)
+
+    from app.core.celery_app import celery_app
+    from app.database.database import SessionLocal, engine
+    from app.services.mail_transport import set_mail_transport
+    from app.tasks import notify_new_deadlines, notify_pending_deadlines, dispatch_due_reminders
+    from benchmarks.fake_mail import FakeMailTransport
+
+    reset_schema()
+    stub_redis()
+    db = SessionLocal()
+    deadline_count, payloads = seed(db, args)
+    db.close()
+
+    transport = FakeMailTransport(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit_rate=args.rate_limit_rate,
+        quota_error_rate=args.quota_error_rate,
+    )
+    set_mail_transport(transport)
+    # dispatch_due_reminders queues its emails as send_due_reminders; run them inline
+    celery_app.conf.task_always_eager = True
+    queries = QueryCounter(engine)
+    report = {
+        "config": vars(args),
+        "dataset": {"users": args.users, "deadlines": deadline_count, "events": len(payloads)},
+        "passes": {},
+    }
+
+    queries.take()
+    passes = (
+        ("new_deadline_events", lambda: [notify_new_deadlines(payload) for payload in payloads]),
+        ("safety_net", notify_pending_deadlines),
+        ("due_reminders", dispatch_due_reminders),
+    )
+    for name, run in passes:
+        before = transport.outcomes.copy()
+        started = time.perf_counter()
+        run()
+        report["passes"][name] = summarize(transport, before, time.perf_counter() - started, queries)
+
+    path = write_report("notify_bench", report, args.json)
+    for name, result in report["passes"].items():
+        print(
+            f"{name:>19}: {result['emails_sent']:>6} sent in {result['seconds']:>8}s  "
+            f"{result['emails_per_sec']:>8} emails/s  retries {result['rate_limited_attempts']}  "
+            f"quota failures {result['quota_failures']}  {result['db_queries']} queries"
+        )
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Query budgets for the API endpoints.
+
+Seeds one user with a realistic deadline list, then calls each endpoint
+in-process under app.core.db_stats.assert_max_queries. Any endpoint that
+runs more SQL statements than its budget fails the run (exit status 1) and
+prints the statements it ran, so an N+1 regression shows up as a red check
+instead of a slow dashboard. Budgets do not depend on how many rows the
+user has; that is the point.
+
+    cd nustpulse_backend
+    python -m benchmarks.query_budget
+    python -m benchmarks.query_budget --deadlines 500 --json budget.json
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import configure_env, reset_schema, stub_redis, write_report
+
+# (method, path, JSON body, max queries). `{id}` is a seeded deadline id.
+BUDGETS = (
+    ("GET", "/users/me", None, 1),
+    ("GET", "/deadlines/", None, 2),
+    ("GET", "/deadlines/changes?since=0", None, 3),
+    ("GET", "/deadlines/search?q=assignment", None, 2),
+    ("GET", "/pulse/search?q=course", None, 1),
+    ("GET", "/dashboard/summary", None, 2),
+    ("GET", "/sync/last", None, 2),
+    ("GET", "/sync/runs", None, 2),
+    ("POST", "/deadlines/", {"title": "Budget check", "due_date": "2030-01-01T10:00:00Z"}, 4),
+    # Writes to synced rows also upsert the course load counters (one statement)
+    ("PUT", "/deadlines/{id}/pin?is_pinned=true", None, 6),
+    ("PUT", "/deadlines/{id}", {"title": "Renamed"}, 6),
+    ("POST", "/deadlines/batch", {"operations": [{"id": "{id}", "action": "unpin"}]}, 6),
+    ("DELETE", "/deadlines/{id}", None, 6),
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deadlines", type=int, default=120, help="Deadlines seeded for the test user")
+    parser.add_argument("--db-url", default="sqlite:///./bench_budget.db")
+    parser.add_argument("--json", help="Report path (default: benchmarks/results/query_budget.json)")
+    return parser.parse_args()
+
+
+def seed(db, count):
+    from app.models.course import Course
+    from app.models.deadline import Deadline
+    from app.models.pulse_event import PulseEvent
+    from app.models.sync_run import SyncRun
+    from app.models.user import User
+
+    now = datetime.now(timezone.utc)
+    user = User(name="Budget Student", lms_username="budget@seecs.edu.pk", lms_password="not-used")
+    db.add(user)
+    db.add_all(Course(id=n, fullname=f"Course {n:03d}", shortname=f"C{n:03d}") for n in range(1, 9))
+    db.flush()
+    db.add_all(
+        Deadline(
+            title=f"Assignment {n + 1}",
+            due_date=now + timedelta(hours=6 * n),
+            course_id=(n % 8) + 1 if n % 5 else None,
+            course_name=None if n % 5 else "Society meeting",
+            lms_event_id=n + 1 if n % 5 else None,
+            is_pinned=n % 3 == 0,
+            notified_new=True,
+            user_id=user.id,
+        )
+        for n in range(count)
+    )
+    db.add_all(
+        PulseEvent(lms_event_id=n + 1, title=f"Assignment {n + 1}", due_date=now + timedelta(hours=6 * n),
+                   course_id=(n % 8) + 1, updated_at=now)
+        for n in range(count) if n % 5
+    )
+    db.add(SyncRun(
+        user_id=user.id, trigger="manual", started_at=now, finished_at=now,
+        duration_ms=1200, success=True,
+    ))
+    db.commit()
+    return user.lms_username
+
+
+async def check(token):
+    import httpx
+    from app.core.db_stats import assert_max_queries
+    from app.main import app
+
+    headers = {"Authorization": f"Bearer {token}"}
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+        # The first request pays for lazy imports and pool setup, not SQL; keep it out
+        await client.get("/users/me", headers=headers)
+
+        deadline_ids = [row["id"] for row in (await client.get("/deadlines/", headers=headers)).json()]
+        for method, path, body, budget in BUDGETS:
+            target_id = str(deadline_ids.pop())
+            path = path.replace("{id}", target_id)
+            if body and "operations" in body:
+                body = {"operations": [{**op, "id": int(target_id)} for op in body["operations"]]}
+
+            failure = None
+            try:
+                with assert_max_queries(budget) as stats:
+                    response = await client.request(method, path, json=body, headers=headers)
+            except AssertionError as e:
+                failure = str(e)
+            if failure is None and response.status_code >= 400:
+                failure = f"HTTP {response.status_code}: {response.text}"
+
+            results[f"{method} {path}"] = {"budget": budget, "queries": stats.queries, "failure": failure}
+    return results
+
+
+def main():
+    args = parse_args()
+    configure_env(args.db_url)
+
+    from app.core.security import create_access_token
+    from app.database.database import SessionLocal
+
+    reset_schema()
+    stub_redis()
+    db = SessionLocal()
+    username = seed(db, args.deadlines)
+    db.close()
+
+    results = asyncio.run(check(create_access_token(data={"sub": username})))
+    path = write_report("query_budget", {"config": vars(args), "endpoints": results}, args.json)
+
+    failed = 0
+    for name, result in results.items():
+        status = "ok  " if result["failure"] is None else "FAIL"
+        print(f"{status} {name:<45} {result['queries']:>3} / {result['budget']} queries")
+        if result["failure"]:
+            failed += 1
+            print(result["failure"])
+    print(f"Report written to {path}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Pass/fail checks for behaviour the budgets and throughput numbers can't see.
+
+Each check seeds what it needs on a fresh schema, drives the service code
+in-process and asserts on the result. Any failed check fails the run (exit
+status 1), like query_budget.
+
+    cd nustpulse_backend
+    python -m benchmarks.regressions
+    python -m benchmarks.regressions --only course_rename_reaches_change_feed
+
+Checks on Redis-backed features use fakeredis when it is installed, else a
+real Redis at --redis-url (its keys are flushed), and are skipped if neither
+is available.
+"""
+import argparse
+import sys
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import configure_env, reset_schema, stub_redis, write_report
+
+
+class SkipCheck(Exception):
+    """The check can't run here (e.g. no Redis)."""
+
+
+def _redis(url: str):
+    try:
+        import fakeredis
+
+        return fakeredis.FakeRedis(decode_responses=True)
+    except ImportError:
+        pass
+
+    import redis
+
+    client = redis.Redis.from_url(url, decode_responses=True)
+    try:
+        client.ping()
+    except redis.RedisError as e:
+        raise SkipCheck(f"no fakeredis and no Redis at {url}: {e}")
+    client.flushdb()
+    return client
+
+
+def check_course_rename_reaches_change_feed(args):
+    """A course rename shows up in every enrolled student's change feed delta."""
+    from app.database.database import SessionLocal
+    from app.models.course import Course
+    from app.models.deadline import Deadline
+    from app.models.user import User
+    from app.services import course_service
+    from app.services.course_service import CourseService
+    from app.services.deadline_service import DeadlineService
+
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        users = [User(name=f"Student {n}", lms_username=f"rename{n}@seecs.edu.pk", lms_password="x",
+                      deadlines_version=1) for n in range(2)]
+        db.add_all(users)
+        db.add_all([Course(id=7, fullname="Old Name"), Course(id=8, fullname="Other Course")])
+        db.flush()
+        db.add_all(
+            Deadline(title=f"Lab {n}", due_date=now + timedelta(days=n + 1), course_id=7 if n % 2 else 8,
+                     lms_event_id=100 + n, user_id=user.id, notified_new=True, change_version=1)
+            for user in users for n in range(4)
+        )
+        db.commit()
+        # Both students' clients are up to date at version 1
+        cursors = {user.id: 1 for user in users}
+
+        course_service._known.clear()
+        _, touched = CourseService.ensure_courses(db, {7: ("New Name", None), 8: ("Other Course", None)})
+        db.commit()
+        assert sorted(touched) == sorted(cursors), f"rename touched users {touched}, expected {sorted(cursors)}"
+
+        for user in users:
+            delta = DeadlineService.get_changes(db, user, cursors[user.id])
+            names = sorted({row["course_name"] for row in delta["changed"]})
+            assert not delta["reset"], f"user {user.id}: unexpected reset"
+            assert delta["cursor"] > cursors[user.id], f"user {user.id}: cursor did not move ({delta['cursor']})"
+            assert len(delta["changed"]) == 2 and names == ["New Name"], (
+                f"user {user.id}: delta has {len(delta['changed'])} rows named {names}, "
+                "expected the 2 deadlines of the renamed course"
+            )
+    finally:
+        db.close()
+
+
+def check_pulse_pages_through_tied_due_times(args):
+    """Paging the pulse feed returns every item once, even when hundreds share one due time."""
+    from app.core.config import settings
+    from app.services import pulse_service
+    from app.services.pulse_service import PulseService, TIE_WINDOW
+
+    r = _redis(args.redis_url)
+    original = pulse_service.get_redis, settings.PULSE_FEED_ENABLED
+    pulse_service.get_redis = lambda: r
+    settings.PULSE_FEED_ENABLED = True
+    try:
+        limit = 20
+        due_ts = int(time.time()) + 86400
+        tied = 4 * (limit + TIE_WINDOW)
+        course = {"id": 42, "fullname": "Bulk Course", "shortname": "BULK"}
+        PulseService.publish(
+            [{"lms_event_id": 1000 + n, "title": f"Quiz {n}", "due_ts": due_ts, "course": course} for n in range(tied)]
+            + [{"lms_event_id": 5000 + n, "title": f"Later {n}", "due_ts": due_ts + 60 * (n + 1)} for n in range(5)]
+        )
+
+        for course_id in (None, 42):
+            seen, cursor, pages = [], None, 0
+            while True:
+                page = PulseService.get_feed(course_id, cursor, limit)
+                seen += [item["lms_event_id"] for item in page["items"]]
+                pages += 1
+                cursor = page["next_cursor"]
+                if cursor is None or pages > tied:
+                    break
+            expected = tied + (5 if course_id is None else 0)
+            assert len(seen) == len(set(seen)) == expected, (
+                f"course {course_id}: {len(seen)} items ({len(set(seen))} distinct) over {pages} pages, "
+                f"expected {expected}"
+            )
+    finally:
+        pulse_service.get_redis, settings.PULSE_FEED_ENABLED = original
+
+
+def check_pulse_search_returns_each_event_once(args):
+    """Pulse search returns each shared assignment once and ranks at most PULSE_SEARCH_CANDIDATES."""
+    from app.core.config import settings
+    from app.database.database import SessionLocal
+    from app.models.course import Course
+    from app.services.pulse_event_service import PulseEventService
+    from app.services.search_service import SearchService
+
+    db = SessionLocal()
+    original = settings.PULSE_SEARCH_CANDIDATES
+    try:
+        due_ts = int(time.time()) + 3600
+        db.add(Course(id=9, fullname="Shared Course", shortname="SC"))
+        db.flush()
+        events = [
+            {"lms_event_id": 300 + n, "title": f"Quiz {n}", "due_ts": due_ts + 60 * n,
+             "course": {"id": 9, "fullname": "Shared Course"}}
+            for n in range(8)
+        ]
+        # Every student in the course syncs the same events
+        for _ in range(3):
+            PulseEventService.record(db, events)
+        db.commit()
+
+        found = SearchService.search_pulse(db, "quiz", None, 20, 0)["items"]
+        ids = [item["lms_event_id"] for item in found]
+        assert sorted(ids) == [300 + n for n in range(8)], f"search returned {ids}, expected each event once"
+
+        settings.PULSE_SEARCH_CANDIDATES = 5
+        found = SearchService.search_pulse(db, "quiz", None, 20, 0)["items"]
+        ids = sorted(item["lms_event_id"] for item in found)
+        assert ids == [300 + n for n in range(5)], f"capped search returned {ids}, expected the 5 soonest"
+    finally:
+        settings.PULSE_SEARCH_CANDIDATES = original
+        db.close()
+
+
+def check_sync_runs_pruned_past_retention(args):
+    """prune_sync_runs deletes runs older than SYNC_RUN_RETENTION_DAYS, across batches, and keeps the rest."""
+    from app.core.config import settings
+    from app.database.database import SessionLocal
+    from app.models.sync_run import SyncRun
+    from app.models.user import User
+    from app.tasks import prune_sync_runs
+
+    db = SessionLocal()
+    original = settings.SYNC_RUN_PRUNE_BATCH
+    try:
+        now = datetime.now(timezone.utc)
+        user = User(name="Ledger Student", lms_username="ledger@seecs.edu.pk", lms_password="x")
+        db.add(user)
+        db.flush()
+        ages = [settings.SYNC_RUN_RETENTION_DAYS + 1 + n for n in range(7)] + [0, 1, 2]
+        db.add_all(
+            SyncRun(user_id=user.id, trigger="scheduled", started_at=now - timedelta(days=age),
+                    finished_at=now - timedelta(days=age), duration_ms=1000, success=True)
+            for age in ages
+        )
+        db.commit()
+
+        settings.SYNC_RUN_PRUNE_BATCH = 3
+        prune_sync_runs()
+        left = db.query(SyncRun).count()
+        assert left == 3, f"{left} runs left after pruning, expected the 3 inside the retention window"
+    finally:
+        settings.SYNC_RUN_PRUNE_BATCH = original
+        db.close()
+
+
+CHECKS = {
+    "course_rename_reaches_change_feed": check_course_rename_reaches_change_feed,
+    "pulse_pages_through_tied_due_times": check_pulse_pages_through_tied_due_times,
+    "pulse_search_returns_each_event_once": check_pulse_search_returns_each_event_once,
+    "sync_runs_pruned_past_retention": check_sync_runs_pruned_past_retention,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", choices=sorted(CHECKS), action="append", help="Run just these checks")
+    parser.add_argument("--db-url", default="sqlite:///./bench_regressions.db")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15", help="Used only without fakeredis; flushed")
+    parser.add_argument("--json", help="Report path (default: benchmarks/results/regressions.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    configure_env(args.db_url)
+
+    results = {}
+    for name in args.only or CHECKS:
+        reset_schema()
+        stub_redis()
+        failure = skipped = None
+        try:
+            CHECKS[name](args)
+        except SkipCheck as e:
+            skipped = str(e)
+        except AssertionError as e:
+            failure = str(e) or traceback.format_exc()
+        except Exception:
+            failure = traceback.format_exc()
+        results[name] = {"failure": failure, "skipped": skipped}
+
+    path = write_report("regressions", {"config": vars(args), "checks": results}, args.json)
+    failed = 0
+    for name, result in results.items():
+        if result["skipped"]:
+            print(f"skip {name}: {result['skipped']}")
+            continue
+        print(f"{'ok  ' if result['failure'] is None else 'FAIL'} {name}")
+        if result["failure"]:
+            failed += 1
+            print(result["failure"])
+    print(f"Report written to {path}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
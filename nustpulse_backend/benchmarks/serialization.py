@@ -0,0 +1,199 @@
+"""
+Serialization and wire-size benchmark for the list endpoints.
+
+Seeds one user with N deadlines (300 by default) and compares, for
+`/deadlines/` and `/dashboard/summary`:
+
+  - the old path: ORM objects -> Pydantic `from_attributes` -> JSON
+  - the current path: column projection -> dicts -> orjson
+
+It also checks that both produce identical JSON, then requests each endpoint
+through the app with `identity`, `gzip` and `br` to report bytes on the wire
+and end-to-end latency.
+
+    cd nustpulse_backend
+    python -m benchmarks.serialization --deadlines 300 --iterations 300
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import configure_env, reset_schema, percentiles, write_report
+
+ENCODINGS = ("identity", "gzip", "br")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deadlines", type=int, default=300)
+    parser.add_argument("--pinned-fraction", type=float, default=0.5)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--db-url", default="sqlite:///./bench_serialization.db")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--json", help="Report path (default: benchmarks/results/serialization.json)")
+    return parser.parse_args()
+
+
+def seed(db, args):
+    from app.models.user import User
+    from app.models.deadline import Deadline
+
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    user = User(name="Heavy Student", lms_username="heavy@seecs.edu.pk", lms_password="not-used")
+    db.add(user)
+    db.flush()
+    db.add_all(
+        Deadline(
+            title=f"Assignment {n + 1}: {'Lab Report' if n % 3 else 'Problem Set'}",
+            due_date=now + timedelta(hours=rng.uniform(1, 14 * 24)),
+            course_name=f"CS-{rng.randint(100, 400)} Course Title {rng.randint(1, 12)}",
+            lms_event_id=100000 + n,
+            is_pinned=rng.random() < args.pinned_fraction,
+            notified_new=True,
+            user_id=user.id,
+        )
+        for n in range(args.deadlines)
+    )
+    db.commit()
+    return user.id
+
+
+def legacy_deadlines(db, user):
+    from pydantic import TypeAdapter
+    from app.models.deadline import Deadline
+    from app.schemas.deadline import DeadlineResponse
+
+    rows = db.query(Deadline).filter(Deadline.user_id == user.id).all()
+    adapter = TypeAdapter(list[DeadlineResponse])
+    return adapter.dump_json([DeadlineResponse.model_validate(row) for row in rows])
+
+
+def legacy_dashboard(db, user):
+    """The pre-projection DashboardService: ORM rows wrapped in Pydantic models."""
+    from datetime import date
+    from sqlalchemy import func
+    from app.models.deadline import Deadline
+    from app.schemas.dashboard import DashboardSummary, WeeklyLoadDay, CourseSummary
+
+    today = date.today()
+    deadlines = db.query(Deadline).filter(
+        Deadline.user_id == user.id,
+        func.date(Deadline.due_date) >= today,
+        Deadline.is_pinned == True,
+    ).all()
+    weekly_map = {}
+    for i in range(7):
+        current_date = today + timedelta(days=i)
+        weekly_map[current_date] = {"day": current_date.strftime("%a"), "date": current_date, "deadlines": 0, "deadlines_list": []}
+    for deadline in deadlines:
+        bucket = weekly_map.get(deadline.due_date.date())
+        if bucket:
+            bucket["deadlines"] += 1
+            bucket["deadlines_list"].append(deadline)
+    course_counts = {}
+    for deadline in deadlines:
+        name = deadline.course_name or "General"
+        course_counts[name] = course_counts.get(name, 0) + 1
+    summary = DashboardSummary(
+        upcoming_deadlines=len(deadlines),
+        weekly_load=[WeeklyLoadDay(**day) for day in weekly_map.values()],
+        course_summary=[
+            CourseSummary(course_name=name, count=count)
+            for name, count in sorted(course_counts.items(), key=lambda x: x[1], reverse=True)
+        ],
+    )
+    return summary.model_dump_json().encode()
+
+
+def time_path(build, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        body = build()
+        samples.append(time.perf_counter() - started)
+    return body, samples
+
+
+async def wire_sizes(token, iterations):
+    import httpx
+    from app.main import app
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for route in ("/deadlines/", "/dashboard/summary"):
+            results[route] = {}
+            for encoding in ENCODINGS:
+                headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": encoding}
+                latencies, size, served = [], 0, "identity"
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    async with client.stream("GET", route, headers=headers) as response:
+                        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+                    latencies.append(time.perf_counter() - started)
+                    size = len(raw)
+                    served = response.headers.get("content-encoding", "identity")
+                results[route][encoding] = {"bytes": size, "served_encoding": served, **percentiles(latencies)}
+    return results
+
+
+def main():
+    args = parse_args()
+    configure_env(args.db_url)
+
+    from app.core.responses import ORJSONResponse
+    from app.core.security import create_access_token
+    from app.database.database import SessionLocal
+    from app.models.user import User
+    from app.services.dashboard_service import DashboardService
+    from app.services.deadline_service import DeadlineService
+
+    reset_schema()
+    db = SessionLocal()
+    user_id = seed(db, args)
+    user = db.get(User, user_id)
+
+    paths = {
+        "/deadlines/": (
+            lambda: legacy_deadlines(db, user),
+            lambda: ORJSONResponse(DeadlineService.get_user_deadlines(db, user)).body,
+        ),
+        "/dashboard/summary": (
+            lambda: legacy_dashboard(db, user),
+            lambda: ORJSONResponse(DashboardService.get_summary(db, user)).body,
+        ),
+    }
+
+    report = {"config": vars(args), "serialization": {}}
+    for route, (legacy, current) in paths.items():
+        legacy_body, legacy_samples = time_path(legacy, args.iterations)
+        current_body, current_samples = time_path(current, args.iterations)
+        report["serialization"][route] = {
+            "identical_json": json.loads(legacy_body) == json.loads(current_body),
+            "legacy": {"bytes": len(legacy_body), **percentiles(legacy_samples)},
+            "current": {"bytes": len(current_body), **percentiles(current_samples)},
+        }
+    db.close()
+
+    token = create_access_token(data={"sub": user.lms_username})
+    report["wire"] = asyncio.run(wire_sizes(token, max(1, args.iterations // 4)))
+
+    path = write_report("serialization", report, args.json)
+    for route, result in report["serialization"].items():
+        print(
+            f"{route:<20} legacy p50 {result['legacy']['p50_ms']:>7}ms  current p50 {result['current']['p50_ms']:>7}ms  "
+            f"identical {result['identical_json']}"
+        )
+        sizes = "  ".join(
+            f"{encoding} {wire['bytes']}B ({wire['served_encoding']})"
+            for encoding, wire in report["wire"][route].items()
+        )
+        print(f"{'':<20} {sizes}")
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
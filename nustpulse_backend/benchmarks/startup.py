@@ -0,0 +1,115 @@
+"""
+Cold-start benchmark for the API, worker and beat entry points.
+
+Imports each entry point in a fresh interpreter, several times, and reports
+the median import time and peak RSS. One extra run per entry point uses
+`python -X importtime` to list the slowest top-level imports, which is
+usually enough to spot a heavy dependency creeping into a hot path.
+
+    cd nustpulse_backend
+    python -m benchmarks.startup --runs 7
+    python -m benchmarks.startup --entry api --top 25 --json before.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import configure_env, write_report
+
+ENTRY_POINTS = {
+    "api": "app.main",                 # uvicorn app.main:app
+    "worker": "app.tasks",             # celery -A app.core.celery_app worker (imports the tasks)
+    "beat": "app.core.celery_app",     # celery -A app.core.celery_app beat
+}
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - started
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss_kb": rss_kb, "modules": len(sys.modules)}))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entry", nargs="+", choices=sorted(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level imports to report")
+    parser.add_argument("--db-url", default="sqlite:///./bench_startup.db")
+    parser.add_argument("--json", help="Report path (default: benchmarks/results/startup.json)")
+    return parser.parse_args()
+
+
+def probe(module: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, module],
+        capture_output=True, text=True, check=True, env=os.environ,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(module: str, top: int):
+    """
+    Cumulative import time per third-party package, slowest first. A package
+    is counted once per outermost import, so submodules pulled in by the
+    package itself are not double counted.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, env=os.environ,
+    )
+    entries = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((depth, name.strip().split(".")[0], int(cumulative)))
+
+    # importtime prints children before their parent; reversed, each line's ancestors come first
+    totals, stack = {}, []
+    for depth, package, cumulative in reversed(entries):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        if package != "app" and all(ancestor != package for _, ancestor in stack):
+            totals[package] = totals.get(package, 0) + cumulative
+        stack.append((depth, package))
+
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"module": name, "cumulative_ms": round(us / 1000, 2)} for name, us in ranked]
+
+
+def main():
+    args = parse_args()
+    configure_env(args.db_url)
+
+    report = {"config": vars(args), "python": sys.version.split()[0], "entry_points": {}}
+    for entry in args.entry:
+        module = ENTRY_POINTS[entry]
+        samples = [probe(module) for _ in range(args.runs)]
+        report["entry_points"][entry] = {
+            "module": module,
+            "import_ms_median": round(statistics.median(s["seconds"] for s in samples) * 1000, 1),
+            "import_ms_min": round(min(s["seconds"] for s in samples) * 1000, 1),
+            "rss_mb_median": round(statistics.median(s["rss_kb"] for s in samples) / 1024, 1),
+            "modules_loaded": samples[-1]["modules"],
+            "slowest_imports": slowest_imports(module, args.top),
+        }
+
+    path = write_report("startup", report, args.json)
+    for entry, result in report["entry_points"].items():
+        heaviest = ", ".join(f"{m['module']} {m['cumulative_ms']}ms" for m in result["slowest_imports"][:5])
+        print(
+            f"{entry:>6}: {result['import_ms_median']:>7}ms import  {result['rss_mb_median']:>6}MB RSS  "
+            f"{result['modules_loaded']:>5} modules  | {heaviest}"
+        )
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
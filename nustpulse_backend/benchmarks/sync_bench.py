@@ -0,0 +1,123 @@
+"""
+Offline sync throughput benchmark.
+
+Drives SyncService.sync_user_deadlines and the sync_all_users sweep for N
+seeded users against FakeMoodle and a local database, and reports users/sec,
+LMS requests per sync and DB queries per sync.
+
+    cd nustpulse_backend
+    python -m benchmarks.sync_bench --users 200 --latency-ms 40
+    python -m benchmarks.sync_bench --db-url postgresql://localhost/nustpulse_bench --json out.json
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import configure_env, reset_schema, stub_redis, QueryCounter, percentiles, write_report
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--events-per-user", type=int, default=15)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fake LMS latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of LMS requests answered with 503")
+    parser.add_argument("--transport", choices=("mock", "asgi"), default="mock")
+    parser.add_argument("--db-url", default="sqlite:///./bench_sync.db")
+    parser.add_argument("--skip-sweep", action="store_true", help="Only run the per-user passes")
+    parser.add_argument("--json", help="Report path (default: benchmarks/results/sync_bench.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    configure_env(args.db_url)
+
+    from app.database.database import SessionLocal, engine
+    from app.models.user import User
+    from app.services.crypto_service import encrypt_password
+    from app.services.lms_service import LMSSession
+    from app.services.sync_service import SyncService
+    from app.tasks import sync_all_users
+    from benchmarks.fake_moodle import FakeMoodle, password_for
+
+    reset_schema()
+    stub_redis()
+    moodle = FakeMoodle(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        events_per_user=args.events_per_user,
+    )
+    LMSSession.transport = moodle.mock_transport() if args.transport == "mock" else moodle.asgi_transport()
+    queries = QueryCounter(engine)
+
+    db = SessionLocal()
+    usernames = [f"student{i:05d}@seecs.edu.pk" for i in range(args.users)]
+    db.add_all(
+        User(name=f"Student {i}", lms_username=name, lms_password=encrypt_password(password_for(name)))
+        for i, name in enumerate(usernames)
+    )
+    db.commit()
+    users = db.query(User).order_by(User.id).all()
+
+    async def per_user_pass():
+        durations, successes = [], 0
+        for user in users:
+            started = time.perf_counter()
+            if await SyncService.sync_user_deadlines(db, user, password_for(user.lms_username), trigger="benchmark"):
+                successes += 1
+            durations.append(time.perf_counter() - started)
+        return durations, successes
+
+    report = {
+        "config": vars(args),
+        "passes": {},
+    }
+
+    # First pass inserts everything, second pass is the steady state (no changes)
+    for name in ("cold", "warm"):
+        queries.take()
+        requests_before = moodle.total_requests
+        started = time.perf_counter()
+        durations, successes = asyncio.run(per_user_pass())
+        elapsed = time.perf_counter() - started
+        report["passes"][name] = {
+            "users": len(users),
+            "successful_syncs": successes,
+            "seconds": round(elapsed, 3),
+            "users_per_sec": round(len(users) / elapsed, 2),
+            "lms_requests_per_sync": round((moodle.total_requests - requests_before) / len(users), 2),
+            "db_queries_per_sync": round(queries.take() / len(users), 2),
+            "sync_latency": percentiles(durations),
+        }
+
+    if not args.skip_sweep:
+        queries.take()
+        requests_before = moodle.total_requests
+        started = time.perf_counter()
+        sync_all_users()
+        elapsed = time.perf_counter() - started
+        report["passes"]["sweep"] = {
+            "users": len(users),
+            "seconds": round(elapsed, 3),
+            "users_per_sec": round(len(users) / elapsed, 2),
+            "lms_requests_per_sync": round((moodle.total_requests - requests_before) / len(users), 2),
+            "db_queries_per_sync": round(queries.take() / len(users), 2),
+        }
+
+    db.close()
+    path = write_report("sync_bench", report, args.json)
+
+    for name, result in report["passes"].items():
+        print(
+            f"{name:>5}: {result['users_per_sec']:>8} users/s  "
+            f"{result['lms_requests_per_sync']:>5} LMS req/sync  "
+            f"{result['db_queries_per_sync']:>6} queries/sync"
+        )
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
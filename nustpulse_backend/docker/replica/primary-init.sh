@@ -0,0 +1,10 @@
+#!/bin/sh
+# Runs once when the primary's data directory is first initialised:
+# a role the replica streams WAL with, and a pg_hba entry letting it in.
+set -e
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<SQL
+CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD '$REPLICATION_PASSWORD';
+SQL
+
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,17 @@
+#!/bin/sh
+# Clones the primary into an empty data directory and starts as a hot
+# standby (-R writes standby.signal and primary_conninfo). Restarts reuse
+# the existing clone.
+set -e
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until pg_basebackup --host=db-primary --username=replicator \
+        --pgdata="$PGDATA" --wal-method=stream --write-recovery-conf --progress; do
+        echo "Waiting for the primary..."
+        rm -rf "$PGDATA"/*
+        sleep 2
+    done
+    chmod 0700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on